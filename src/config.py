@@ -0,0 +1,86 @@
+# 游戏世界（逻辑坐标）的默认大小
+WORLD_WIDTH = 800
+WORLD_HEIGHT = 600
+
+# 窗口显示逻辑画面的缩放方式
+SCALE_MODES = ('scaled', 'blit')
+
+# 渲染后端：surface为CPU表面绘制，sdl2为pygame._sdl2的SDL渲染器（纹理绘制）
+RENDER_BACKENDS = ('surface', 'sdl2')
+
+# 游戏模式：normal为普通关卡；bullet_hell为弹幕地狱模式（直接进入Boss战，上万发子弹，需要numpy）
+GAME_MODES = ('normal', 'bullet_hell')
+
+
+class WorldConfig:
+    """世界/视口配置 - 游戏逻辑和绘制都在world.width x world.height的逻辑坐标中进行，
+    显示时再缩放到窗口大小。游戏对象运行时读取全局的world对象，启动时用configure()修改。
+    """
+    def __init__(self, width=WORLD_WIDTH, height=WORLD_HEIGHT):
+        self.width = width
+        self.height = height
+        self.window_size = None  # 窗口大小，None表示与逻辑大小相同
+        self.scale_mode = 'scaled'
+
+    def configure(self, width=WORLD_WIDTH, height=WORLD_HEIGHT, window_size=None, scale_mode='scaled'):
+        """设置逻辑分辨率和窗口
+        Args:
+            width: 逻辑宽度（游戏世界的大小）
+            height: 逻辑高度
+            window_size: 窗口大小 (宽, 高)，默认与逻辑大小相同
+            scale_mode: 'scaled' 由SDL的pygame.SCALED缩放（窗口大小由SDL按桌面大小取逻辑大小的整数倍，
+                        可以拖动调整）；'blit' 每帧把逻辑画面缩放到window_size大小的窗口
+        """
+        if scale_mode not in SCALE_MODES:
+            raise ValueError(f'不支持的缩放方式: {scale_mode}')
+        self.width = width
+        self.height = height
+        self.window_size = tuple(window_size) if window_size else None
+        self.scale_mode = scale_mode
+
+    @property
+    def size(self):
+        """逻辑大小 (宽, 高)"""
+        return (self.width, self.height)
+
+    def needs_scaling(self):
+        """窗口大小是否与逻辑大小不同"""
+        return self.window_size is not None and self.window_size != self.size
+
+
+def parse_size(text):
+    """解析 '宽x高' 格式的大小（命令行参数用）
+    Returns:
+        (宽, 高)
+    Raises:
+        ValueError: 格式错误
+    """
+    width, height = text.lower().split('x')
+    width, height = int(width), int(height)
+    if width <= 0 or height <= 0:
+        raise ValueError(f'大小必须为正数: {text}')
+    return width, height
+
+
+world = WorldConfig()
+
+# 世界边界剔除的边距（像素）：对象的包围盒完全超出世界范围加边距后被移除
+# 新敌人在y=-50处生成，敌人的边距要能容纳刚生成、尚未进入屏幕的对象
+CULL_MARGINS = {
+    'bullets': 50,  # 玩家子弹（追踪导弹可能转出屏幕后再转回来）
+    'enemy_bullets': 20,
+    'enemies': 60,
+}
+
+# 各实体列表的预期最大数量（高水位），超过时EntityBudget打印泄漏警告
+# 取值约为自动模拟中观察到的峰值的3~4倍
+ENTITY_BUDGETS = {
+    'bullets': 120,
+    'enemy_bullets': 600,  # 第3关Boss的螺旋弹幕峰值约300发
+    'field_bullets': 15000,  # 弹幕地狱模式的数组子弹，目标约10000发
+    'explosions': 40,
+    'rock': 30,
+    'plane': 30,
+    'basic': 30,
+    'boss': 1,
+}
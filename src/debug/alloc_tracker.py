@@ -0,0 +1,146 @@
+import os
+import tracemalloc
+from collections import deque
+
+# 不统计的分配来源：tracemalloc自身、本文件，以及导入系统
+_IGNORED_FILES = (tracemalloc.__file__, __file__, '<frozen importlib._bootstrap>',
+                  '<frozen importlib._bootstrap_external>', '<unknown>')
+
+
+class AllocationTracker:
+    """逐帧内存分配统计（tracemalloc）
+    每帧结束时拍一次快照，与上一帧的快照比较，按分配位置（文件:行）统计本帧结束时仍然存在的新增内存块
+    （留存块数和字节数，即两个快照之间的净增量）。在同一帧内分配又释放的临时对象不计入留存块数，
+    只体现在本帧的峰值（tracemalloc.reset_peak）中；同一位置释放的旧块还会抵消新分配的块。
+    因此留存块数为0不能证明这一帧没有分配，需要结合帧内峰值判断。
+    只在start()之后的分配被跟踪，开启时分配本身会明显变慢，帧耗时仅供参考。
+    表面像素、字体渲染等由SDL直接分配的内存不经过Python的分配器，统计中只能看到对应的Python对象。
+    """
+    def __init__(self, top=8, window=120, root=None):
+        """初始化（不立即开始跟踪）
+        Args:
+            top: 覆盖层和报告显示的分配位置数
+            window: 统计最近多少帧
+            root: 显示文件名时去掉的目录前缀，默认为当前工作目录
+        """
+        self.top = top
+        self.window = window
+        self.root = root or os.getcwd()
+        self.frames = deque(maxlen=window)  # 每帧: (留存块数, 留存字节数, 净增字节数, 峰值字节数, {位置: (块数, 字节数)})
+        self._filters = [tracemalloc.Filter(False, name) for name in _IGNORED_FILES]
+        self._previous = None
+        self._frame_start = 0
+
+    @property
+    def active(self):
+        return self._previous is not None
+
+    def start(self):
+        """开始跟踪（之前的统计清空）"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.frames.clear()
+        self._previous = self._snapshot()
+        self._begin_frame()
+
+    def stop(self):
+        """停止跟踪"""
+        self._previous = None
+        tracemalloc.stop()
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(self._filters)
+
+    def _begin_frame(self):
+        tracemalloc.reset_peak()
+        self._frame_start = tracemalloc.get_traced_memory()[0]
+
+    def end_frame(self):
+        """结束一帧：与上一帧的快照比较，记录本帧留存的分配
+        Returns:
+            本帧留存的内存块数，没有在跟踪时返回None
+        """
+        if self._previous is None:
+            return None
+        peak = tracemalloc.get_traced_memory()[1] - self._frame_start
+        snapshot = self._snapshot()
+        sites = {}
+        blocks = size = net = 0
+        for stat in snapshot.compare_to(self._previous, 'lineno'):
+            net += stat.size_diff
+            if stat.count_diff <= 0:
+                continue
+            frame = stat.traceback[0]
+            sites[(frame.filename, frame.lineno)] = (stat.count_diff, max(stat.size_diff, 0))
+            blocks += stat.count_diff
+            size += max(stat.size_diff, 0)
+        self.frames.append((blocks, size, net, peak, sites))
+        self._previous = snapshot
+        # 拍快照本身的分配不计入下一帧
+        self._begin_frame()
+        return blocks
+
+    def summary(self):
+        """最近window帧的平均值
+        Returns:
+            {'frames', 'retained_blocks', 'retained_bytes', 'net_bytes', 'peak_bytes', 'no_retained_frames'}，
+            retained_blocks/retained_bytes为每帧留存的块数/字节数，no_retained_frames为没有留存内存块的帧数
+        """
+        frames = len(self.frames)
+        if frames == 0:
+            return {'frames': 0, 'retained_blocks': 0.0, 'retained_bytes': 0.0, 'net_bytes': 0.0,
+                    'peak_bytes': 0.0, 'no_retained_frames': 0}
+        return {
+            'frames': frames,
+            'retained_blocks': sum(f[0] for f in self.frames) / frames,
+            'retained_bytes': sum(f[1] for f in self.frames) / frames,
+            'net_bytes': sum(f[2] for f in self.frames) / frames,
+            'peak_bytes': max(f[3] for f in self.frames),
+            'no_retained_frames': sum(1 for f in self.frames if f[0] == 0),
+        }
+
+    def top_allocators(self, limit=None):
+        """最近window帧留存最多的位置（按每帧平均留存字节数排序）
+        Returns:
+            [(文件:行, 每帧块数, 每帧字节数, 出现的帧数), ...]
+        """
+        totals = {}
+        for frame in self.frames:
+            for site, (count, size) in frame[4].items():
+                total = totals.setdefault(site, [0, 0, 0])
+                total[0] += count
+                total[1] += size
+                total[2] += 1
+        frames = max(1, len(self.frames))
+        ranked = sorted(totals.items(), key=lambda item: (item[1][1], item[1][0]), reverse=True)
+        return [(self._location(*site), count / frames, size / frames, seen)
+                for site, (count, size, seen) in ranked[:limit or self.top]]
+
+    def _location(self, filename, lineno):
+        """显示用的位置：项目内的文件用相对路径，其他文件（标准库、第三方库）只保留最后两级"""
+        if filename.startswith(self.root + os.sep):
+            filename = os.path.relpath(filename, self.root)
+        else:
+            filename = os.path.join(*filename.split(os.sep)[-2:])
+        return f'{filename}:{lineno}'
+
+    def overlay_lines(self):
+        """调试覆盖层显示的文字行"""
+        s = self.summary()
+        lines = [f"retained: {s['retained_blocks']:.1f} blk/f {s['retained_bytes'] / 1024:.1f} KB/f",
+                 f"alloc peak: {s['peak_bytes'] / 1024:.1f} KB  none retained: "
+                 f"{s['no_retained_frames']}/{s['frames']}"]
+        for location, count, size, _ in self.top_allocators():
+            lines.append(f'{location} {count:.1f}/f {size / 1024:.1f}KB')
+        return lines
+
+    def report_lines(self, limit=None):
+        """文字报告（结束跟踪时打印或命令行输出）"""
+        s = self.summary()
+        lines = [f"最近{s['frames']}帧: 每帧留存 {s['retained_blocks']:.1f} 块 / {s['retained_bytes'] / 1024:.2f} KB，"
+                 f"净增 {s['net_bytes'] / 1024:.2f} KB，帧内峰值最高 {s['peak_bytes'] / 1024:.1f} KB，"
+                 f"没有留存内存块的帧 {s['no_retained_frames']}/{s['frames']}",
+                 f"{'位置':<48}{'块/帧':>9}{'字节/帧':>11}{'帧数':>7}"]
+        for location, count, size, seen in self.top_allocators(limit):
+            lines.append(f'{location:<50}{count:>9.2f}{size:>12.1f}{seen:>8}')
+        return lines
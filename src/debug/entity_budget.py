@@ -0,0 +1,50 @@
+class EntityBudget:
+    """实体数量预算监控 - 每帧检查各实体列表的长度，
+    超过预期的高水位时打印警告，用于尽早发现新Boss招式等造成的实体泄漏。
+    """
+    def __init__(self, budgets, warn_interval=300):
+        """初始化预算监控
+        Args:
+            budgets: 列表名 -> 预期最大数量
+            warn_interval: 同一列表两次警告之间至少间隔的帧数
+        """
+        self.budgets = dict(budgets)
+        self.warn_interval = warn_interval
+        self.high_water = {}  # 列表名 -> 观察到的最大数量
+        self.frames_over = {}  # 列表名 -> 超出预算的帧数
+        self.frame = 0
+        self._last_warned = {}
+
+    def check(self, counts):
+        """检查本帧各列表的数量
+        Args:
+            counts: 列表名 -> 当前数量
+        Returns:
+            本帧超出预算的列表名列表
+        """
+        self.frame += 1
+        over = []
+        for name, count in counts.items():
+            if count > self.high_water.get(name, 0):
+                self.high_water[name] = count
+            budget = self.budgets.get(name)
+            if budget is None or count <= budget:
+                continue
+            over.append(name)
+            self.frames_over[name] = self.frames_over.get(name, 0) + 1
+            last = self._last_warned.get(name)
+            if last is None or self.frame - last >= self.warn_interval:
+                self._last_warned[name] = self.frame
+                print(f"警告: {name}数量{count}超过预算{budget}"
+                      f"（最高{self.high_water[name]}），可能存在实体泄漏")
+        return over
+
+    def report_lines(self):
+        """各列表的最高数量/预算（超出过预算的列表附带超出帧数）"""
+        lines = []
+        for name in sorted(self.high_water):
+            line = f'{name}: {self.high_water[name]}/{self.budgets.get(name, "-")}'
+            if name in self.frames_over:
+                line += f' (超出{self.frames_over[name]}帧)'
+            lines.append(line)
+        return lines
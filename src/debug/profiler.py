@@ -0,0 +1,52 @@
+from collections import deque
+
+
+class FrameProfiler:
+    """帧性能统计 - 每帧计数器和帧耗时，供调试覆盖层显示"""
+    def __init__(self, history=120):
+        """初始化性能统计
+        Args:
+            history: 保留的帧耗时记录数
+        """
+        self.counters = {}  # 当前帧正在累计的计数
+        self.last_counters = {}  # 上一个完整帧的计数
+        self.frame_times = deque(maxlen=history)  # 帧耗时（毫秒）
+
+    def count(self, name, amount=1):
+        """累加当前帧的计数器"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set(self, name, value):
+        """设置当前帧的数值"""
+        self.counters[name] = value
+
+    def get(self, name, default=0):
+        """读取上一个完整帧的计数"""
+        return self.last_counters.get(name, default)
+
+    def end_frame(self, frame_time=None):
+        """结束一帧，保存本帧计数
+        Args:
+            frame_time: 本帧耗时（毫秒）
+        """
+        self.last_counters = self.counters
+        self.counters = {}
+        if frame_time is not None:
+            self.frame_times.append(frame_time)
+
+    def average_frame_time(self):
+        """最近帧的平均耗时（毫秒）"""
+        if not self.frame_times:
+            return 0.0
+        return sum(self.frame_times) / len(self.frame_times)
+
+    def overlay_lines(self):
+        """调试覆盖层显示的文字行"""
+        lines = [f'Frame: {self.average_frame_time():.2f} ms']
+        for name in sorted(self.last_counters):
+            value = self.last_counters[name]
+            if isinstance(value, float):
+                lines.append(f'{name}: {value:.2f}')
+            else:
+                lines.append(f'{name}: {value}')
+        return lines
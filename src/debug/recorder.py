@@ -0,0 +1,113 @@
+import os
+import time
+import queue
+import threading
+import pygame
+
+
+class FrameRecorder:
+    """游戏录像 - 主线程把画面复制到预先分配的缓冲池，后台线程写入磁盘
+    缓冲池用完（写入跟不上）时直接丢弃这一帧，主循环永远不会等待磁盘。
+    """
+    FORMATS = ('png', 'raw')
+
+    def __init__(self, size, output_dir=None, fmt='png', pool_size=8, fps=60):
+        """初始化录像（立即启动写入线程）
+        Args:
+            size: 画面大小 (宽, 高)
+            output_dir: 输出目录，默认为 recordings/时间戳
+            fmt: 'png' 每帧一个PNG文件；'raw' 所有帧的RGB数据连续写入一个frames.rgb文件
+            pool_size: 缓冲池中的画面数（也是写入队列的最大长度）
+            fps: 录像帧率（只写入raw格式的说明文件）
+        """
+        if fmt not in self.FORMATS:
+            raise ValueError(f'不支持的录像格式: {fmt}')
+        self.size = size
+        self.fmt = fmt
+        self.fps = fps
+        self.output_dir = output_dir or os.path.join('recordings', time.strftime('%Y%m%d_%H%M%S'))
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        # 缓冲池：空闲画面和待写入画面两个队列，画面对象在两者之间循环使用
+        self.pool_size = pool_size
+        self._free = queue.SimpleQueue()
+        for _ in range(pool_size):
+            self._free.put(pygame.Surface(size))
+        self._pending = queue.SimpleQueue()  # (帧号, 画面)，None表示结束
+
+        self.frames = 0  # 已提交的帧数（含丢弃的帧）
+        self.written = 0  # 已写入磁盘的帧数
+        self.dropped = 0  # 因缓冲池用完丢弃的帧数
+        self.max_queue_depth = 0
+        self.write_time = 0.0  # 最近一帧的写入耗时（毫秒）
+
+        self._raw_file = None
+        if fmt == 'raw':
+            self._raw_file = open(os.path.join(self.output_dir, 'frames.rgb'), 'wb')
+        self._writer = threading.Thread(target=self._write_loop, name='recorder', daemon=True)
+        self._writer.start()
+
+    def capture(self, screen):
+        """复制当前画面并交给写入线程（在主线程调用）
+        Returns:
+            是否提交了这一帧（缓冲池用完时丢弃并返回False）
+        """
+        self.frames += 1
+        try:
+            surface = self._free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        surface.blit(screen, (0, 0))
+        self._pending.put((self.frames, surface))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth())
+        return True
+
+    def queue_depth(self):
+        """已提交但还没写入磁盘的帧数"""
+        return self.pool_size - self._free.qsize()
+
+    def stop(self):
+        """结束录像：不等待写入线程，队列中剩余的帧写完后由写入线程自己收尾（关闭文件、打印结果）
+        Returns:
+            输出目录
+        """
+        self._pending.put(None)
+        return self.output_dir
+
+    def join(self, timeout=None):
+        """等待写入线程写完并收尾（退出游戏时在主线程调用，写入线程是守护线程）
+        Returns:
+            写入线程是否已经结束
+        """
+        self._writer.join(timeout)
+        return not self._writer.is_alive()
+
+    def _finish(self):
+        """写入线程收尾：关闭raw文件并写出说明文件"""
+        if self._raw_file is not None:
+            self._raw_file.close()
+            width, height = self.size
+            with open(os.path.join(self.output_dir, 'info.txt'), 'w', encoding='utf-8') as f:
+                f.write(f'{width}x{height} rgb24 {self.fps}fps, {self.written} frames\n')
+                f.write(f'ffmpeg -f rawvideo -pix_fmt rgb24 -s {width}x{height} -r {self.fps} '
+                        f'-i frames.rgb video.mp4\n')
+        print(f"录像结束: {self.output_dir}，写入 {self.written} 帧，丢弃 {self.dropped} 帧，"
+              f"最大队列 {self.max_queue_depth}")
+
+    def _write_loop(self):
+        """写入线程：依次写出队列中的画面，写完后把画面放回缓冲池，收到结束标记后收尾"""
+        while True:
+            item = self._pending.get()
+            if item is None:
+                self._finish()
+                return
+            index, surface = item
+            start = time.perf_counter()
+            if self._raw_file is not None:
+                self._raw_file.write(pygame.image.tobytes(surface, 'RGB'))
+            else:
+                pygame.image.save(surface, os.path.join(self.output_dir, f'frame_{index:06d}.png'))
+            self.write_time = (time.perf_counter() - start) * 1000
+            self.written += 1
+            self._free.put(surface)
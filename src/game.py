@@ -1,42 +1,144 @@
 import pygame
 import sys
+import time
 from src.scenes.game_scene import GameScene
+from src.scenes.simulation_thread import SimulationThread
 from src.objects.animation import WelcomeAnimation
+from src.debug.profiler import FrameProfiler
+from src.debug.recorder import FrameRecorder
+from src.debug.alloc_tracker import AllocationTracker
+from src.render.starfield import Starfield
+from src.quality import QualityGovernor
+from src.gc_policy import GCPolicy
+from src.config import world
 
 class Game:
-    def __init__(self, player_type=1):
+    def __init__(self, player_type=1, threaded=False, record_format='png', stream_name=None,
+                 renderer='surface', render_driver=None, mode='normal', gc_mode='relaxed'):
         """初始化游戏
         Args:
             player_type: 玩家飞机类型 (1,2,3)
+            threaded: 是否在独立线程中以固定频率运行游戏逻辑（主线程只绘制快照）
+            record_format: F10录像的格式，'png' 或 'raw'
+            stream_name: 共享内存导出的名称，每帧把画面和实体状态写入共享内存供外部进程读取；
+                         默认为None（不导出）
+            renderer: 渲染后端，'surface'（CPU表面绘制）或 'sdl2'（SDL渲染器，精灵上传为纹理后绘制）
+            render_driver: sdl2后端使用的SDL渲染驱动，例如 'software'；默认由SDL选择
+            mode: 游戏模式，'normal' 或 'bullet_hell'（弹幕地狱，见GameScene）
+            gc_mode: 垃圾回收策略，见src/gc_policy.py的GC_MODES
         """
-        self.screen_width = 800
-        self.screen_height = 600
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        # 逻辑分辨率（游戏世界大小），所有内容都绘制到逻辑画面上，显示时缩放到窗口
+        self.screen_width = world.width
+        self.screen_height = world.height
+        self.renderer = renderer
+        self.window = self._create_window()
+        if renderer == 'sdl2':
+            # 对象的draw(screen)方法照常调用，TextureCanvas把绘制转换为纹理绘制，渲染器负责缩放
+            from src.render.texture_canvas import TextureCanvas, create_renderer
+            window, sdl_renderer = create_renderer("打飞机游戏", world.window_size or world.size, render_driver)
+            self.screen = TextureCanvas(window, sdl_renderer, world.size)
+        elif self.window.get_size() == world.size:
+            self.screen = self.window
+        else:
+            self.screen = pygame.Surface(world.size).convert()
         pygame.display.set_caption("打飞机游戏")
+        # 视差星空背景，开场动画、关卡介绍和游戏中共用，状态切换时不会重新开始
+        self.starfield = Starfield(self.screen_width, self.screen_height)
         self.clock = pygame.time.Clock()
         self.running = True
         self.player_type = player_type
+        self.mode = mode
         
         # 游戏状态
         self.game_state = 'welcome'  # welcome, playing
         self.welcome_animation = WelcomeAnimation(self.screen_width, self.screen_height)
         self.current_scene = None
         
+        # 多线程模式：仿真线程更新场景，主线程绘制最新快照
+        self.threaded = threaded
+        self.sim_thread = None
+        self.frame_input_time = None  # 本帧读取输入的时间（单线程模式测量输入延迟用）
+        self.drawn_tick = 0  # 已绘制的最新快照帧号
+        self.frame_wait_time = 0.0  # 本帧等待快照的时间（秒），不计入帧耗时
+        
+        # 调试覆盖层（F3切换）
+        self.profiler = FrameProfiler()
+        self.show_debug = False
+        self.debug_font = None
+        self.fps_font = None  # 右上角FPS文字的字体（第一次绘制时创建，不每帧重新加载）
+        
+        # 逐帧内存分配统计（F4开始/结束，tracemalloc），结果显示在调试覆盖层，结束时打印报告
+        self.alloc_tracker = AllocationTracker()
+        
+        # 根据帧耗时自动调节画面质量（只影响绘制量）
+        self.quality_governor = QualityGovernor()
+        
+        # 录像（F10开始/结束），画面由后台线程写入磁盘
+        self.record_format = record_format
+        self.recorder = None
+        self.stopped_recorders = []  # 已结束、写入线程可能还在写剩余帧的录像，退出时等待
+        
+        # 共享内存导出（见src/sim/shm_stream.py，需要numpy）
+        self.stream = None
+        if stream_name:
+            from src.sim.shm_stream import StreamWriter
+            self.stream = StreamWriter(stream_name, (self.screen_width, self.screen_height),
+                                       masks=self._frame_surface().get_masks()[:3])
+            print(f"共享内存导出: {self.stream.name}")
+        
+        # 垃圾回收策略：启动加载完成后冻结长期对象，游戏进行中推迟自动回收，回收停顿显示在调试覆盖层
+        self.gc_policy = GCPolicy(gc_mode)
+        self.gc_policy.freeze()
+        
     def run(self):
         """运行游戏主循环"""
         while self.running:
+            frame_start = time.perf_counter()
+            self.frame_input_time = frame_start
+            self.frame_wait_time = 0.0
+            
             # 处理事件
             self.handle_events()
             
             # 更新游戏状态
             self.update()
+            scene = self.current_scene
+            self.gc_policy.set_state(scene.game_state if scene is not None else self.game_state)
             
             # 绘制游戏画面
             self.draw()
             
+            # 记录本帧耗时（不含等待时间），并据此调节画面质量
+            frame_time = (time.perf_counter() - frame_start - self.frame_wait_time) * 1000
+            self.profiler.set('quality', self.quality_governor.tier_name())
+            self.gc_policy.end_frame(self.profiler)
+            self.profiler.end_frame(frame_time)
+            self.quality_governor.update(frame_time)
+            self.alloc_tracker.end_frame()
+            
+            # 仿真线程意外结束（例如更新时抛出异常）时结束主循环
+            if self.sim_thread is not None and not self.sim_thread.is_alive():
+                self.running = False
+            
             # 控制帧率
             self.clock.tick(60)
             
+        if self.sim_thread is not None:
+            self.sim_thread.stop()
+            self.sim_thread.join(1)
+        if self.recorder is not None:
+            self.recorder.stop()
+            self.stopped_recorders.append(self.recorder)
+        for recorder in self.stopped_recorders:
+            recorder.join()
+        if self.stream is not None:
+            self.stream.close()
+        print('\n'.join(self.gc_policy.report_lines()))
+        self.gc_policy.close()
+        # 实体数量的最高水位（只有游戏场景有）
+        entity_budget = getattr(self.current_scene, 'entity_budget', None)
+        if entity_budget is not None and entity_budget.high_water:
+            print('实体数量最高/预算: ' + '，'.join(entity_budget.report_lines()))
         pygame.quit()
         sys.exit()
         
@@ -45,43 +147,179 @@ class Game:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            # sdl2后端的渲染窗口不是pygame.display窗口，关闭时只收到WINDOWCLOSE
+            if event.type == pygame.WINDOWCLOSE:
+                self.running = False
+            
+            # F3切换调试覆盖层
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.show_debug = not self.show_debug
+            
+            # F4开始/结束内存分配统计
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                self.toggle_alloc_tracking()
+            
+            # F10开始/结束录像
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F10:
+                self.toggle_recording()
             
             # 开场动画时，按任意键跳过
             if self.game_state == 'welcome':
                 if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
                     self.welcome_animation.finished = True
             
-            if self.current_scene:
+            if self.sim_thread is not None:
+                self.sim_thread.post_event(event)
+            elif self.current_scene:
                 self.current_scene.handle_event(event)
             
     def update(self):
         """更新游戏状态"""
+        # 关卡介绍动画期间星空加速滚动
+        scene = self.current_scene
+        self.starfield.update(3.0 if scene is not None and scene.game_state == 'level_intro' else 1.0)
+        
         if self.game_state == 'welcome':
             self.welcome_animation.update()
             if self.welcome_animation.is_finished():
                 # 开场动画结束，开始游戏
                 self.game_state = 'playing'
                 self.current_scene = GameScene(self, self.player_type)
+                self.gc_policy.freeze()  # 场景的图片、遮罩等也是长期对象
+                if self.threaded:
+                    self.sim_thread = SimulationThread(self.current_scene)
+                    self.sim_thread.start()
+        elif self.sim_thread is not None:
+            # 多线程模式只把按键状态交给仿真线程
+            self.sim_thread.post_keys(pygame.key.get_pressed(), self.frame_input_time)
         elif self.game_state == 'playing' and self.current_scene:
             self.current_scene.update()
         
     def draw(self):
         """绘制游戏画面"""
-        self.screen.fill((0, 0, 0))  # 填充黑色背景
+        self.starfield.draw(self.screen)  # 星空背景（覆盖整个画面，代替黑色填充）
+        scene = None  # 本帧绘制的场景（开场动画期间没有）
         
         if self.game_state == 'welcome':
             # 绘制开场动画
             self.welcome_animation.draw(self.screen)
         elif self.game_state == 'playing' and self.current_scene:
-            # 绘制游戏场景
-            self.current_scene.draw(self.screen)
+            # 绘制游戏场景（多线程模式绘制仿真线程发布的最新快照）
+            if self.sim_thread is not None:
+                # 等待下一个仿真帧的快照（最多两帧时间），画面与仿真帧对齐
+                wait_start = time.perf_counter()
+                scene = self.sim_thread.snapshots.wait_newer(
+                    self.drawn_tick, self.sim_thread.tick_interval * 2)
+                self.frame_wait_time = time.perf_counter() - wait_start
+                if scene is not None:
+                    self.drawn_tick = scene.tick
+            else:
+                scene = self.current_scene
+            if scene is not None:
+                scene.draw(self.screen)
             
             # 绘制FPS（右上角）
             fps = int(self.clock.get_fps())
-            font = pygame.font.Font(None, 28)
-            fps_text = font.render(f'FPS: {fps}', True, (255, 255, 255))
+            if self.fps_font is None:
+                self.fps_font = pygame.font.Font(None, 28)
+            fps_text = self.fps_font.render(f'FPS: {fps}', True, (255, 255, 255))
             fps_rect = fps_text.get_rect()
             fps_rect.topright = (self.screen_width - 10, 10)  # 右上角，留10像素边距
             self.screen.blit(fps_text, fps_rect)
+            
+            if self.show_debug:
+                self.draw_debug_overlay()
+        
+        self._present()
+        self._record_input_latency()
         
-        pygame.display.flip()
\ No newline at end of file
+        # 共享内存导出：与画面对应的实体状态一起写入
+        if self.stream is not None and scene is not None:
+            self.stream.publish(scene, self._frame_surface(),
+                                self.drawn_tick if self.sim_thread is not None else None)
+            self.profiler.set('stream_ms', self.stream.publish_time)
+        
+        # 录像：复制画面到缓冲池后立即返回，写入磁盘在后台线程进行
+        if self.recorder is not None:
+            self.recorder.capture(self._frame_surface())
+            self.profiler.set('rec_queue', self.recorder.queue_depth())
+            self.profiler.set('rec_dropped', self.recorder.dropped)
+    
+    def toggle_recording(self):
+        """开始或结束录像"""
+        if self.recorder is None:
+            self.recorder = FrameRecorder((self.screen_width, self.screen_height), fmt=self.record_format)
+            print(f"开始录像: {self.recorder.output_dir}")
+        else:
+            # 不在主线程等待写入线程，避免录像结束时卡顿
+            self.recorder.stop()
+            self.stopped_recorders = [r for r in self.stopped_recorders if not r.join(0)]
+            self.stopped_recorders.append(self.recorder)
+            self.recorder = None
+    
+    def toggle_alloc_tracking(self):
+        """开始或结束逐帧内存分配统计（结束时打印分配最多的位置）"""
+        if not self.alloc_tracker.active:
+            self.alloc_tracker.start()
+            self.show_debug = True
+            print("开始内存分配统计（F4结束）")
+        else:
+            for line in self.alloc_tracker.report_lines():
+                print(line)
+            self.alloc_tracker.stop()
+    
+    def _create_window(self):
+        """按world配置创建窗口
+        Returns:
+            显示表面
+        """
+        if self.renderer == 'sdl2':
+            # 游戏画面显示在渲染器自己的窗口中，这里只设置一个隐藏的显示模式，保证convert_alpha()可用
+            return pygame.display.set_mode((1, 1), pygame.HIDDEN)
+        if not world.needs_scaling():
+            return pygame.display.set_mode(world.size)
+        if world.scale_mode == 'scaled':
+            # SDL负责缩放，显示表面仍是逻辑大小
+            return pygame.display.set_mode(world.size, pygame.SCALED | pygame.RESIZABLE)
+        return pygame.display.set_mode(world.window_size)
+    
+    def _present(self):
+        """把逻辑画面显示到窗口（'blit'模式缩放到窗口大小，目标是窗口表面本身，不分配新表面）"""
+        if not isinstance(self.screen, pygame.Surface):
+            self.screen.present()
+            return
+        if self.screen is not self.window:
+            pygame.transform.scale(self.screen, self.window.get_size(), self.window)
+        pygame.display.flip()
+    
+    def _frame_surface(self):
+        """当前画面的像素表面（录像和共享内存导出用；sdl2后端需要从渲染器读回）"""
+        if isinstance(self.screen, pygame.Surface):
+            return self.screen
+        return self.screen.to_surface()
+    
+    def _record_input_latency(self):
+        """记录输入延迟：从读取输入到包含该输入结果的画面显示出来的时间"""
+        if self.sim_thread is not None:
+            snapshot = self.sim_thread.snapshots.latest()
+            input_time = snapshot.input_time if snapshot is not None else None
+            self.profiler.set('sim_ms', self.sim_thread.tick_time)
+        else:
+            input_time = self.frame_input_time
+        if input_time is not None:
+            self.profiler.set('input_ms', (time.perf_counter() - input_time) * 1000)
+    
+    def draw_debug_overlay(self):
+        """绘制调试覆盖层（右上角FPS下方）"""
+        if self.debug_font is None:
+            self.debug_font = pygame.font.Font(None, 22)
+        y = 36
+        lines = self.profiler.overlay_lines()
+        if self.alloc_tracker.active:
+            lines += self.alloc_tracker.overlay_lines()
+        for line in lines:
+            text = self.debug_font.render(line, True, (180, 255, 180))
+            rect = text.get_rect()
+            rect.topright = (self.screen_width - 10, y)
+            self.screen.blit(text, rect)
+            y += 18
\ No newline at end of file
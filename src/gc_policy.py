@@ -0,0 +1,128 @@
+import gc
+import time
+from collections import deque
+
+# 垃圾回收策略：
+#   default  保持CPython默认设置，只测量回收停顿（对照用）
+#   relaxed  游戏进行中提高自动回收阈值，第2代回收基本不会发生，在自然停顿处显式回收
+#   manual   游戏进行中关闭自动回收，只在新生代对象过多时做第0代回收，在自然停顿处显式回收
+GC_MODES = ('default', 'relaxed', 'manual')
+
+# 自然停顿：播放动画、游戏暂停的状态，进入时做一次完整回收
+PAUSE_STATES = ('level_intro', 'level_complete', 'boss_victory', 'game_over', 'game_complete')
+
+RELAXED_THRESHOLDS = (20000, 50, 1000)  # 游戏进行中的(第0代, 第1代, 第2代)阈值
+MANUAL_GEN0_LIMIT = 100000  # manual策略下新生代对象超过这个数时做一次第0代回收
+
+
+class GCPolicy:
+    """垃圾回收策略 - 按游戏状态调整自动回收，并通过gc.callbacks测量每次回收的停顿
+    启动加载完成后把长期存在的对象（图片、字体、缓存）gc.freeze()到永久代，之后的回收不再遍历它们；
+    游戏进行中推迟或关闭自动回收，把完整回收放到关卡介绍、过关、游戏结束等本来就停顿的时候。
+    """
+    def __init__(self, mode='relaxed', history=600):
+        """初始化并注册回收回调
+        Args:
+            mode: GC_MODES中的策略
+            history: 保留的停顿记录数
+        Raises:
+            ValueError: 策略不存在
+        """
+        if mode not in GC_MODES:
+            raise ValueError(f'不支持的垃圾回收策略: {mode}')
+        self.mode = mode
+        self.default_thresholds = gc.get_threshold()
+        self.state = None  # 上一帧的游戏状态
+        self.pauses = deque(maxlen=history)  # 自动回收的停顿: (代, 毫秒)
+        self.counts = [0, 0, 0]  # 各代的自动回收次数
+        self.max_pause = 0.0  # 自动回收的最长停顿（毫秒）
+        self.frame_pause = 0.0  # 本帧自动回收的停顿合计（毫秒）
+        self.explicit_count = 0  # 在自然停顿处的显式回收次数
+        self.explicit_time = 0.0  # 显式回收的总耗时（毫秒）
+        self.frozen = 0  # 已移入永久代的对象数
+        self._start = None
+        self._explicit = False
+        gc.callbacks.append(self._on_gc)
+
+    def close(self):
+        """注销回调并恢复默认设置"""
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        gc.set_threshold(*self.default_thresholds)
+        gc.enable()
+        gc.unfreeze()
+
+    def _on_gc(self, phase, info):
+        """gc.callbacks回调：测量每次回收的停顿"""
+        if phase == 'start':
+            self._start = time.perf_counter()
+            return
+        if self._start is None:
+            return
+        pause = (time.perf_counter() - self._start) * 1000
+        self._start = None
+        if self._explicit:
+            self.explicit_time += pause
+            return
+        generation = info['generation']
+        self.pauses.append((generation, pause))
+        self.counts[generation] += 1
+        self.max_pause = max(self.max_pause, pause)
+        self.frame_pause += pause
+
+    def freeze(self):
+        """完整回收一次后把现存对象移入永久代（启动加载、进入游戏场景后调用）
+        default策略不做任何改变。
+        """
+        if self.mode == 'default':
+            return
+        self.collect()
+        gc.freeze()
+        self.frozen = gc.get_freeze_count()
+
+    def collect(self):
+        """显式完整回收（停顿计入显式回收，不计入自动回收）"""
+        self._explicit = True
+        try:
+            gc.collect()
+        finally:
+            self._explicit = False
+        self.explicit_count += 1
+
+    def set_state(self, state):
+        """每帧传入当前游戏状态，状态变化时切换回收设置
+        Args:
+            state: 游戏状态（'playing'、'level_intro' 等，开场动画为 'welcome'）
+        """
+        if state == self.state or self.mode == 'default':
+            self.state = state
+            return
+        self.state = state
+        if state == 'playing':
+            if self.mode == 'manual':
+                gc.disable()
+            else:
+                gc.set_threshold(*RELAXED_THRESHOLDS)
+            return
+        gc.set_threshold(*self.default_thresholds)
+        gc.enable()
+        if state in PAUSE_STATES:
+            self.collect()
+
+    def end_frame(self, profiler=None):
+        """结束一帧：manual策略检查新生代数量，并把本帧的回收停顿写入帧统计"""
+        if self.mode == 'manual' and not gc.isenabled() and gc.get_count()[0] > MANUAL_GEN0_LIMIT:
+            gc.collect(0)  # 停顿由回调计入自动回收
+        if profiler is not None:
+            profiler.set('gc_ms', self.frame_pause)
+            profiler.set('gc_max_ms', self.max_pause)
+            profiler.set('gc_gen2', self.counts[2])
+        self.frame_pause = 0.0
+
+    def report_lines(self):
+        """回收统计的文字报告"""
+        pauses = sorted(pause for _, pause in self.pauses)
+        p99 = pauses[min(len(pauses) - 1, int(len(pauses) * 0.99))] if pauses else 0.0
+        return [f'策略 {self.mode}: 自动回收 第0/1/2代 {self.counts[0]}/{self.counts[1]}/{self.counts[2]} 次，'
+                f'停顿P99 {p99:.3f} ms，最长 {self.max_pause:.3f} ms',
+                f'显式回收 {self.explicit_count} 次，共 {self.explicit_time:.2f} ms，永久代对象 {self.frozen}']
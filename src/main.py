@@ -7,6 +7,8 @@ import argparse
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.game import Game
+from src.gc_policy import GC_MODES
+from src.config import world, parse_size, SCALE_MODES, RENDER_BACKENDS, GAME_MODES, WORLD_WIDTH, WORLD_HEIGHT
 
 def main():
     """游戏主函数"""
@@ -14,12 +16,36 @@ def main():
     parser = argparse.ArgumentParser(description='打飞机游戏')
     parser.add_argument('--player', type=int, choices=[1, 2, 3], default=1,
                        help='选择玩家飞机类型 (1 或 2 、3)，默认使用第一个飞机样式')
+    parser.add_argument('--threaded', action='store_true',
+                       help='在独立线程中以固定频率运行游戏逻辑，主线程只负责绘制')
+    parser.add_argument('--record-format', choices=['png', 'raw'], default='png',
+                       help='F10录像的格式：png为每帧一个PNG文件，raw为连续的RGB原始数据')
+    parser.add_argument('--stream', metavar='NAME',
+                       help='把每帧画面和实体状态导出到指定名称的共享内存，供外部进程读取（需要numpy）')
+    parser.add_argument('--resolution', type=parse_size, default=(WORLD_WIDTH, WORLD_HEIGHT), metavar='WxH',
+                       help=f'逻辑分辨率（游戏世界大小），默认 {WORLD_WIDTH}x{WORLD_HEIGHT}')
+    parser.add_argument('--window', type=parse_size, default=None, metavar='WxH',
+                       help='窗口大小，默认与逻辑分辨率相同')
+    parser.add_argument('--scale-mode', choices=SCALE_MODES, default='scaled',
+                       help='逻辑画面缩放到窗口的方式：scaled由SDL缩放（整数倍），blit每帧缩放到--window大小')
+    parser.add_argument('--renderer', choices=RENDER_BACKENDS, default='surface',
+                       help='渲染后端：surface为CPU表面绘制，sdl2为SDL渲染器纹理绘制（由渲染器缩放到窗口）')
+    parser.add_argument('--render-driver', default=None,
+                       help='sdl2后端的SDL渲染驱动，例如 software、opengl，默认由SDL选择')
+    parser.add_argument('--mode', choices=GAME_MODES, default='normal',
+                       help='游戏模式：normal为普通关卡，bullet_hell为弹幕地狱（直接进入Boss战，需要numpy）')
+    parser.add_argument('--gc', choices=GC_MODES, default='relaxed',
+                       help='垃圾回收策略：default为CPython默认设置；relaxed在游戏进行中提高自动回收阈值，'
+                            'manual在游戏进行中关闭自动回收，两者都在关卡介绍、过关等停顿处做完整回收')
     args = parser.parse_args()
     
     print(f"使用飞机样式: {'第一个飞机' if args.player == 1 else '第二个飞机' if args.player == 2 else '第三个飞机' if args.player == 3 else '未知飞机'}")
     
+    world.configure(*args.resolution, window_size=args.window, scale_mode=args.scale_mode)
     pygame.init()
-    game = Game(player_type=args.player)
+    game = Game(player_type=args.player, threaded=args.threaded, record_format=args.record_format,
+                stream_name=args.stream, renderer=args.renderer, render_driver=args.render_driver,
+                mode=args.mode, gc_mode=args.gc)
     game.run()
 
 if __name__ == "__main__":
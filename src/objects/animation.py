@@ -3,6 +3,9 @@ import random
 import math
 import sys
 import os
+from itertools import islice
+from src.quality import quality, visible_count
+from src.render import draw
 
 class Animation:
     """动画基类"""
@@ -78,37 +81,16 @@ class WelcomeAnimation(Animation):
         self.screen_height = screen_height
         self.timer = 0
         self.duration = 180  # 3秒
-        self.stars = []
-        
-        # 生成星星背景
-        for i in range(50):
-            self.stars.append({
-                'x': random.randint(0, screen_width),
-                'y': random.randint(0, screen_height),
-                'size': random.randint(1, 3),
-                'speed': random.uniform(0.5, 2)
-            })
+        # 星空背景由Game的Starfield绘制，开场和游戏中使用同一个背景
     
     def update(self):
         """更新动画"""
         self.timer += 1
         if self.timer >= self.duration:
             self.finished = True
-        
-        # 更新星星
-        for star in self.stars:
-            star['y'] += star['speed']
-            if star['y'] > self.screen_height:
-                star['y'] = 0
-                star['x'] = random.randint(0, self.screen_width)
     
     def draw(self, screen):
         """绘制动画"""
-        # 绘制星空背景
-        for star in self.stars:
-            pygame.draw.circle(screen, (255, 255, 255), 
-                             (int(star['x']), int(star['y'])), star['size'])
-        
         # 标题淡入效果
         alpha = min(255, self.timer * 3)
         if self.timer > 120:  # 最后1秒淡出
@@ -147,12 +129,13 @@ class WelcomeAnimation(Animation):
 
 class LevelIntroAnimation(Animation):
     """关卡介绍动画"""
-    def __init__(self, screen_width, screen_height, level, player_score):
+    def __init__(self, screen_width, screen_height, level, player_score, hint='加油！'):
         super().__init__()
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.level = level
         self.player_score = player_score
+        self.hint = hint  # 关卡提示（来自关卡数据文件）
         self.timer = 0
         self.duration = 120  # 2秒
         self.particles = []
@@ -187,9 +170,9 @@ class LevelIntroAnimation(Animation):
         overlay.fill((0, 0, 0, 150))
         screen.blit(overlay, (0, 0))
         
-        # 绘制粒子
-        for particle in self.particles:
-            pygame.draw.circle(screen, particle['color'], 
+        # 绘制粒子（绘制数量由画面质量决定）
+        for particle in islice(self.particles, visible_count(len(self.particles), quality.stars)):
+            draw.circle(screen, particle['color'], 
                              (int(particle['x']), int(particle['y'])), particle['size'])
         
         # 缩放效果
@@ -218,12 +201,7 @@ class LevelIntroAnimation(Animation):
             screen.blit(score_text, score_rect)
             
             # 关卡提示
-            hints = {
-                1: '消灭 100 个敌人召唤Boss！',
-                2: '敌人更强了，小心应对！',
-                3: '最终关卡，全力以赴！'
-            }
-            hint_text = info_font.render(hints.get(self.level, '加油！'), True, (0, 255, 255))
+            hint_text = info_font.render(self.hint, True, (0, 255, 255))
             hint_rect = hint_text.get_rect(center=(self.screen_width // 2, 350))
             screen.blit(hint_text, hint_rect)
 
@@ -296,15 +274,16 @@ class LevelCompleteAnimation(Animation):
         for firework in self.fireworks:
             if not firework['exploded']:
                 # 上升的火焰
-                pygame.draw.circle(screen, (255, 200, 0), 
+                draw.circle(screen, (255, 200, 0), 
                                  (int(firework['x']), int(firework['y'])), 5)
             else:
-                # 爆炸粒子
-                for particle in firework['particles']:
+                # 爆炸粒子（绘制数量由画面质量决定）
+                particles = firework['particles']
+                for particle in islice(particles, visible_count(len(particles), quality.firework_particles)):
                     if particle['life'] > 0:
                         alpha = int(255 * (particle['life'] / 60))
                         size = max(1, int(3 * (particle['life'] / 60)))
-                        pygame.draw.circle(screen, particle['color'],
+                        draw.circle(screen, particle['color'],
                                          (int(particle['x']), int(particle['y'])), size)
         
         # 标题 - 使用支持中文的字体
@@ -425,29 +404,30 @@ class BossVictoryAnimation(Animation):
         overlay.fill((0, 0, 50, 200))
         screen.blit(overlay, (0, 0))
         
-        # 绘制闪烁星星
-        for sparkle in self.sparkles:
+        # 绘制闪烁星星（绘制数量由画面质量决定）
+        for sparkle in islice(self.sparkles, visible_count(len(self.sparkles), quality.sparkles)):
             color = (sparkle['alpha'], sparkle['alpha'], 255)
-            pygame.draw.circle(screen, color,
+            draw.circle(screen, color,
                              (sparkle['x'], sparkle['y']), sparkle['size'])
         
-        # 绘制烟花
+        # 绘制烟花（粒子数和光晕层数由画面质量决定）
         for firework in self.fireworks:
-            for particle in firework['particles']:
+            particles = firework['particles']
+            for particle in islice(particles, visible_count(len(particles), quality.firework_particles)):
                 if particle['life'] > 0:
                     # 计算透明度和大小
                     alpha = int(255 * (particle['life'] / particle['max_life']))
                     size = max(1, int(particle['size'] * (particle['life'] / particle['max_life'])))
                     
                     # 绘制粒子（带光晕效果）
-                    for glow in range(2, 0, -1):
+                    for glow in range(quality.firework_glow, 0, -1):
                         glow_alpha = alpha // (3 - glow)
                         glow_color = tuple(min(255, c + 50) for c in particle['color'])
-                        pygame.draw.circle(screen, glow_color,
+                        draw.circle(screen, glow_color,
                                          (int(particle['x']), int(particle['y'])), 
                                          size + glow)
                     
-                    pygame.draw.circle(screen, particle['color'],
+                    draw.circle(screen, particle['color'],
                                      (int(particle['x']), int(particle['y'])), size)
         
         # 胜利文字（脉冲效果）
@@ -550,13 +530,14 @@ class GameCompleteAnimation(Animation):
         overlay.fill((0, 0, 30, 200))
         screen.blit(overlay, (0, 0))
         
-        # 绘制烟花
+        # 绘制烟花（绘制数量由画面质量决定）
         for firework in self.fireworks:
-            for particle in firework['particles']:
+            particles = firework['particles']
+            for particle in islice(particles, visible_count(len(particles), quality.firework_particles)):
                 if particle['life'] > 0:
                     alpha = int(255 * (particle['life'] / 60))
                     size = max(1, int(4 * (particle['life'] / 60)))
-                    pygame.draw.circle(screen, particle['color'],
+                    draw.circle(screen, particle['color'],
                                      (int(particle['x']), int(particle['y'])), size)
         
         # 绘制文字
@@ -622,9 +603,9 @@ class GameOverAnimation(Animation):
         overlay.fill((0, 0, 0, 220))
         screen.blit(overlay, (0, 0))
         
-        # 绘制下落粒子
-        for particle in self.particles:
-            pygame.draw.circle(screen, particle['color'],
+        # 绘制下落粒子（绘制数量由画面质量决定）
+        for particle in islice(self.particles, visible_count(len(self.particles), quality.stars)):
+            draw.circle(screen, particle['color'],
                              (int(particle['x']), int(particle['y'])), particle['size'])
         
         # 主标题 - 闪烁效果
@@ -1,8 +1,13 @@
-import pygame
 import math
+from src.objects.masks import ellipse_mask
+from src.quality import quality
+from src.render import draw
+from src.objects.patterns import BULLET_STYLES
 
 class Bullet:
     """玩家普通子弹"""
+    homing = False  # 是否需要场景提供追踪目标
+
     def __init__(self, x, y):
         """初始化子弹"""
         self.x = x
@@ -12,6 +17,8 @@ class Bullet:
         self.speed = 10
         self.color = (255, 255, 0)  # 黄色
         self.damage = 1  # 伤害值
+        self.prev_x = x  # 上一帧位置（用于扫掠碰撞检测）
+        self.prev_y = y
         
     def update(self):
         """更新子弹位置"""
@@ -19,7 +26,7 @@ class Bullet:
         
     def draw(self, screen):
         """绘制子弹"""
-        pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
+        draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
 
 
 class TripleBullet(Bullet):
@@ -73,6 +80,10 @@ class GiantBullet(Bullet):
         self.damage = 5  # 高伤害
         self.glow_radius = 0  # 光晕效果
     
+    def get_mask(self):
+        """碰撞遮罩 - 椭圆形弹体"""
+        return ellipse_mask(self.width, self.height)
+    
     def update(self):
         """更新巨型子弹位置"""
         self.y -= self.speed
@@ -80,22 +91,18 @@ class GiantBullet(Bullet):
     
     def draw(self, screen):
         """绘制巨型子弹 - 带光晕效果"""
-        # 绘制光晕
-        for i in range(3):
+        # 绘制光晕（层数由画面质量决定）
+        for i in range(quality.bullet_glow_layers):
             alpha = 100 - i * 30
             radius = self.width // 2 + self.glow_radius + i * 3
-            glow_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surface, (*self.color, alpha), 
-                             (radius, radius), radius)
-            screen.blit(glow_surface, 
-                       (self.x + self.width // 2 - radius, 
-                        self.y + self.height // 2 - radius))
+            draw.translucent_circle(screen, self.color,
+                                    (self.x + self.width // 2, self.y + self.height // 2), radius, alpha)
         
         # 绘制主体
-        pygame.draw.ellipse(screen, self.color, 
+        draw.ellipse(screen, self.color, 
                           (self.x, self.y, self.width, self.height))
         # 绘制高光
-        pygame.draw.ellipse(screen, (255, 200, 200), 
+        draw.ellipse(screen, (255, 200, 200), 
                           (self.x + 5, self.y + 5, self.width - 10, self.height - 15))
 
 class ShotgunGiantBullet(ShotgunBullet):
@@ -116,6 +123,10 @@ class ShotgunGiantBullet(ShotgunBullet):
         self.height = 12
         self.glow_radius = 0
 
+    def get_mask(self):
+        """碰撞遮罩 - 椭圆形弹体"""
+        return ellipse_mask(self.width, self.height)
+
     def update(self):
         """更新散弹枪巨型子弹位置 - 按角度飞行"""
         super().update()
@@ -123,23 +134,95 @@ class ShotgunGiantBullet(ShotgunBullet):
         self.y -= self.speed * math.cos(self.angle)
     def draw(self, screen):
         """绘制散弹枪巨型子弹 - 带光晕效果"""
-        # 绘制光晕
-        for i in range(3):
+        # 绘制光晕（层数由画面质量决定）
+        for i in range(quality.bullet_glow_layers):
             alpha = 100 - i * 30
             radius = self.width // 2 + self.glow_radius + i * 3
-            glow_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surface, (*self.color, alpha), 
-                             (radius, radius), radius)
-            screen.blit(glow_surface, 
-                       (self.x + self.width // 2 - radius, 
-                        self.y + self.height // 2 - radius))
+            draw.translucent_circle(screen, self.color,
+                                    (self.x + self.width // 2, self.y + self.height // 2), radius, alpha)
         # 绘制主体
-        pygame.draw.ellipse(screen, self.color, 
+        draw.ellipse(screen, self.color, 
                           (self.x, self.y, self.width, self.height))
         # 绘制高光
-        pygame.draw.ellipse(screen, (255, 200, 200), 
+        draw.ellipse(screen, (255, 200, 200), 
                           (self.x + 5, self.y + 5, self.width - 10, self.height - 15))
         
+class HomingMissile(Bullet):
+    """追踪导弹 - 每隔几帧重新锁定最近的敌人并转向飞行"""
+    homing = True
+
+    def __init__(self, x, y, angle=0):
+        """初始化追踪导弹
+        Args:
+            x: x坐标
+            y: y坐标
+            angle: 初始发射角度（度数，0为正上方）
+        """
+        super().__init__(x, y)
+        self.width = 6
+        self.height = 12
+        self.speed = 7
+        self.color = (255, 120, 255)  # 粉紫色
+        self.damage = 1.5
+        self.turn_rate = 0.15  # 每帧最多转向的弧度
+        self.retarget_interval = 6  # 重新锁定目标的间隔（帧数）
+        self.retarget_timer = 0
+        self.target = None
+        rad = math.radians(angle)
+        self.vx = self.speed * math.sin(rad)
+        self.vy = -self.speed * math.cos(rad)
+
+    def needs_target(self):
+        """本帧是否需要重新锁定目标（由场景用空间索引查询最近的敌人）"""
+        if self.target is not None and self.target.is_dead():
+            self.target = None
+        self.retarget_timer -= 1
+        if self.target is None or self.retarget_timer <= 0:
+            self.retarget_timer = self.retarget_interval
+            return True
+        return False
+
+    def update(self):
+        """更新导弹位置 - 以有限的转向速度朝目标转弯"""
+        target = self.target
+        if target is not None:
+            center_x = self.x + self.width / 2
+            center_y = self.y + self.height / 2
+            desired = math.atan2(target.y + target.height / 2 - center_y,
+                                 target.x + target.width / 2 - center_x)
+            current = math.atan2(self.vy, self.vx)
+            diff = (desired - current + math.pi) % (2 * math.pi) - math.pi
+            if diff > self.turn_rate:
+                diff = self.turn_rate
+            elif diff < -self.turn_rate:
+                diff = -self.turn_rate
+            heading = current + diff
+            self.vx = self.speed * math.cos(heading)
+            self.vy = self.speed * math.sin(heading)
+        self.x += self.vx
+        self.y += self.vy
+
+    def draw(self, screen):
+        """绘制追踪导弹 - 沿飞行方向的尖头弹体和尾焰"""
+        center_x = self.x + self.width / 2
+        center_y = self.y + self.height / 2
+        # 飞行方向的单位向量及其法向量
+        dir_x = self.vx / self.speed
+        dir_y = self.vy / self.speed
+        half = self.height / 2
+        side = self.width / 2
+        nose = (center_x + dir_x * half, center_y + dir_y * half)
+        tail_x = center_x - dir_x * half
+        tail_y = center_y - dir_y * half
+        draw.polygon(screen, self.color, [
+            nose,
+            (tail_x - dir_y * side, tail_y + dir_x * side),
+            (tail_x + dir_y * side, tail_y - dir_x * side),
+        ])
+        draw.circle(screen, (255, 200, 0),
+                           (int(tail_x - dir_x * 2), int(tail_y - dir_y * 2)), 2)
+
+
 class EnemyBullet:
     """敌人子弹 - 向下飞行"""
     def __init__(self, x, y):
@@ -151,6 +234,8 @@ class EnemyBullet:
         self.speed = 5
         self.color = (255, 100, 100)  # 淡红色
         self.damage = 1
+        self.prev_x = x  # 上一帧位置（用于扫掠碰撞检测）
+        self.prev_y = y
         
     def update(self):
         """更新子弹位置 - 向下移动"""
@@ -158,7 +243,7 @@ class EnemyBullet:
         
     def draw(self, screen):
         """绘制敌人子弹"""
-        pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
+        draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
 
 
 class BossShotgunBullet:
@@ -178,12 +263,53 @@ class BossShotgunBullet:
         self.damage = 1
         self.width = 6
         self.height = 6
+        self.prev_x = x  # 上一帧位置（用于扫掠碰撞检测）
+        self.prev_y = y
+        # 角度固定不变，速度分量只计算一次
+        self.vx = self.speed * math.cos(self.angle)
+        self.vy = self.speed * math.sin(self.angle)
     
     def update(self):
         """更新子弹位置 - 按角度飞行"""
-        self.x += self.speed * math.cos(self.angle)
-        self.y += self.speed * math.sin(self.angle)
+        self.x += self.vx
+        self.y += self.vy
     
     def draw(self, screen):
         """绘制Boss散弹"""
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), 3)
\ No newline at end of file
+        draw.circle(screen, self.color, (int(self.x), int(self.y)), 3)
+
+
+class PatternBullet:
+    """弹幕子弹 - 由BulletPattern发射，速度向量在图案编译时已经算好，每帧只做加法"""
+    __slots__ = ('x', 'y', 'vx', 'vy', 'style', 'width', 'height', 'color', 'damage', 'prev_x', 'prev_y')
+
+    def __init__(self, x, y, vx, vy, style='orb'):
+        """初始化弹幕子弹
+        Args:
+            x: x坐标
+            y: y坐标
+            vx: 每帧x方向移动量
+            vy: 每帧y方向移动量
+            style: BULLET_STYLES中的样式名称（决定大小、颜色和形状）
+        """
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+        self.style = style
+        self.width, self.height, self.color, _ = BULLET_STYLES[style]
+        self.damage = 1
+        self.prev_x = x  # 上一帧位置（用于扫掠碰撞检测）
+        self.prev_y = y
+
+    def update(self):
+        """更新子弹位置"""
+        self.x += self.vx
+        self.y += self.vy
+
+    def draw(self, screen):
+        """绘制弹幕子弹（圆形子弹以(x, y)为圆心，与Boss散弹一致）"""
+        if BULLET_STYLES[self.style][3] == 'circle':
+            draw.circle(screen, self.color, (int(self.x), int(self.y)), self.width // 2)
+        else:
+            draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
@@ -0,0 +1,247 @@
+from itertools import repeat
+import numpy as np
+import pygame
+from src.objects.patterns import BULLET_STYLES, STYLE_NAMES
+from src.objects.collision import swept_pixel_hit
+from src.config import world
+
+# 样式下标 -> 宽、高、是否为圆形（圆形子弹以(x, y)为圆心绘制，与PatternBullet一致）
+_STYLE_WIDTH = np.array([BULLET_STYLES[name][0] for name in STYLE_NAMES], dtype=np.float64)
+_STYLE_HEIGHT = np.array([BULLET_STYLES[name][1] for name in STYLE_NAMES], dtype=np.float64)
+_STYLE_INDEX = {name: i for i, name in enumerate(STYLE_NAMES)}
+
+
+class _BulletProxy:
+    """精确碰撞测试时代表一发子弹的临时对象（swept_pixel_hit需要的属性）"""
+    __slots__ = ('x', 'y', 'prev_x', 'prev_y', 'width', 'height')
+
+
+class BulletField:
+    """弹幕地狱模式的敌人子弹 - 子弹数据按列保存在numpy数组中
+    更新、剔除、与玩家的碰撞初筛、炸弹清除都对整列计算，不为每发子弹创建对象；
+    绘制时每种样式一次blits。子弹按直线运动，上一帧位置由 当前位置 - 速度 得到。
+    """
+    def __init__(self, capacity=4096):
+        """初始化
+        Args:
+            capacity: 初始容量，不够时按两倍扩容
+        """
+        self.count = 0
+        self.x = np.empty(capacity)
+        self.y = np.empty(capacity)
+        self.vx = np.empty(capacity)
+        self.vy = np.empty(capacity)
+        self.style = np.empty(capacity, dtype=np.uint8)
+        self._rows = {}  # (图案名, 帧) -> 该帧子弹行的数组
+        self._sprites = {}  # 样式下标 -> (绘制用表面, 绘制偏移)
+        self._proxy = _BulletProxy()
+        self.spawned = 0  # 累计发射的子弹数
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """移除所有子弹（进入下一关时）"""
+        self.count = 0
+
+    def _reserve(self, extra):
+        """保证还能放下extra发子弹"""
+        needed = self.count + extra
+        capacity = len(self.x)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ('x', 'y', 'vx', 'vy', 'style'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def spawn_volley(self, origin_x, origin_y, pattern, tick, aim=None):
+        """整批加入弹幕图案一帧的子弹（Boss.advance_pattern的结果）
+        Args:
+            origin_x: 发射点x（图案偏移的基准）
+            origin_y: 发射点y
+            pattern: BulletPattern
+            tick: 图案内的帧号
+            aim: 瞄准方向单位向量，瞄准图案按此整体旋转
+        Returns:
+            加入的子弹数
+        """
+        key = (pattern.name, tick)
+        rows = self._rows.get(key)
+        if rows is None:
+            rows = self._rows[key] = np.array(pattern.steps.get(tick, ()), dtype=np.float64).reshape(-1, 4)
+        n = len(rows)
+        if n == 0:
+            return 0
+        self._reserve(n)
+        start, end = self.count, self.count + n
+        self.x[start:end] = rows[:, 0] + origin_x
+        self.y[start:end] = rows[:, 1] + origin_y
+        if pattern.aimed and aim is not None:
+            # 把正下方旋转到aim方向，与BulletPattern.rows相同，只做乘加
+            ax, ay = aim
+            self.vx[start:end] = rows[:, 2] * ay + rows[:, 3] * ax
+            self.vy[start:end] = rows[:, 3] * ay - rows[:, 2] * ax
+        else:
+            self.vx[start:end] = rows[:, 2]
+            self.vy[start:end] = rows[:, 3]
+        self.style[start:end] = _STYLE_INDEX[pattern.style]
+        self.count = end
+        self.spawned += n
+        return n
+
+    def update(self):
+        """所有子弹移动一帧"""
+        n = self.count
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+
+    def _keep(self, keep):
+        """只保留keep为True的子弹（保持顺序）
+        Returns:
+            移除的子弹数
+        """
+        n = self.count
+        kept = int(np.count_nonzero(keep))
+        if kept == n:
+            return 0
+        for name in ('x', 'y', 'vx', 'vy', 'style'):
+            array = getattr(self, name)
+            array[:kept] = array[:n][keep]
+        self.count = kept
+        return n - kept
+
+    def cull(self, margin=0):
+        """移除包围盒完全超出世界范围（四周扩展margin）的子弹，规则与outside_world相同
+        Returns:
+            移除的子弹数
+        """
+        n = self.count
+        if n == 0:
+            return 0
+        x, y, style = self.x[:n], self.y[:n], self.style[:n]
+        keep = ((x + _STYLE_WIDTH[style] >= -margin) & (x <= world.width + margin) &
+                (y + _STYLE_HEIGHT[style] >= -margin) & (y <= world.height + margin))
+        return self._keep(keep)
+
+    def collide(self, target, profiler=None):
+        """与target（玩家）的碰撞：先对整列做扫掠包围盒初筛，再对少数候选做与普通子弹相同的扫掠像素测试
+        命中的子弹立即移除。
+        Returns:
+            命中的子弹数
+        """
+        n = self.count
+        if n == 0:
+            return 0
+        x, y, vx, vy, style = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n], self.style[:n]
+        width = _STYLE_WIDTH[style]
+        height = _STYLE_HEIGHT[style]
+        # 上一帧到本帧的移动范围
+        left = np.minimum(x, x - vx)
+        top = np.minimum(y, y - vy)
+        right = np.maximum(x, x - vx) + width
+        bottom = np.maximum(y, y - vy) + height
+        candidates = np.flatnonzero((left < target.x + target.width) & (right > target.x) &
+                                    (top < target.y + target.height) & (bottom > target.y))
+        if len(candidates) == 0:
+            return 0
+        proxy = self._proxy
+        hits = []
+        for i in candidates.tolist():
+            proxy.x = float(x[i])
+            proxy.y = float(y[i])
+            proxy.prev_x = proxy.x - float(vx[i])
+            proxy.prev_y = proxy.y - float(vy[i])
+            proxy.width = int(width[i])
+            proxy.height = int(height[i])
+            if swept_pixel_hit(proxy, target, profiler) is not None:
+                hits.append(i)
+        if hits:
+            keep = np.ones(n, dtype=bool)
+            keep[hits] = False
+            self._keep(keep)
+        return len(hits)
+
+    def clear_radius(self, center_x, center_y, radius):
+        """移除中心点在圆内的子弹（炸弹）
+        Returns:
+            移除的子弹数
+        """
+        n = self.count
+        if n == 0:
+            return 0
+        style = self.style[:n]
+        dx = self.x[:n] + _STYLE_WIDTH[style] / 2 - center_x
+        dy = self.y[:n] + _STYLE_HEIGHT[style] / 2 - center_y
+        return self._keep(dx * dx + dy * dy > radius * radius)
+
+    def sizes(self):
+        """所有子弹的 (宽度数组, 高度数组)"""
+        style = self.style[:self.count]
+        return _STYLE_WIDTH[style], _STYLE_HEIGHT[style]
+
+    def lowest_in_rect(self, left, top, right, bottom):
+        """矩形范围内最靠下的子弹（自动操作机器人躲避用）
+        Returns:
+            (中心x, y)，没有子弹时返回None
+        """
+        n = self.count
+        if n == 0:
+            return None
+        x, y, style = self.x[:n], self.y[:n], self.style[:n]
+        inside = np.flatnonzero((x + _STYLE_WIDTH[style] >= left) & (x <= right) &
+                                (y + _STYLE_HEIGHT[style] >= top) & (y <= bottom))
+        if len(inside) == 0:
+            return None
+        i = inside[np.argmax(y[inside])]
+        return float(x[i] + _STYLE_WIDTH[style[i]] / 2), float(y[i])
+
+    def snapshot(self):
+        """复制当前子弹（多线程模式的渲染快照）"""
+        copy = BulletField.__new__(BulletField)
+        n = self.count
+        copy.count = n
+        for name in ('x', 'y', 'vx', 'vy', 'style'):
+            setattr(copy, name, getattr(self, name)[:n].copy())
+        copy._rows = self._rows
+        copy._sprites = self._sprites
+        copy._proxy = _BulletProxy()
+        copy.spawned = self.spawned
+        return copy
+
+    def _sprite(self, index):
+        """样式的预渲染子弹（黑色为透明色），以及相对于(x, y)的绘制偏移"""
+        cached = self._sprites.get(index)
+        if cached is None:
+            width, height, color, shape = BULLET_STYLES[STYLE_NAMES[index]]
+            surface = pygame.Surface((width, height))
+            surface.fill((0, 0, 0))
+            if shape == 'circle':
+                radius = width // 2
+                pygame.draw.circle(surface, color, (radius, radius), radius)
+                offset = radius
+            else:
+                surface.fill(color)
+                offset = 0
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            surface.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+            cached = self._sprites[index] = (surface, offset)
+        return cached
+
+    def draw(self, screen):
+        """绘制所有子弹：每种样式一次blits"""
+        n = self.count
+        if n == 0:
+            return
+        xs = self.x[:n].astype(np.int32)
+        ys = self.y[:n].astype(np.int32)
+        style = self.style[:n]
+        for index in np.unique(style).tolist():
+            surface, offset = self._sprite(index)
+            selected = style == index
+            positions = zip((xs[selected] - offset).tolist(), (ys[selected] - offset).tolist())
+            screen.blits(zip(repeat(surface), positions), doreturn=False)
@@ -0,0 +1,113 @@
+import math
+from src.objects.masks import shape_mask, rect_mask
+
+
+def aabb_overlap(x1, y1, w1, h1, x2, y2, w2, h2):
+    """两个轴对齐矩形是否重叠"""
+    return x1 < x2 + w2 and x1 + w1 > x2 and y1 < y2 + h2 and y1 + h1 > y2
+
+
+def swept_aabb(x0, y0, x1, y1, w, h, bx, by, bw, bh):
+    """扫掠碰撞检测 - 矩形从(x0, y0)移动到(x1, y1)的过程中最早何时碰到静止矩形
+    把静止矩形按移动矩形的大小扩展后，对移动矩形左上角的线段做分离轴（slab）测试。
+    Args:
+        x0, y0: 移动矩形上一帧的左上角
+        x1, y1: 移动矩形本帧的左上角
+        w, h: 移动矩形的宽高
+        bx, by, bw, bh: 静止矩形
+    Returns:
+        最早碰撞时间t（0为上一帧位置，1为本帧位置），没有碰撞时返回None
+    """
+    # 宽相位：扫掠包围盒与目标不重叠时直接返回
+    min_x = x0 if x0 < x1 else x1
+    min_y = y0 if y0 < y1 else y1
+    if not aabb_overlap(min_x, min_y, abs(x1 - x0) + w, abs(y1 - y0) + h, bx, by, bw, bh):
+        return None
+
+    # 扩展后的目标矩形（左上角线段与之相交即为碰撞）
+    left = bx - w
+    right = bx + bw
+    top = by - h
+    bottom = by + bh
+
+    t_enter = 0.0
+    t_exit = 1.0
+    for start, delta, low, high in ((x0, x1 - x0, left, right), (y0, y1 - y0, top, bottom)):
+        if delta == 0:
+            # 该轴没有移动，必须始终在范围内
+            if start <= low or start >= high:
+                return None
+            continue
+        t_low = (low - start) / delta
+        t_high = (high - start) / delta
+        if t_low > t_high:
+            t_low, t_high = t_high, t_low
+        if t_low > t_enter:
+            t_enter = t_low
+        if t_high < t_exit:
+            t_exit = t_high
+        if t_enter >= t_exit:
+            return None
+    return t_enter
+
+
+def swept_hit(obj, target):
+    """对象从上一帧位置(prev_x, prev_y)移动到当前位置的过程中与target最早的碰撞时间
+    没有记录上一帧位置的对象按静止处理。
+    Returns:
+        碰撞时间t或None
+    """
+    width = getattr(obj, 'width', 30)
+    height = getattr(obj, 'height', 30)
+    return swept_aabb(getattr(obj, 'prev_x', obj.x), getattr(obj, 'prev_y', obj.y),
+                      obj.x, obj.y, width, height,
+                      target.x, target.y,
+                      getattr(target, 'width', 30), getattr(target, 'height', 30))
+
+
+def pixel_overlap(obj1, x1, y1, obj2, profiler=None):
+    """像素级碰撞测试 - obj1位于(x1, y1)时与obj2的遮罩是否重叠
+    应该只在AABB测试通过后调用。两个对象都是矩形时直接返回True，不做像素测试。
+    Args:
+        profiler: 可选的FrameProfiler，统计像素测试次数（mask_tests）
+    """
+    mask1 = shape_mask(obj1)
+    mask2 = shape_mask(obj2)
+    if mask1 is None and mask2 is None:
+        return True
+    if mask1 is None:
+        mask1 = rect_mask(getattr(obj1, 'width', 30), getattr(obj1, 'height', 30))
+    if mask2 is None:
+        mask2 = rect_mask(getattr(obj2, 'width', 30), getattr(obj2, 'height', 30))
+    if profiler is not None:
+        profiler.count('mask_tests')
+    offset = (int(obj2.x) - int(x1), int(obj2.y) - int(y1))
+    return mask1.overlap(mask2, offset) is not None
+
+
+def swept_pixel_hit(obj, target, profiler=None):
+    """扫掠碰撞 + 像素测试
+    先做扫掠AABB测试，通过后沿轨迹从进入时刻到本帧位置取样做像素测试，
+    取样间距不超过两个对象中较小的宽度或高度，高速对象也不会跳过很薄的目标。
+    Returns:
+        第一个像素重叠的取样时间t，没有碰撞时返回None
+    """
+    t = swept_hit(obj, target)
+    if t is None:
+        return None
+    if shape_mask(obj) is None and shape_mask(target) is None:
+        return t
+
+    x0 = getattr(obj, 'prev_x', obj.x)
+    y0 = getattr(obj, 'prev_y', obj.y)
+    dx = obj.x - x0
+    dy = obj.y - y0
+    size = max(1, min(getattr(obj, 'width', 30), getattr(obj, 'height', 30),
+                      getattr(target, 'width', 30), getattr(target, 'height', 30)))
+    distance = math.hypot(dx, dy) * (1 - t)
+    samples = int(distance / size) + 1
+    for i in range(samples + 1):
+        sample_t = t + (1 - t) * i / samples
+        if pixel_overlap(obj, x0 + dx * sample_t, y0 + dy * sample_t, target, profiler):
+            return sample_t
+    return None
@@ -1,9 +1,17 @@
 import pygame
 import random
+import math
 import os
+from src.objects.masks import mask_from_drawing, mask_from_surface, rotation_step
+from src.config import world
+from src.render import draw
+from src.objects.bullet import EnemyBullet, PatternBullet
+from src.objects.patterns import COMPILED_PATTERNS, BOSS_ACTIONS
 
 class Enemy:
     """基础敌人类"""
+    archetype = 'basic'  # 敌人原型，决定在EntityRegistry中的分组
+
     def __init__(self, x, y, level=1):
         """初始化敌人
         Args:
@@ -27,13 +35,13 @@ class Enemy:
         self.x += self.speed * self.direction
         
         # 边界检测，碰到边界后改变方向并向下移动
-        if self.x <= 0 or self.x >= 800 - self.width:
+        if self.x <= 0 or self.x >= world.width - self.width:
             self.direction *= -1
             self.y += 20
             
     def draw(self, screen):
         """绘制敌人"""
-        pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
+        draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
     
     def is_dead(self):
         """检查是否死亡"""
@@ -46,6 +54,10 @@ class Enemy:
 
 class Rock(Enemy):
     """石头敌人 - 从上方落下，随机形状"""
+    archetype = 'rock'
+    # 会随旋转改变外形的形状及其旋转对称周期（度）
+    ROTATION_PERIODS = {'hexagon': 60, 'star': 72}
+
     def __init__(self, x, y, level=1):
         super().__init__(x, y, level)
         self.width = 30
@@ -71,63 +83,76 @@ class Rock(Enemy):
         
     def draw(self, screen):
         """绘制石头 - 根据形状类型绘制不同形状"""
-        center_x = self.x + self.width // 2
-        center_y = self.y + self.height // 2
+        self._draw_shape(screen, self.x, self.y, self.rotation)
+    
+    def get_mask(self):
+        """碰撞遮罩 - 按形状缓存，会旋转的形状按旋转角度档位分别缓存"""
+        period = self.ROTATION_PERIODS.get(self.shape_type)
+        rotation = rotation_step(self.rotation, period) if period else 0
+        return mask_from_drawing(
+            ('rock', self.shape_type, self.width, self.height, rotation),
+            self.width, self.height,
+            lambda surface: self._draw_shape(surface, 0, 0, rotation))
+    
+    def _draw_shape(self, screen, x, y, rotation):
+        """以(x, y)为左上角、按rotation角度绘制石头形状"""
+        center_x = x + self.width // 2
+        center_y = y + self.height // 2
         
         if self.shape_type == 'circle':
             # 圆形
-            pygame.draw.circle(screen, self.color, (int(center_x), int(center_y)), self.width // 2)
-            pygame.draw.circle(screen, (80, 80, 80), (int(center_x), int(center_y)), self.width // 2, 2)
+            draw.circle(screen, self.color, (int(center_x), int(center_y)), self.width // 2)
+            draw.circle(screen, (80, 80, 80), (int(center_x), int(center_y)), self.width // 2, 2)
             
         elif self.shape_type == 'triangle':
             # 三角形
             points = [
-                (center_x, self.y),
-                (self.x, self.y + self.height),
-                (self.x + self.width, self.y + self.height)
+                (center_x, y),
+                (x, y + self.height),
+                (x + self.width, y + self.height)
             ]
-            pygame.draw.polygon(screen, self.color, points)
-            pygame.draw.polygon(screen, (80, 80, 80), points, 2)
+            draw.polygon(screen, self.color, points)
+            draw.polygon(screen, (80, 80, 80), points, 2)
             
         elif self.shape_type == 'diamond':
             # 菱形
             points = [
-                (center_x, self.y),
-                (self.x + self.width, center_y),
-                (center_x, self.y + self.height),
-                (self.x, center_y)
+                (center_x, y),
+                (x + self.width, center_y),
+                (center_x, y + self.height),
+                (x, center_y)
             ]
-            pygame.draw.polygon(screen, self.color, points)
-            pygame.draw.polygon(screen, (80, 80, 80), points, 2)
+            draw.polygon(screen, self.color, points)
+            draw.polygon(screen, (80, 80, 80), points, 2)
             
         elif self.shape_type == 'hexagon':
             # 六边形
-            import math
             points = []
             for i in range(6):
-                angle = math.radians(60 * i + self.rotation)
+                angle = math.radians(60 * i + rotation)
                 px = center_x + self.width // 2 * math.cos(angle)
                 py = center_y + self.height // 2 * math.sin(angle)
                 points.append((px, py))
-            pygame.draw.polygon(screen, self.color, points)
-            pygame.draw.polygon(screen, (80, 80, 80), points, 2)
+            draw.polygon(screen, self.color, points)
+            draw.polygon(screen, (80, 80, 80), points, 2)
             
         elif self.shape_type == 'star':
             # 星形
-            import math
             points = []
             for i in range(10):
-                angle = math.radians(36 * i + self.rotation)
+                angle = math.radians(36 * i + rotation)
                 radius = (self.width // 2) if i % 2 == 0 else (self.width // 4)
                 px = center_x + radius * math.cos(angle - math.pi / 2)
                 py = center_y + radius * math.sin(angle - math.pi / 2)
                 points.append((px, py))
-            pygame.draw.polygon(screen, self.color, points)
-            pygame.draw.polygon(screen, (80, 80, 80), points, 2)
+            draw.polygon(screen, self.color, points)
+            draw.polygon(screen, (80, 80, 80), points, 2)
 
 
 class EnemyPlane(Enemy):
     """敌方飞机 - 会发射子弹"""
+    archetype = 'plane'
+
     def __init__(self, x, y, level=1):
         super().__init__(x, y, level)
         self.width = 40
@@ -145,7 +170,7 @@ class EnemyPlane(Enemy):
         self.y += 0.5  # 缓慢向下移动
         
         # 边界检测
-        if self.x <= 0 or self.x >= 800 - self.width:
+        if self.x <= 0 or self.x >= world.width - self.width:
             self.direction *= -1
         
         # 更新射击冷却
@@ -153,15 +178,24 @@ class EnemyPlane(Enemy):
         
     def draw(self, screen):
         """绘制敌机"""
+        self._draw_shape(screen, self.x, self.y)
+    
+    def get_mask(self):
+        """碰撞遮罩 - 三角形机身和机翼"""
+        return mask_from_drawing(('plane', self.width, self.height), self.width, self.height,
+                                 lambda surface: self._draw_shape(surface, 0, 0))
+    
+    def _draw_shape(self, screen, x, y):
+        """以(x, y)为左上角绘制敌机形状"""
         # 绘制飞机主体
-        pygame.draw.polygon(screen, (200, 0, 0), [
-            (self.x + self.width // 2, self.y + self.height),  # 底部
-            (self.x, self.y),  # 左上角
-            (self.x + self.width, self.y)  # 右上角
+        draw.polygon(screen, (200, 0, 0), [
+            (x + self.width // 2, y + self.height),  # 底部
+            (x, y),  # 左上角
+            (x + self.width, y)  # 右上角
         ])
         # 绘制机翼
-        pygame.draw.rect(screen, (150, 0, 0), 
-                       (self.x + 5, self.y + 10, self.width - 10, 8))
+        draw.rect(screen, (150, 0, 0), 
+                       (x + 5, y + 10, self.width - 10, 8))
     
     def can_shoot(self):
         """检查是否可以射击"""
@@ -173,12 +207,14 @@ class EnemyPlane(Enemy):
     
     def shoot(self):
         """射击 - 返回敌人子弹"""
-        from src.objects.bullet import EnemyBullet
         return EnemyBullet(self.x + self.width // 2, self.y + self.height)
 
 
 class Boss(Enemy):
     """Boss - 怪物，能发射子弹、丢石头、召唤飞机"""
+    archetype = 'boss'
+    actions = None  # 可选行动，None表示使用本关的BOSS_ACTIONS（弹幕地狱模式替换为BULLET_HELL_ACTIONS）
+
     def __init__(self, x, y, level=1):
         super().__init__(x, y, level)
         self.width = 80
@@ -192,6 +228,8 @@ class Boss(Enemy):
         self.direction_y = 1  # 垂直方向
         self.action_cooldown = 0
         self.action_delay = 60  # 行动间隔更频繁
+        self.pattern = None  # 正在发射的弹幕图案名称
+        self.pattern_tick = 0  # 弹幕图案已发射的帧数
         
         # Boss出现在屏幕上方
         self.y = 50
@@ -221,17 +259,17 @@ class Boss(Enemy):
         self.x += self.speed_x * self.direction_x
         
         # 水平边界检测
-        if self.x <= 0 or self.x >= 800 - self.width:
+        if self.x <= 0 or self.x >= world.width - self.width:
             self.direction_x *= -1
         
         # 垂直移动
         self.y += self.speed_y * self.direction_y
         
         # 垂直边界检测（只在屏幕上半部分移动）
-        # 上边界: 50像素，下边界: 300像素（屏幕一半）
+        # 上边界: 50像素，下边界: 世界高度的一半
         if self.y <= 50:
             self.direction_y = 1  # 向下移动
-        elif self.y >= 250:  # 留出空间给Boss高度
+        elif self.y >= world.height // 2 - 50:  # 留出空间给Boss高度
             self.direction_y = -1  # 向上移动
         
         # 更新行动冷却
@@ -244,15 +282,15 @@ class Boss(Enemy):
             screen.blit(self.image, (self.x, self.y))
         else:
             # 使用默认绘制
-            pygame.draw.rect(screen, (255, 0, 255), (self.x, self.y, self.width, self.height))
+            draw.rect(screen, (255, 0, 255), (self.x, self.y, self.width, self.height))
         
         # 绘制血条
         bar_width = self.width
         bar_height = 8
         health_ratio = max(0, self.hp / self.max_hp)
-        pygame.draw.rect(screen, (255, 0, 0), 
+        draw.rect(screen, (255, 0, 0), 
                        (self.x, self.y - 15, bar_width, bar_height))
-        pygame.draw.rect(screen, (0, 255, 0), 
+        draw.rect(screen, (0, 255, 0), 
                        (self.x, self.y - 15, bar_width * health_ratio, bar_height))
         
         # 显示Boss血量数值
@@ -260,6 +298,12 @@ class Boss(Enemy):
         hp_text = font.render(f'{int(self.hp)}/{self.max_hp}', True, (255, 255, 255))
         screen.blit(hp_text, (self.x + 5, self.y - 30))
     
+    def get_mask(self):
+        """碰撞遮罩 - 有图片时按图片透明通道生成，默认绘制的方块为矩形"""
+        if self.image is None:
+            return None
+        return mask_from_surface(('boss', self.level, self.width, self.height), self.image)
+    
     def can_act(self):
         """检查是否可以执行行动"""
         if self.action_cooldown >= self.action_delay:
@@ -268,38 +312,15 @@ class Boss(Enemy):
         return False
     
     def perform_action(self):
-        """执行随机行动 - 返回行动类型和对象"""
-        action = random.choice(['shoot', 'scatter_shot', 'triple_shot', 'throw_rock', 'summon_plane'])
-        
-        if action == 'shoot':
-            # 发射普通子弹
-            from src.objects.bullet import EnemyBullet
-            bullets = [
-                EnemyBullet(self.x + 20, self.y + self.height),
-                EnemyBullet(self.x + 40, self.y + self.height),
-                EnemyBullet(self.x + 60, self.y + self.height)
-            ]
-            return ('bullets', bullets)
-        
-        elif action == 'scatter_shot':
-            # 散弹攻击 - 多方向射击
-            from src.objects.bullet import BossShotgunBullet
-            bullets = []
-            center_x = self.x + self.width // 2
-            # 发射扇形散弹
-            for angle in range(-60, 70, 20):  # -60度到60度，间陔20度
-                bullets.append(BossShotgunBullet(center_x, self.y + self.height, angle))
-            return ('bullets', bullets)
+        """执行随机行动 - 返回行动类型和对象
+        行动从本关的BOSS_ACTIONS中选择；弹幕行动只开始图案，子弹由emit_pattern逐帧发射。
+        """
+        action = random.choice(self.actions or BOSS_ACTIONS.get(self.level, BOSS_ACTIONS[1]))
         
-        elif action == 'triple_shot':
-            # 三连发弹幕
-            from src.objects.bullet import EnemyBullet
-            bullets = []
-            for i in range(5):  # 5条线，每条线3发
-                x_pos = self.x + i * 20
-                for j in range(3):
-                    bullets.append(EnemyBullet(x_pos, self.y + self.height + j * 15))
-            return ('bullets', bullets)
+        if action in COMPILED_PATTERNS:
+            # 弹幕：开始新的图案（替换还没发射完的图案）
+            self.start_pattern(action)
+            return ('pattern', action)
         
         elif action == 'throw_rock':
             # 丢石头
@@ -313,4 +334,51 @@ class Boss(Enemy):
             plane = EnemyPlane(self.x + self.width // 2, self.y + self.height, self.level)
             return ('plane', plane)
         
-        return (None, None)
\ No newline at end of file
+        return (None, None)
+    
+    def start_pattern(self, name):
+        """开始弹幕图案（替换还没发射完的图案）"""
+        self.pattern = name
+        self.pattern_tick = 0
+    
+    def advance_pattern(self, target=None):
+        """当前弹幕图案前进一帧（每帧调用一次）
+        Args:
+            target: 瞄准目标的坐标 (x, y)，瞄准图案使用
+        Returns:
+            (图案, 图案内帧号, 瞄准方向)，没有图案时返回None；发射点为Boss底边左端
+        """
+        if self.pattern is None:
+            return None
+        pattern = COMPILED_PATTERNS[self.pattern]
+        tick = self.pattern_tick
+        self.pattern_tick += 1
+        if self.pattern_tick >= pattern.duration:
+            self.pattern = None
+        
+        aim = None
+        if pattern.aimed and target is not None:
+            dx = target[0] - (self.x + self.width / 2)
+            dy = target[1] - (self.y + self.height)
+            distance = math.hypot(dx, dy)
+            if distance > 0:
+                aim = (dx / distance, dy / distance)
+        return pattern, tick, aim
+    
+    def emit_pattern(self, target=None):
+        """发射当前弹幕图案在本帧的子弹（每帧调用一次）
+        图案的偏移和速度已预先算好，这里只加上Boss的位置；瞄准图案按目标方向整体旋转。
+        Args:
+            target: 瞄准目标的坐标 (x, y)，瞄准图案使用
+        Returns:
+            PatternBullet列表，本帧不发射时为空列表
+        """
+        step = self.advance_pattern(target)
+        if step is None:
+            return []
+        pattern, tick, aim = step
+        origin_x = self.x
+        origin_y = self.y + self.height
+        style = pattern.style
+        return [PatternBullet(origin_x + dx, origin_y + dy, vx, vy, style)
+                for dx, dy, vx, vy in pattern.rows(tick, aim)]
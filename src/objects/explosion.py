@@ -1,14 +1,18 @@
-import pygame
 import random
+import copy
+from itertools import islice
+from src.quality import quality, visible_count
+from src.render import draw
 
 class Explosion:
     """爆炸动画效果"""
-    def __init__(self, x, y, size=30):
+    def __init__(self, x, y, size=30, particle_count=15):
         """初始化爆炸效果
         Args:
             x: 中心x坐标
             y: 中心y坐标
             size: 爆炸大小
+            particle_count: 粒子数量（合并爆炸按击杀数增加，但有上限）
         """
         self.x = x
         self.y = y
@@ -20,7 +24,7 @@ class Explosion:
         self.particles = []
         
         # 生成粒子
-        for i in range(15):
+        for i in range(particle_count):
             angle = random.uniform(0, 360)
             speed = random.uniform(2, 5)
             self.particles.append({
@@ -37,6 +41,12 @@ class Explosion:
                 ])
             })
     
+    def snapshot(self):
+        """复制当前状态（粒子会被原地更新，需要逐个复制）"""
+        snapshot = copy.copy(self)
+        snapshot.particles = [particle.copy() for particle in self.particles]
+        return snapshot
+    
     def update(self):
         """更新爆炸动画"""
         self.timer += 1
@@ -56,24 +66,59 @@ class Explosion:
         # 计算透明度
         alpha = int(255 * (1 - self.timer / self.lifetime))
         
-        # 绘制扩散圆圈
+        # 绘制扩散圆圈（层数由画面质量决定）
         if self.current_size > 0:
-            for i in range(3):
+            for i in range(quality.explosion_rings):
                 radius = int(self.current_size - i * 5)
                 if radius > 0:
                     color_alpha = max(0, alpha - i * 50)
-                    surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-                    pygame.draw.circle(surface, (255, 150, 0, color_alpha), 
-                                     (radius, radius), radius)
-                    screen.blit(surface, (self.x - radius, self.y - radius))
+                    draw.translucent_circle(screen, (255, 150, 0), (self.x, self.y), radius, color_alpha)
         
-        # 绘制粒子
-        for particle in self.particles:
+        # 绘制粒子（低画质时只绘制一部分，粒子仍全部更新）
+        count = visible_count(len(self.particles), quality.explosion_particles)
+        for particle in islice(self.particles, count):
             if particle['size'] > 0:
-                pygame.draw.circle(screen, particle['color'], 
+                draw.circle(screen, particle['color'], 
                                  (int(particle['x']), int(particle['y'])), 
                                  int(particle['size']))
     
     def is_finished(self):
         """检查动画是否结束"""
         return self.timer >= self.lifetime
+
+
+class BombWave:
+    """炸弹冲击波 - 从中心扩散到炸弹半径的圆环"""
+    def __init__(self, x, y, radius):
+        """初始化冲击波
+        Args:
+            x: 中心x坐标
+            y: 中心y坐标
+            radius: 最终半径（与炸弹的作用半径一致）
+        """
+        self.x = x
+        self.y = y
+        self.radius = radius
+        self.lifetime = 20
+        self.timer = 0
+    
+    def update(self):
+        """更新冲击波"""
+        self.timer += 1
+    
+    def draw(self, screen):
+        """绘制冲击波（空心圆环，不需要额外的透明表面）"""
+        progress = self.timer / self.lifetime
+        radius = int(self.radius * min(1, progress * 1.5))
+        if radius <= 0:
+            return
+        fade = max(0, 1 - progress)
+        width = max(1, int(12 * fade))
+        color = (255, int(255 * fade), int(180 * fade))
+        draw.circle(screen, color, (int(self.x), int(self.y)), radius, width)
+        if radius > 20:
+            draw.circle(screen, (255, 200, 120), (int(self.x), int(self.y)), radius - 20, 1)
+    
+    def is_finished(self):
+        """检查动画是否结束"""
+        return self.timer >= self.lifetime
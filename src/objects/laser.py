@@ -0,0 +1,123 @@
+import pygame
+import math
+from src.config import world
+
+# 预渲染的光束片段缓存: (角度, 帧) -> (表面, 每段步长x, 每段步长y)
+_segment_cache = {}
+
+
+class Laser:
+    """持续激光 - 每帧对光束经过的所有敌人造成伤害，遇到第一块石头时被挡住"""
+    SEGMENT_LENGTH = 32  # 预渲染光束片段的长度（像素）
+    FLICKER_FRAMES = 2  # 光束闪烁的帧数
+
+    def __init__(self, angle=0):
+        """初始化激光
+        Args:
+            angle: 光束角度（度数，0为正上方，正值向右偏）
+        """
+        self.width = 10  # 光束宽度（伤害判定和绘制）
+        self.damage = 0.08  # 每帧伤害
+        self.max_length = world.height + 50  # 从屏幕底部也能射到顶部
+        self.angle = angle
+        self.dir_x = math.sin(math.radians(angle))
+        self.dir_y = -math.cos(math.radians(angle))
+        self.active = False  # 本帧是否在发射
+        self.origin_x = 0
+        self.origin_y = 0
+        self.length = 0  # 本帧光束实际长度（被石头挡住时变短）
+        self.timer = 0
+
+    def fire(self, origin_x, origin_y, grid):
+        """发射一帧激光
+        Args:
+            origin_x, origin_y: 光束起点
+            grid: 存活敌人的SpatialGrid
+        Returns:
+            本帧被光束命中的敌人列表（从近到远）
+        """
+        self.active = True
+        self.timer += 1
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.length = self.max_length
+        hit_enemies = []
+        for distance, enemy in grid.raycast(origin_x, origin_y, self.dir_x, self.dir_y,
+                                            self.max_length, self.width):
+            hit_enemies.append(enemy)
+            if enemy.archetype == 'rock':
+                # 石头挡住光束
+                self.length = distance
+                break
+        return hit_enemies
+
+    def stop(self):
+        """停止发射"""
+        self.active = False
+
+    def draw(self, screen):
+        """绘制光束 - 沿光束重复贴预渲染片段，末端贴一个光斑"""
+        if not self.active or self.length <= 0:
+            return
+        frame = self.timer % self.FLICKER_FRAMES
+        segment, step_x, step_y = _baked_segment(self.angle, frame, self.width, self.SEGMENT_LENGTH)
+        seg_w, seg_h = segment.get_size()
+
+        # 每段片段的中心沿光束排列，最后一段按剩余长度裁剪
+        count = int(self.length // self.SEGMENT_LENGTH)
+        half_step_x = step_x / 2
+        half_step_y = step_y / 2
+        blits = []
+        for i in range(count):
+            cx = self.origin_x + step_x * i + half_step_x
+            cy = self.origin_y + step_y * i + half_step_y
+            blits.append((segment, (cx - seg_w / 2, cy - seg_h / 2)))
+        screen.blits(blits, doreturn=False)
+
+        remainder = self.length - count * self.SEGMENT_LENGTH
+        end_x = self.origin_x + self.dir_x * self.length
+        end_y = self.origin_y + self.dir_y * self.length
+        if remainder > 1 and self.angle == 0:
+            # 竖直光束的最后一段直接裁剪预渲染片段
+            area = pygame.Rect(0, seg_h - int(remainder), seg_w, int(remainder))
+            screen.blit(segment, (self.origin_x - seg_w / 2, end_y), area)
+        elif remainder > 1:
+            cx = self.origin_x + step_x * count + half_step_x
+            cy = self.origin_y + step_y * count + half_step_y
+            screen.blit(segment, (cx - seg_w / 2, cy - seg_h / 2))
+
+        glow = _baked_glow(self.width, frame)
+        screen.blit(glow, (end_x - glow.get_width() / 2, end_y - glow.get_height() / 2))
+
+
+def _baked_segment(angle, frame, width, length):
+    """预渲染（并缓存）一段光束：外层光晕、中间光束和白色核心"""
+    key = (angle, frame, width, length)
+    cached = _segment_cache.get(key)
+    if cached is not None:
+        return cached
+    surface = pygame.Surface((width * 2, length), pygame.SRCALPHA)
+    center = width
+    outer = width if frame == 0 else width - 2
+    pygame.draw.rect(surface, (255, 60, 60, 70), (center - outer, 0, outer * 2, length))
+    pygame.draw.rect(surface, (255, 80, 80, 180), (center - width // 2, 0, width, length))
+    pygame.draw.rect(surface, (255, 240, 240, 255), (center - 2, 0, 4, length))
+    if angle:
+        surface = pygame.transform.rotate(surface, -angle)
+    rad = math.radians(angle)
+    cached = (surface, math.sin(rad) * length, -math.cos(rad) * length)
+    _segment_cache[key] = cached
+    return cached
+
+
+def _baked_glow(width, frame):
+    """预渲染（并缓存）光束末端的光斑"""
+    key = ('glow', width, frame)
+    cached = _segment_cache.get(key)
+    if cached is None:
+        radius = width + (2 if frame == 0 else 0)
+        cached = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(cached, (255, 120, 120, 120), (radius, radius), radius)
+        pygame.draw.circle(cached, (255, 255, 255, 230), (radius, radius), radius // 2)
+        _segment_cache[key] = cached
+    return cached
@@ -0,0 +1,71 @@
+import pygame
+
+# 碰撞遮罩缓存：每种精灵（以及石头的每个旋转角度档位）只生成一次
+_mask_cache = {}
+
+ROTATION_STEP = 10  # 石头遮罩的旋转角度档位（度）
+
+
+def mask_from_surface(key, surface):
+    """从带透明通道的表面生成遮罩并缓存"""
+    mask = _mask_cache.get(key)
+    if mask is None:
+        mask = pygame.mask.from_surface(surface)
+        _mask_cache[key] = mask
+    return mask
+
+
+def mask_from_drawing(key, width, height, draw):
+    """把形状画到透明表面上生成遮罩并缓存
+    Args:
+        key: 缓存键
+        width: 遮罩宽度
+        height: 遮罩高度
+        draw: 绘制函数 draw(surface)，按(0, 0)为左上角绘制形状
+    """
+    mask = _mask_cache.get(key)
+    if mask is None:
+        surface = pygame.Surface((max(1, int(width)), max(1, int(height))), pygame.SRCALPHA)
+        draw(surface)
+        mask = pygame.mask.from_surface(surface)
+        _mask_cache[key] = mask
+    return mask
+
+
+def rect_mask(width, height):
+    """实心矩形遮罩（用于本身就是矩形的对象）"""
+    key = ('rect', int(width), int(height))
+    mask = _mask_cache.get(key)
+    if mask is None:
+        mask = pygame.mask.Mask((max(1, int(width)), max(1, int(height))), fill=True)
+        _mask_cache[key] = mask
+    return mask
+
+
+def ellipse_mask(width, height):
+    """椭圆遮罩（巨型子弹）"""
+    return mask_from_drawing(('ellipse', int(width), int(height)), width, height,
+                             lambda surface: pygame.draw.ellipse(
+                                 surface, (255, 255, 255), (0, 0, int(width), int(height))))
+
+
+def rotation_step(rotation, period):
+    """把旋转角度量化到遮罩档位
+    Args:
+        rotation: 旋转角度（度）
+        period: 形状的旋转对称周期（度）
+    """
+    return int(rotation % period) // ROTATION_STEP * ROTATION_STEP
+
+
+def shape_mask(obj):
+    """对象的形状遮罩，矩形对象（没有get_mask方法或返回None）返回None
+    矩形对象之间通过AABB测试即为命中，不需要像素测试。
+    """
+    getter = getattr(obj, 'get_mask', None)
+    return getter() if getter is not None else None
+
+
+def clear_cache():
+    """清空遮罩缓存"""
+    _mask_cache.clear()
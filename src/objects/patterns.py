@@ -0,0 +1,138 @@
+import math
+
+# 弹幕子弹样式: 名称 -> (宽, 高, 颜色, 形状)
+BULLET_STYLES = {
+    'needle': (5, 10, (255, 100, 100), 'rect'),  # 与敌机子弹相同的细长子弹
+    'orb': (6, 6, (255, 0, 255), 'circle'),  # 与Boss散弹相同的紫色圆弹
+    'large_orb': (10, 10, (255, 150, 0), 'circle'),
+    'spark': (6, 6, (0, 220, 255), 'circle'),
+}
+STYLE_NAMES = tuple(BULLET_STYLES)
+
+# 弹幕图案定义。角度单位为度，0度为正下方，正角度偏向右侧；
+# x/y 为发射点相对于Boss底边左端的偏移；style 为 BULLET_STYLES 中的样式。
+#   fan     扇形: count发，在spread度范围内均匀分布，中心方向angle
+#   ring    环形: count发，起始角angle，均匀分布一圈
+#   spiral  螺旋: arms条旋臂，共steps步，每interval帧发射一步，每步旋转step_angle度
+#   line    并排直射: count列，列间距spacing，每列rows发，行间距row_spacing
+#   aimed   瞄准连射: 每次count发扇形（spread度），共bursts次，每interval帧一次，发射时对准玩家
+PATTERNS = {
+    'shoot': {'kind': 'line', 'x': 20, 'count': 3, 'spacing': 20, 'speed': 5, 'style': 'needle'},
+    'scatter_shot': {'kind': 'fan', 'x': 40, 'count': 7, 'spread': 120, 'speed': 6, 'style': 'orb'},
+    'triple_shot': {'kind': 'line', 'x': 0, 'count': 5, 'spacing': 20, 'rows': 3, 'row_spacing': 15,
+                    'speed': 5, 'style': 'needle'},
+    'ring': {'kind': 'ring', 'x': 40, 'y': -40, 'count': 16, 'speed': 4, 'style': 'orb'},
+    'aimed_burst': {'kind': 'aimed', 'x': 40, 'count': 3, 'spread': 20, 'bursts': 4, 'interval': 8,
+                    'speed': 7, 'style': 'spark'},
+    'dense_ring': {'kind': 'ring', 'x': 40, 'y': -40, 'count': 40, 'speed': 3.5, 'style': 'large_orb'},
+    'spiral': {'kind': 'spiral', 'x': 40, 'y': -40, 'arms': 4, 'steps': 20, 'interval': 2,
+               'step_angle': 11, 'speed': 4.5, 'style': 'orb'},
+    'double_spiral': {'kind': 'spiral', 'x': 40, 'y': -40, 'arms': 8, 'steps': 25, 'interval': 2,
+                      'step_angle': -7, 'speed': 3.5, 'style': 'spark'},
+    # 弹幕地狱模式：低速、高密度、持续时间长，一个图案就能让场上保持上万发子弹
+    # （新图案只能加在末尾，存档按下标保存图案名称）
+    'hell_spiral': {'kind': 'spiral', 'x': 40, 'y': -40, 'arms': 48, 'steps': 150, 'interval': 1,
+                    'step_angle': 2.4, 'speed': 1.4, 'style': 'orb'},
+    'hell_flower': {'kind': 'spiral', 'x': 40, 'y': -40, 'arms': 90, 'steps': 75, 'interval': 2,
+                    'step_angle': -1.6, 'speed': 1.2, 'style': 'spark'},
+    'hell_curtain': {'kind': 'fan', 'x': 40, 'count': 80, 'spread': 170, 'bursts': 75, 'interval': 2,
+                     'speed': 1.6, 'style': 'needle'},
+    'hell_aimed': {'kind': 'aimed', 'x': 40, 'count': 61, 'spread': 160, 'bursts': 75, 'interval': 2,
+                   'speed': 1.8, 'style': 'large_orb'},
+}
+
+# 各关卡Boss的行动（random.choice等概率选择）；PATTERNS中的名称为弹幕，其余为丢石头、召唤飞机
+BOSS_ACTIONS = {
+    1: ('shoot', 'scatter_shot', 'triple_shot', 'throw_rock', 'summon_plane'),
+    2: ('shoot', 'scatter_shot', 'triple_shot', 'throw_rock', 'summon_plane', 'ring', 'aimed_burst'),
+    3: ('scatter_shot', 'throw_rock', 'summon_plane', 'ring', 'aimed_burst', 'dense_ring', 'spiral',
+        'double_spiral'),
+}
+
+# 弹幕地狱模式Boss的行动和行动间隔（帧）：间隔与图案持续时间相同，图案一个接一个不间断
+BULLET_HELL_ACTIONS = ('hell_spiral', 'hell_flower', 'hell_curtain', 'hell_aimed')
+BULLET_HELL_ACTION_DELAY = 150
+
+
+def _direction(angle):
+    """角度（0度向下）对应的单位方向向量"""
+    rad = math.radians(angle + 90)
+    # 取整去掉浮点误差，正下方的子弹x方向速度严格为0
+    return round(math.cos(rad), 12), round(math.sin(rad), 12)
+
+
+class BulletPattern:
+    """编译后的弹幕图案 - 所有子弹的发射帧、发射点偏移和速度向量在编译时算好
+    发射时只需把对应帧的行加上Boss位置，不再对每发子弹做三角函数运算。
+    """
+    def __init__(self, name, spec):
+        """编译图案
+        Args:
+            name: 图案名称
+            spec: PATTERNS中的定义
+        Raises:
+            ValueError: 图案类型或样式不存在
+        """
+        self.name = name
+        self.style = spec['style']
+        if self.style not in BULLET_STYLES:
+            raise ValueError(f'弹幕 {name} 的子弹样式不存在: {self.style}')
+        self.aimed = spec['kind'] == 'aimed'
+        origin_x = spec.get('x', 0)
+        origin_y = spec.get('y', 0)
+        speed = spec['speed']
+        steps = {}  # 帧 -> [(dx, dy, vx, vy), ...]
+
+        def emit(tick, dx, dy, angle):
+            vx, vy = _direction(angle)
+            steps.setdefault(tick, []).append((origin_x + dx, origin_y + dy, vx * speed, vy * speed))
+
+        kind = spec['kind']
+        if kind in ('fan', 'aimed'):
+            count = spec['count']
+            spread = spec['spread']
+            center = spec.get('angle', 0)
+            angles = [center] if count == 1 else [center - spread / 2 + spread * i / (count - 1)
+                                                  for i in range(count)]
+            for burst in range(spec.get('bursts', 1)):
+                for angle in angles:
+                    emit(burst * spec.get('interval', 0), 0, 0, angle)
+        elif kind == 'ring':
+            count = spec['count']
+            for i in range(count):
+                emit(0, 0, 0, spec.get('angle', 0) + 360 * i / count)
+        elif kind == 'spiral':
+            arms = spec['arms']
+            for step in range(spec['steps']):
+                for arm in range(arms):
+                    emit(step * spec['interval'], 0, 0, step * spec['step_angle'] + 360 * arm / arms)
+        elif kind == 'line':
+            for column in range(spec['count']):
+                for row in range(spec.get('rows', 1)):
+                    emit(0, column * spec['spacing'], row * spec.get('row_spacing', 0), 0)
+        else:
+            raise ValueError(f'弹幕 {name} 的类型不存在: {kind}')
+
+        self.steps = {tick: tuple(rows) for tick, rows in steps.items()}
+        self.duration = max(self.steps) + 1  # 图案持续的帧数
+        self.bullet_count = sum(len(rows) for rows in self.steps.values())
+
+    def rows(self, tick, aim=None):
+        """图案第tick帧发射的子弹行
+        Args:
+            tick: 图案开始后的帧数
+            aim: 瞄准图案的目标方向单位向量 (x, y)，图案整体从正下方旋转到这个方向
+        Returns:
+            ((dx, dy, vx, vy), ...)，这一帧不发射时为空元组
+        """
+        rows = self.steps.get(tick, ())
+        if not rows or not self.aimed or aim is None:
+            return rows
+        # 把正下方(0, 1)旋转到aim方向：每发子弹只做乘加
+        ax, ay = aim
+        return tuple((dx, dy, vx * ay + vy * ax, vy * ay - vx * ax) for dx, dy, vx, vy in rows)
+
+
+# 所有图案在导入时编译一次
+COMPILED_PATTERNS = {name: BulletPattern(name, spec) for name, spec in PATTERNS.items()}
+PATTERN_NAMES = tuple(PATTERNS)
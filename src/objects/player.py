@@ -1,6 +1,9 @@
 import pygame
 import pygame
-from src.objects.bullet import Bullet, TripleBullet, ShotgunBullet, GiantBullet, ShotgunGiantBullet
+from src.objects.bullet import Bullet, TripleBullet, ShotgunBullet, GiantBullet, ShotgunGiantBullet, HomingMissile
+from src.objects.masks import mask_from_drawing, mask_from_surface
+from src.config import world
+from src.render import draw
 import os
 
 class Player:
@@ -20,10 +23,12 @@ class Player:
         self.player_type = player_type  # 记录飞机类型
         self.hp = 3  # 玩家生命值
         # 移除max_hp限制，生命值可以无限增长
-        self.weapon_type = 0  # 武器类型: 0-普通, 1-三连发, 2-散弹枪, 3-巨型子弹
+        self.weapon_type = 0  # 武器类型: 0-普通, 1-三连发, 2-散弹枪, 3-巨型子弹, 4-巨型散弹, 5-追踪导弹, 6-激光
         self.auto_shoot = True  # 自动射击开关
         self.shoot_cooldown = 0  # 射击冷却计时器
         self.shoot_delay = 15  # 射击间隔（帧数）
+        self.bombs = 2  # 炸弹数量（每通过一关奖励1颗）
+        self.fire_held = False  # 射击键是否按住（激光在手动模式下按住发射）
         
         # 无敌和闪烁系统
         self.invincible = False  # 是否无敌
@@ -90,22 +95,34 @@ class Player:
             elif event.key == pygame.K_5:
                 self.weapon_type = 4
                 print("切换为：巨型散弹")
+            elif event.key == pygame.K_6:
+                self.weapon_type = 5
+                print("切换为：追踪导弹")
+            elif event.key == pygame.K_7:
+                self.weapon_type = 6
+                print("切换为：激光")
             elif event.key == pygame.K_a:
                 # 切换自动/手动射击
                 self.auto_shoot = not self.auto_shoot
                 mode = "自动射击" if self.auto_shoot else "手动射击"
                 print(f"切换为：{mode}")
         
-    def update(self):
-        """更新玩家状态"""
-        keys = pygame.key.get_pressed()
+    def update(self, keys=None):
+        """更新玩家状态
+        Args:
+            keys: 按键状态（可按pygame键值索引），默认读取pygame.key.get_pressed()，
+                  无头模拟和自动操作机器人通过该参数注入输入
+        """
+        if keys is None:
+            keys = pygame.key.get_pressed()
+        self.fire_held = bool(keys[pygame.K_SPACE])
         if keys[pygame.K_LEFT] and self.x > 0:
             self.x -= self.speed
-        if keys[pygame.K_RIGHT] and self.x < 800 - self.width:
+        if keys[pygame.K_RIGHT] and self.x < world.width - self.width:
             self.x += self.speed
         if keys[pygame.K_UP] and self.y > 0:
             self.y -= self.speed
-        if keys[pygame.K_DOWN] and self.y < 600 - self.height:
+        if keys[pygame.K_DOWN] and self.y < world.height - self.height:
             self.y += self.speed
         
         # 更新射击冷却
@@ -138,25 +155,40 @@ class Player:
             screen.blit(self.image, (self.x, self.y))
         else:
             # 自定义绘制飞机形状
-            # 机身
-            pygame.draw.polygon(screen, self.color, [
-                (self.x + self.width // 2, self.y),  # 顶部
-                (self.x, self.y + self.height),      # 左下角
-                (self.x + self.width, self.y + self.height)  # 右下角
-            ])
-            # 机翼
-            pygame.draw.rect(screen, self.color, 
-                           (self.x + 5, self.y + self.height - 15, 
-                            self.width - 10, 10))
+            self._draw_shape(screen, self.x, self.y)
         
         # 显示当前武器类型
-        weapon_names = ['普通', '三连发', '散弹枪', '巨型', '巨型散弹']
+        weapon_names = ['普通', '三连发', '散弹枪', '巨型', '巨型散弹', '追踪导弹', '激光']
         font = pygame.font.Font(None, 20)
         weapon_text = font.render(f'Weapon: {weapon_names[self.weapon_type]}', True, (255, 255, 255))
         screen.blit(weapon_text, (self.x - 10, self.y + self.height + 5))
         
+    def _draw_shape(self, screen, x, y):
+        """以(x, y)为左上角绘制默认飞机形状"""
+        # 机身
+        draw.polygon(screen, self.color, [
+            (x + self.width // 2, y),  # 顶部
+            (x, y + self.height),      # 左下角
+            (x + self.width, y + self.height)  # 右下角
+        ])
+        # 机翼
+        draw.rect(screen, self.color, 
+                       (x + 5, y + self.height - 15, 
+                        self.width - 10, 10))
+    
+    def get_mask(self):
+        """碰撞遮罩 - 有图片时按图片透明通道生成，否则按默认飞机形状生成"""
+        if self.image:
+            return mask_from_surface(('player', self.player_type, self.width, self.height), self.image)
+        return mask_from_drawing(('player_shape', self.width, self.height), self.width, self.height,
+                                 lambda surface: self._draw_shape(surface, 0, 0))
+        
     def shoot(self):
         """射击 - 根据武器类型返回不同的子弹"""
+        if self.weapon_type == 6:
+            # 激光是持续光束，由GameScene每帧发射，不产生子弹
+            return []
+        
         # 检查冷却时间
         if self.shoot_cooldown > 0:
             return []
@@ -190,9 +222,19 @@ class Player:
         elif self.weapon_type == 4:
             angles = [-30, -15, 0, 15, 30]  # 度数
             return [ShotgunGiantBullet(center_x, shoot_y, angle) for angle in angles]
+        elif self.weapon_type == 5:
+            # 追踪导弹 - 从两翼向外斜射，随后转向最近的敌人
+            return [
+                HomingMissile(self.x, shoot_y + self.height // 2, -30),
+                HomingMissile(self.x + self.width - 6, shoot_y + self.height // 2, 30)
+            ]
         
         return [Bullet(center_x, shoot_y)]  # 默认返回普通子弹
     
+    def is_firing_laser(self):
+        """本帧是否发射激光（自动模式一直发射，手动模式按住空格发射）"""
+        return self.weapon_type == 6 and (self.auto_shoot or self.fire_held)
+    
     def can_auto_shoot(self):
         """检查是否可以自动射击"""
         return self.auto_shoot and self.shoot_cooldown == 0
@@ -215,6 +257,16 @@ class Player:
         """检查是否死亡"""
         return self.hp <= 0
     
+    def use_bomb(self):
+        """消耗一颗炸弹
+        Returns:
+            是否还有炸弹可用
+        """
+        if self.bombs <= 0:
+            return False
+        self.bombs -= 1
+        return True
+    
     def add_hp(self, amount=1):
         """增加生命值（无上限限制）"""
         self.hp += amount
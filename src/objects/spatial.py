@@ -0,0 +1,191 @@
+from src.objects.collision import swept_aabb
+
+
+class SpatialGrid:
+    """均匀网格空间索引 - 每帧重建一次，按对象中心所在的格子分组
+    最近邻查询从查询点所在格子向外逐圈搜索，找到足够近的对象后即停止，
+    只访问附近的格子，不需要线性扫描所有对象。
+    """
+    def __init__(self, cell_size=64):
+        """初始化网格
+        Args:
+            cell_size: 格子边长（像素），取敌人大小的1~2倍较合适
+        """
+        self.cell_size = cell_size
+        self.cells = {}  # (格子x, 格子y) -> 对象列表
+        self.count = 0
+        self.max_extent = 0  # 对象超出其中心格子的最大半宽/半高
+        self.cells_visited = 0  # 最近一次射线/范围查询检查的格子数
+        # 有对象的格子范围，用于限制搜索圈数
+        self.min_cx = self.min_cy = 0
+        self.max_cx = self.max_cy = -1
+
+    def rebuild(self, objects):
+        """用一组对象重建索引"""
+        cells = self.cells
+        cells.clear()
+        size = self.cell_size
+        min_cx = min_cy = None
+        max_cx = max_cy = None
+        count = 0
+        max_extent = 0
+        for obj in objects:
+            if obj.width > max_extent:
+                max_extent = obj.width
+            if obj.height > max_extent:
+                max_extent = obj.height
+            cx = int((obj.x + obj.width / 2) // size)
+            cy = int((obj.y + obj.height / 2) // size)
+            bucket = cells.get((cx, cy))
+            if bucket is None:
+                cells[(cx, cy)] = [obj]
+            else:
+                bucket.append(obj)
+            if min_cx is None:
+                min_cx = max_cx = cx
+                min_cy = max_cy = cy
+            else:
+                if cx < min_cx:
+                    min_cx = cx
+                elif cx > max_cx:
+                    max_cx = cx
+                if cy < min_cy:
+                    min_cy = cy
+                elif cy > max_cy:
+                    max_cy = cy
+            count += 1
+        self.count = count
+        self.max_extent = max_extent / 2
+        if count:
+            self.min_cx, self.min_cy, self.max_cx, self.max_cy = min_cx, min_cy, max_cx, max_cy
+        else:
+            self.min_cx = self.min_cy = 0
+            self.max_cx = self.max_cy = -1
+
+    def nearest(self, x, y, max_distance=None):
+        """查找离(x, y)最近的对象（按对象中心计算距离）
+        Args:
+            max_distance: 可选的最大搜索距离
+        Returns:
+            最近的对象，没有时返回None
+        """
+        if not self.count:
+            return None
+        size = self.cell_size
+        cx = int(x // size)
+        cy = int(y // size)
+        best = None
+        best_d2 = float('inf') if max_distance is None else max_distance * max_distance
+        max_ring = max(cx - self.min_cx, self.max_cx - cx, cy - self.min_cy, self.max_cy - cy, 0)
+        cells = self.cells
+
+        for ring in range(max_ring + 1):
+            # 第ring圈的格子与查询点的距离至少为(ring - 1)个格子
+            if ring > 1 and best_d2 <= ((ring - 1) * size) ** 2:
+                break
+            for key in _ring_cells(cx, cy, ring):
+                bucket = cells.get(key)
+                if bucket is None:
+                    continue
+                for obj in bucket:
+                    dx = obj.x + obj.width / 2 - x
+                    dy = obj.y + obj.height / 2 - y
+                    d2 = dx * dx + dy * dy
+                    if d2 < best_d2:
+                        best = obj
+                        best_d2 = d2
+        return best
+
+    def query_radius(self, x, y, radius):
+        """范围查询 - 返回包围盒与以(x, y)为圆心、radius为半径的圆相交的所有对象
+        只检查圆的包围盒（按对象超出中心格子的部分扩展）覆盖的格子。
+        """
+        if not self.count:
+            return []
+        size = self.cell_size
+        cells = self.cells
+        reach = radius + self.max_extent
+        cx0 = max(int((x - reach) // size), self.min_cx)
+        cx1 = min(int((x + reach) // size), self.max_cx)
+        cy0 = max(int((y - reach) // size), self.min_cy)
+        cy1 = min(int((y + reach) // size), self.max_cy)
+        r2 = radius * radius
+        found = []
+        visited = 0
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                visited += 1
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    continue
+                for obj in bucket:
+                    # 圆心到对象包围盒的最近点
+                    nx = min(max(x, obj.x), obj.x + obj.width)
+                    ny = min(max(y, obj.y), obj.y + obj.height)
+                    dx = nx - x
+                    dy = ny - y
+                    if dx * dx + dy * dy <= r2:
+                        found.append(obj)
+        self.cells_visited = visited
+        return found
+
+    def raycast(self, x, y, dir_x, dir_y, length, thickness=0):
+        """射线查询 - 从(x, y)沿单位方向(dir_x, dir_y)发出长度为length、宽为thickness的光束
+        按格子边长分段沿射线前进，只检查每段附近的格子（考虑对象超出中心格子的部分）。
+        Returns:
+            [(距离, 对象), ...]，按距离从近到远排序
+        """
+        if not self.count:
+            return []
+        size = self.cell_size
+        cells = self.cells
+        half = thickness / 2
+        margin = self.max_extent + half
+        visited = set()
+        hits = []
+        end_x = x + dir_x * length
+        end_y = y + dir_y * length
+        segments = int(length // size) + 1
+        for i in range(segments):
+            d0 = i * size
+            d1 = min(length, d0 + size)
+            x0 = x + dir_x * d0
+            y0 = y + dir_y * d0
+            x1 = x + dir_x * d1
+            y1 = y + dir_y * d1
+            cx0 = int((min(x0, x1) - margin) // size)
+            cx1 = int((max(x0, x1) + margin) // size)
+            cy0 = int((min(y0, y1) - margin) // size)
+            cy1 = int((max(y0, y1) + margin) // size)
+            for cy in range(cy0, cy1 + 1):
+                for cx in range(cx0, cx1 + 1):
+                    key = (cx, cy)
+                    if key in visited:
+                        continue
+                    visited.add(key)
+                    bucket = cells.get(key)
+                    if bucket is None:
+                        continue
+                    for obj in bucket:
+                        # 光束看作沿射线扫过的thickness见方的方块
+                        t = swept_aabb(x - half, y - half, end_x - half, end_y - half,
+                                       thickness, thickness,
+                                       obj.x, obj.y, obj.width, obj.height)
+                        if t is not None:
+                            hits.append((t * length, obj))
+        self.cells_visited = len(visited)
+        hits.sort(key=lambda hit: hit[0])
+        return hits
+
+
+def _ring_cells(cx, cy, ring):
+    """以(cx, cy)为中心第ring圈的格子坐标"""
+    if ring == 0:
+        yield (cx, cy)
+        return
+    for dx in range(-ring, ring + 1):
+        yield (cx + dx, cy - ring)
+        yield (cx + dx, cy + ring)
+    for dy in range(-ring + 1, ring):
+        yield (cx - ring, cy + dy)
+        yield (cx + ring, cy + dy)
@@ -0,0 +1,138 @@
+from collections import deque
+
+# 画面质量档位（从高到低）。只影响绘制量，不影响游戏逻辑：
+# 粒子仍然全部生成和更新（随机数的消耗不变），档位只决定绘制其中多少个。
+QUALITY_TIERS = [
+    {
+        'name': 'high',
+        'explosion_particles': 1.0,  # 爆炸绘制的粒子比例
+        'explosion_rings': 3,  # 爆炸扩散圆圈层数
+        'firework_particles': 1.0,  # 庆祝动画烟花绘制的粒子比例
+        'firework_glow': 2,  # Boss胜利动画烟花粒子的光晕层数
+        'bullet_glow_layers': 3,  # 巨型子弹光晕层数
+        'sparkles': 1.0,  # Boss胜利动画闪烁星星的绘制比例
+        'stars': 1.0,  # 星空/飘落粒子背景的绘制比例
+    },
+    {
+        'name': 'medium',
+        'explosion_particles': 0.6,
+        'explosion_rings': 2,
+        'firework_particles': 0.6,
+        'firework_glow': 1,
+        'bullet_glow_layers': 2,
+        'sparkles': 0.5,
+        'stars': 0.6,
+    },
+    {
+        'name': 'low',
+        'explosion_particles': 0.35,
+        'explosion_rings': 1,
+        'firework_particles': 0.35,
+        'firework_glow': 0,
+        'bullet_glow_layers': 1,
+        'sparkles': 0.25,
+        'stars': 0.35,
+    },
+    {
+        'name': 'minimal',
+        'explosion_particles': 0.15,
+        'explosion_rings': 1,
+        'firework_particles': 0.2,
+        'firework_glow': 0,
+        'bullet_glow_layers': 0,
+        'sparkles': 0.1,
+        'stars': 0.2,
+    },
+]
+
+
+class QualitySettings:
+    """当前画面质量设置 - 绘制代码直接读取属性"""
+    def __init__(self):
+        self.tier = 0
+        self.apply_tier(0)
+
+    def apply_tier(self, tier):
+        """切换到指定档位"""
+        self.tier = tier
+        for name, value in QUALITY_TIERS[tier].items():
+            setattr(self, name, value)
+
+
+# 全局质量设置（由QualityGovernor调整）
+quality = QualitySettings()
+
+
+def visible_count(total, ratio):
+    """按比例计算要绘制的数量（至少绘制1个）"""
+    if ratio >= 1 or total == 0:
+        return total
+    return max(1, int(total * ratio))
+
+
+class QualityGovernor:
+    """画面质量调节器 - 根据最近帧耗时的滑动平均自动降低或恢复画面质量
+    降档和升档使用不同的阈值，并且每次换档后至少保持一段时间，避免在两档之间来回切换。
+    """
+    def __init__(self, settings=None, frame_budget=1000 / 60, window=60,
+                 downgrade_ratio=0.9, upgrade_ratio=0.5, hold_frames=120):
+        """初始化质量调节器
+        Args:
+            settings: 要调节的QualitySettings，默认使用全局quality
+            frame_budget: 每帧时间预算（毫秒）
+            window: 滑动平均的帧数
+            downgrade_ratio: 平均耗时超过预算的该比例时降档
+            upgrade_ratio: 平均耗时低于预算的该比例时升档
+            hold_frames: 换档后至少保持的帧数
+        """
+        self.settings = settings or quality
+        self.frame_budget = frame_budget
+        self.window = window
+        self.downgrade_ratio = downgrade_ratio
+        self.upgrade_ratio = upgrade_ratio
+        self.hold_frames = hold_frames
+        self.frame_times = deque(maxlen=window)
+        self.hold = 0
+        self.changes = 0  # 换档次数
+
+    def tier_name(self):
+        """当前档位名称"""
+        return QUALITY_TIERS[self.settings.tier]['name']
+
+    def average_frame_time(self):
+        """滑动平均帧耗时（毫秒）"""
+        if not self.frame_times:
+            return 0.0
+        return sum(self.frame_times) / len(self.frame_times)
+
+    def update(self, frame_time):
+        """记录一帧的耗时并在需要时换档
+        Args:
+            frame_time: 本帧耗时（毫秒）
+        Returns:
+            本帧是否换档
+        """
+        self.frame_times.append(frame_time)
+        if self.hold > 0:
+            self.hold -= 1
+            return False
+        if len(self.frame_times) < self.window:
+            return False
+
+        average = self.average_frame_time()
+        tier = self.settings.tier
+        if average > self.frame_budget * self.downgrade_ratio and tier < len(QUALITY_TIERS) - 1:
+            self._change_tier(tier + 1, average)
+            return True
+        if average < self.frame_budget * self.upgrade_ratio and tier > 0:
+            self._change_tier(tier - 1, average)
+            return True
+        return False
+
+    def _change_tier(self, tier, average):
+        """换档并重新开始统计"""
+        self.settings.apply_tier(tier)
+        self.frame_times.clear()
+        self.hold = self.hold_frames
+        self.changes += 1
+        print(f"画面质量切换为: {self.tier_name()}（平均帧耗时 {average:.2f} ms）")
@@ -0,0 +1,75 @@
+import pygame
+
+# 绘制函数与pygame.draw的参数相同：目标是pygame.Surface时直接调用pygame.draw，
+# 否则交给目标对象自己的draw_*方法（例如TextureCanvas用SDL渲染器绘制）。
+# 对象的draw(screen)方法都通过这里绘制图形，因此两种渲染后端共用同一套绘制代码。
+
+# 预渲染的实心圆: (颜色, 半径) -> 表面
+_circle_cache = {}
+
+
+def circle(surface, color, center, radius, width=0):
+    """绘制圆"""
+    if isinstance(surface, pygame.Surface):
+        return pygame.draw.circle(surface, color, center, radius, width)
+    return surface.draw_circle(color, center, radius, width)
+
+
+def ellipse(surface, color, rect, width=0):
+    """绘制椭圆"""
+    if isinstance(surface, pygame.Surface):
+        return pygame.draw.ellipse(surface, color, rect, width)
+    return surface.draw_ellipse(color, rect, width)
+
+
+def rect(surface, color, rect, width=0):
+    """绘制矩形"""
+    if isinstance(surface, pygame.Surface):
+        return pygame.draw.rect(surface, color, rect, width)
+    return surface.draw_rect(color, rect, width)
+
+
+def polygon(surface, color, points, width=0):
+    """绘制多边形"""
+    if isinstance(surface, pygame.Surface):
+        return pygame.draw.polygon(surface, color, points, width)
+    return surface.draw_polygon(color, points, width)
+
+
+def line(surface, color, start, end, width=1):
+    """绘制线段"""
+    if isinstance(surface, pygame.Surface):
+        return pygame.draw.line(surface, color, start, end, width)
+    return surface.draw_line(color, start, end, width)
+
+
+def baked_circle(color, radius):
+    """预渲染的实心圆（带透明通道），按颜色和半径缓存"""
+    key = (tuple(color), radius)
+    cached = _circle_cache.get(key)
+    if cached is None:
+        cached = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(cached, color, (radius, radius), radius)
+        _circle_cache[key] = cached
+    return cached
+
+
+def translucent_circle(surface, color, center, radius, alpha):
+    """以alpha透明度绘制实心圆（光晕、爆炸圆圈等）
+    圆只预渲染一次，之后每次绘制只调整整体透明度，不再每帧创建透明表面。
+    Args:
+        surface: 绘制目标
+        color: RGB颜色
+        center: 圆心
+        radius: 半径
+        alpha: 透明度 0-255
+    """
+    if radius <= 0 or alpha <= 0:
+        return
+    sprite = baked_circle(color, radius)
+    dest = (center[0] - radius, center[1] - radius)
+    if isinstance(surface, pygame.Surface):
+        sprite.set_alpha(alpha)
+        surface.blit(sprite, dest)
+    else:
+        surface.blit_alpha(sprite, dest, alpha)
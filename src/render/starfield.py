@@ -0,0 +1,65 @@
+import random
+import pygame
+from src.quality import quality
+
+# 星空层（从远到近）: (星星数量, 最小半径, 最大半径, 最暗亮度, 最亮亮度, 每帧滚动像素)
+STAR_LAYERS = (
+    (140, 1, 1, 70, 130, 0.3),
+    (60, 1, 2, 140, 200, 0.8),
+    (24, 2, 3, 210, 255, 1.8),
+)
+
+
+class Starfield:
+    """视差滚动星空背景
+    每层星星只在初始化时绘制一次，画到两倍屏幕高度的纹理上（上下两半内容相同），
+    绘制时按滚动偏移截取其中一个屏幕高度的区域，每层每帧只需要一次blit，与星星数量无关。
+    最远的一层不透明，代替原来的黑色填充；其余层用黑色作为透明色叠加在上面。
+    """
+    def __init__(self, width, height, layers=STAR_LAYERS, seed=0):
+        """预渲染星空层
+        Args:
+            width: 画面宽度
+            height: 画面高度
+            layers: 各层参数，见STAR_LAYERS
+            seed: 星星位置的随机种子（使用独立的随机数生成器，不影响游戏逻辑的随机序列）
+        """
+        self.width = width
+        self.height = height
+        rng = random.Random(seed)
+        self.layers = []  # [纹理, 每帧滚动像素]
+        for index, (count, min_size, max_size, min_light, max_light, speed) in enumerate(layers):
+            tile = pygame.Surface((width, height * 2))
+            tile.fill((0, 0, 0))
+            for _ in range(count):
+                x = rng.randint(0, width)
+                y = rng.randint(0, height - 1)
+                size = rng.randint(min_size, max_size)
+                light = rng.randint(min_light, max_light)
+                # 偏蓝的白色，越远越暗
+                color = (light * 9 // 10, light * 9 // 10, light)
+                # 图案以屏幕高度为周期重复，跨越边界的星星在相邻周期各画一次
+                for offset in (-height, 0, height, height * 2):
+                    pygame.draw.circle(tile, color, (x, y + offset), size)
+            if pygame.display.get_surface() is not None:
+                tile = tile.convert()
+            if index > 0:
+                tile.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+            self.layers.append([tile, speed])
+        self.offsets = [0.0] * len(self.layers)  # 各层已向下滚动的距离（0到屏幕高度）
+
+    def update(self, speed=1.0):
+        """滚动一帧
+        Args:
+            speed: 滚动速度倍数
+        """
+        for i, (_, layer_speed) in enumerate(self.layers):
+            self.offsets[i] = (self.offsets[i] + layer_speed * speed) % self.height
+
+    def draw(self, screen):
+        """绘制星空（覆盖整个画面，调用前不需要填充背景）
+        画面质量较低时只绘制较远的几层。
+        """
+        count = max(1, round(len(self.layers) * quality.stars))
+        for (tile, _), offset in zip(self.layers[:count], self.offsets):
+            screen.blit(tile, (0, 0), (0, self.height - int(offset), self.width, self.height))
@@ -0,0 +1,223 @@
+import math
+import weakref
+from collections import OrderedDict
+import pygame
+from pygame._sdl2.video import Window, Renderer, Texture, get_drivers
+
+# SDL混合模式（pygame._sdl2没有导出常量）
+BLENDMODE_NONE = 0
+BLENDMODE_BLEND = 1
+
+
+def renderer_drivers():
+    """可用的SDL渲染驱动名称（例如 'opengl'、'software'）"""
+    return [info.name for info in get_drivers()]
+
+
+def create_renderer(title, size, driver=None, vsync=False):
+    """创建SDL渲染窗口和渲染器
+    调用前需要已经用pygame.display.set_mode()设置过显示模式（可以是隐藏的小窗口），
+    这样图片的convert_alpha()照常可用；渲染窗口是另外创建的SDL窗口，事件仍由pygame.event处理。
+    Args:
+        title: 窗口标题
+        size: 窗口大小 (宽, 高)
+        driver: SDL渲染驱动名称，默认由SDL选择；'software' 为软件渲染（无头Linux上也能运行）
+        vsync: 是否开启垂直同步
+    Returns:
+        (Window对象, Renderer对象)
+    Raises:
+        ValueError: 驱动不存在
+    """
+    index = -1
+    if driver is not None:
+        names = renderer_drivers()
+        if driver not in names:
+            raise ValueError(f'没有名为 {driver} 的SDL渲染驱动，可用: {", ".join(names)}')
+        index = names.index(driver)
+    window = Window(title, size)
+    accelerated = 0 if driver == 'software' else -1
+    return window, Renderer(window, index=index, accelerated=accelerated, vsync=vsync)
+
+
+class TextureCanvas:
+    """SDL渲染器绘制目标 - 提供对象draw(screen)方法用到的pygame.Surface接口
+    blit的表面第一次使用时上传为纹理并按表面对象缓存（预渲染的精灵、子弹、激光片段只上传一次，
+    每帧新建的文字表面用完即释放）；src.render.draw的图形预渲染为纹理后由渲染器绘制。
+    """
+    def __init__(self, window, renderer, size, sprite_cache_size=2048):
+        """初始化绘制目标
+        Args:
+            window: 渲染窗口（Window对象）
+            renderer: Renderer对象
+            size: 逻辑大小 (宽, 高)，渲染器负责缩放到窗口
+            sprite_cache_size: 图形纹理缓存的最大数量（多边形随旋转角度变化，需要限制）
+        """
+        self.window = window
+        self.renderer = renderer
+        self.size = tuple(size)
+        renderer.logical_size = self.size
+        self._textures = weakref.WeakKeyDictionary()  # 表面 -> 纹理
+        self._sprites = OrderedDict()  # 图形键 -> 纹理（按最近使用排序）
+        self.sprite_cache_size = sprite_cache_size
+        self.uploads = 0  # 累计上传的纹理数
+        self.draw_calls = 0  # 累计的绘制调用数
+
+    # ---- pygame.Surface 接口 ----
+    def get_size(self):
+        return self.size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def get_rect(self, **kwargs):
+        rect = pygame.Rect((0, 0), self.size)
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    def fill(self, color, rect=None):
+        """填充整个画面或矩形区域"""
+        if rect is None:
+            self.renderer.draw_color = pygame.Color(color)
+            self.renderer.clear()
+            return pygame.Rect((0, 0), self.size)
+        return self.draw_rect(color, rect)
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        """绘制表面（special_flags不支持，按普通透明混合绘制）"""
+        texture = self._texture(source)
+        if area is None:
+            width, height = source.get_size()
+        else:
+            area = pygame.Rect(area)
+            width, height = area.size
+        if isinstance(dest, pygame.Rect) or len(dest) == 4:
+            x, y = dest[0], dest[1]
+        else:
+            x, y = dest
+        dstrect = pygame.Rect(int(x), int(y), width, height)
+        texture.draw(srcrect=area, dstrect=dstrect)
+        self.draw_calls += 1
+        return dstrect
+
+    def blits(self, blit_sequence, doreturn=True):
+        """批量绘制表面"""
+        rects = [self.blit(*item) for item in blit_sequence]
+        return rects if doreturn else None
+
+    def blit_alpha(self, source, dest, alpha):
+        """以整体透明度alpha绘制表面（src.render.draw.translucent_circle使用）"""
+        texture = self._texture(source)
+        texture.alpha = alpha
+        texture.draw(dstrect=(int(dest[0]), int(dest[1])))
+        texture.alpha = 255
+        self.draw_calls += 1
+
+    # ---- src.render.draw 接口 ----
+    def draw_rect(self, color, rect, width=0):
+        """矩形直接由渲染器绘制"""
+        rect = pygame.Rect(rect)
+        renderer = self.renderer
+        color = pygame.Color(color)
+        renderer.draw_blend_mode = BLENDMODE_BLEND if color.a < 255 else BLENDMODE_NONE
+        renderer.draw_color = color
+        if width <= 0:
+            renderer.fill_rect(rect)
+        else:
+            # 边框宽度大于1时用4个实心矩形组成
+            renderer.fill_rect((rect.x, rect.y, rect.width, width))
+            renderer.fill_rect((rect.x, rect.bottom - width, rect.width, width))
+            renderer.fill_rect((rect.x, rect.y, width, rect.height))
+            renderer.fill_rect((rect.right - width, rect.y, width, rect.height))
+        self.draw_calls += 1
+        return rect
+
+    def draw_line(self, color, start, end, width=1):
+        """线段：宽度1由渲染器直接绘制，更宽的线段按多边形处理"""
+        if width <= 1:
+            self.renderer.draw_blend_mode = BLENDMODE_NONE
+            self.renderer.draw_color = pygame.Color(color)
+            self.renderer.draw_line(start, end)
+            self.draw_calls += 1
+            return
+        dx, dy = end[0] - start[0], end[1] - start[1]
+        length = math.hypot(dx, dy) or 1
+        nx, ny = -dy / length * width / 2, dx / length * width / 2
+        self.draw_polygon(color, [(start[0] + nx, start[1] + ny), (end[0] + nx, end[1] + ny),
+                                  (end[0] - nx, end[1] - ny), (start[0] - nx, start[1] - ny)])
+
+    def draw_circle(self, color, center, radius, width=0):
+        radius = int(radius)
+        if radius <= 0:
+            return
+        key = ('circle', tuple(color), radius, width)
+        self._draw_sprite(key, center[0] - radius, center[1] - radius, radius * 2, radius * 2,
+                          lambda surface: pygame.draw.circle(surface, color, (radius, radius), radius, width))
+
+    def draw_ellipse(self, color, rect, width=0):
+        rect = pygame.Rect(rect)
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        key = ('ellipse', tuple(color), rect.width, rect.height, width)
+        self._draw_sprite(key, rect.x, rect.y, rect.width, rect.height,
+                          lambda surface: pygame.draw.ellipse(surface, color, surface.get_rect(), width))
+
+    def draw_polygon(self, color, points, width=0):
+        """多边形按相对于包围盒左上角的整数顶点坐标预渲染"""
+        left = math.floor(min(p[0] for p in points))
+        top = math.floor(min(p[1] for p in points))
+        local = tuple((round(p[0] - left), round(p[1] - top)) for p in points)
+        size_w = max(p[0] for p in local) + 1
+        size_h = max(p[1] for p in local) + 1
+        key = ('polygon', tuple(color), width, local)
+        self._draw_sprite(key, left, top, size_w, size_h,
+                          lambda surface: pygame.draw.polygon(surface, color, local, width))
+
+    # ---- 显示 ----
+    def present(self):
+        """显示本帧"""
+        self.renderer.present()
+
+    def to_surface(self):
+        """读回当前画面（录像、共享内存导出等需要像素数据时使用，速度较慢）"""
+        # 设置了logical_size时to_surface()的默认表面按逻辑大小分配、却按窗口大小读取，会越界，
+        # 因此按窗口大小读回后再缩放到逻辑大小
+        window_size = self.window.size
+        surface = self.renderer.to_surface(pygame.Surface(window_size, 0, 32),
+                                           pygame.Rect((0, 0), window_size))
+        if window_size != self.size:
+            surface = pygame.transform.scale(surface, self.size)
+        return surface
+
+    # ---- 纹理缓存 ----
+    def _texture(self, surface):
+        """表面对应的纹理，第一次使用时上传"""
+        texture = self._textures.get(surface)
+        if texture is None:
+            texture = Texture.from_surface(self.renderer, surface)
+            # 不透明的表面（例如星空最远层）不需要混合，软件渲染时快得多
+            transparent = surface.get_flags() & pygame.SRCALPHA or surface.get_colorkey() is not None
+            texture.blend_mode = BLENDMODE_BLEND if transparent else BLENDMODE_NONE
+            self._textures[surface] = texture
+            self.uploads += 1
+        return texture
+
+    def _draw_sprite(self, key, x, y, width, height, paint):
+        """绘制预渲染的图形纹理，第一次使用时在透明表面上绘制并上传"""
+        texture = self._sprites.get(key)
+        if texture is None:
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            paint(surface)
+            texture = Texture.from_surface(self.renderer, surface)
+            texture.blend_mode = BLENDMODE_BLEND
+            self._sprites[key] = texture
+            self.uploads += 1
+            if len(self._sprites) > self.sprite_cache_size:
+                self._sprites.popitem(last=False)
+        else:
+            self._sprites.move_to_end(key)
+        texture.draw(dstrect=(int(x), int(y), width, height))
+        self.draw_calls += 1
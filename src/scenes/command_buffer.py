@@ -0,0 +1,68 @@
+class CommandBuffer:
+    """延迟命令缓冲区 - 在一帧更新期间收集生成、移除和效果请求，在固定时间点一次性执行
+    更新循环因此可以直接遍历实体列表，不需要防御性的[:]复制。
+    """
+    def __init__(self):
+        self._spawns = {}  # id(目标列表) -> (目标列表, 新对象列表)
+        self._despawns = {}  # id(目标列表) -> (目标列表, 待移除对象集合)
+        self.score = 0  # 待增加的分数
+        self.kills = 0  # 待增加的击杀数
+        self.pending = 0  # 本帧已排队的命令数
+        self.last_applied = 0  # 上一次执行的命令数
+
+    def spawn(self, target, obj):
+        """排队向target列表加入一个对象"""
+        entry = self._spawns.get(id(target))
+        if entry is None:
+            entry = self._spawns[id(target)] = (target, [])
+        entry[1].append(obj)
+        self.pending += 1
+
+    def spawn_many(self, target, objs):
+        """排队向target列表加入多个对象"""
+        entry = self._spawns.get(id(target))
+        if entry is None:
+            entry = self._spawns[id(target)] = (target, [])
+        entry[1].extend(objs)
+        self.pending += len(objs)
+
+    def despawn(self, target, obj):
+        """排队从target列表移除一个对象（重复移除同一对象无副作用）"""
+        entry = self._despawns.get(id(target))
+        if entry is None:
+            entry = self._despawns[id(target)] = (target, set())
+        entry[1].add(obj)
+        self.pending += 1
+
+    def add_score(self, points, kills=0):
+        """排队增加分数和击杀数"""
+        self.score += points
+        self.kills += kills
+        self.pending += 1
+
+    def __len__(self):
+        return self.pending
+
+    def apply(self, scene):
+        """一次性执行所有排队的命令
+        先移除再加入：每个列表只重建一次，新对象用一次extend加入（只扩容一次）。
+        Args:
+            scene: GameScene对象（用于分数和击杀数）
+        Returns:
+            执行的命令数
+        """
+        for target, removed in self._despawns.values():
+            target[:] = [obj for obj in target if obj not in removed]
+        for target, added in self._spawns.values():
+            target.extend(added)
+        scene.score += self.score
+        scene.enemies_killed += self.kills
+
+        applied = self.pending
+        self._spawns.clear()
+        self._despawns.clear()
+        self.score = 0
+        self.kills = 0
+        self.pending = 0
+        self.last_applied = applied
+        return applied
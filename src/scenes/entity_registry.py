@@ -0,0 +1,56 @@
+import itertools
+
+
+class EntityRegistry:
+    """敌人注册表 - 每种敌人原型（石头、敌机、普通敌人、Boss）各用一个列表保存
+    敌人的archetype类属性决定它进入哪个列表，场景按列表分别运行各自的更新逻辑，
+    不需要逐个isinstance判断。跨类型查询（例如所有可碰撞的敌人）直接串联各列表，不复制。
+    """
+    ARCHETYPES = ('rock', 'plane', 'basic', 'boss')
+
+    def __init__(self):
+        self.rocks = []
+        self.planes = []
+        self.basics = []
+        self.bosses = []
+        self.buckets = {
+            'rock': self.rocks,
+            'plane': self.planes,
+            'basic': self.basics,
+            'boss': self.bosses,
+        }
+
+    def append(self, enemy):
+        """加入一个敌人"""
+        self.buckets[enemy.archetype].append(enemy)
+
+    def extend(self, enemies):
+        """加入多个敌人"""
+        for enemy in enemies:
+            self.buckets[enemy.archetype].append(enemy)
+
+    def remove(self, enemy):
+        """移除一个敌人"""
+        self.buckets[enemy.archetype].remove(enemy)
+
+    def clear(self):
+        """清空所有敌人"""
+        for bucket in self.buckets.values():
+            bucket.clear()
+
+    def __contains__(self, enemy):
+        return enemy in self.buckets[enemy.archetype]
+
+    def __iter__(self):
+        """遍历所有敌人（不复制列表，遍历期间不能增删）"""
+        return itertools.chain(self.rocks, self.planes, self.basics, self.bosses)
+
+    def collidable(self):
+        """所有可与子弹和玩家碰撞的敌人（目前所有原型都可碰撞）"""
+        return iter(self)
+
+    def __len__(self):
+        return len(self.rocks) + len(self.planes) + len(self.basics) + len(self.bosses)
+
+    def __bool__(self):
+        return len(self) > 0
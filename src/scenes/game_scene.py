@@ -3,7 +3,19 @@ import random
 from src.objects.player import Player
 from src.objects.enemy import Enemy, Rock, EnemyPlane, Boss
 from src.objects.bullet import EnemyBullet
-from src.objects.explosion import Explosion
+from src.objects.explosion import Explosion, BombWave
+from src.scenes.entity_registry import EntityRegistry
+from src.scenes.command_buffer import CommandBuffer
+from src.scenes.savegame import write_save, read_save, SaveError
+from src.scenes.rewind import RewindBuffer
+from src.scenes.level_data import load_level, SpawnTimeline, SPAWN_Y
+from src.objects.collision import swept_pixel_hit, pixel_overlap
+from src.objects.spatial import SpatialGrid
+from src.objects.laser import Laser
+from src.objects.patterns import BULLET_HELL_ACTIONS, BULLET_HELL_ACTION_DELAY
+from src.scenes.world_bounds import outside_world, cull_outside_world
+from src.debug.entity_budget import EntityBudget
+from src.config import CULL_MARGINS, ENTITY_BUDGETS, world
 from src.objects.animation import (
     LevelIntroAnimation, 
     LevelCompleteAnimation, 
@@ -12,6 +24,10 @@ from src.objects.animation import (
     GameOverAnimation
 )
 
+# 关卡数据中的敌人类型 -> 敌人类
+ENEMY_CLASSES = {'rock': Rock, 'plane': EnemyPlane, 'basic': Enemy}
+
+
 class GameScene:
     def __init__(self, game, player_type=1):
         """初始化游戏场景
@@ -21,30 +37,60 @@ class GameScene:
         """
         self.game = game
         self.player = Player(game.screen_width // 2, game.screen_height - 50, player_type)
-        self.enemies = []
+        self.enemies = EntityRegistry()  # 按原型分组的敌人
         self.bullets = []
         self.enemy_bullets = []  # 敌人子弹列表
         self.explosions = []  # 爆炸效果列表
+        self.commands = CommandBuffer()  # 本帧延迟执行的生成/移除命令
+        self.enemy_grid = SpatialGrid()  # 存活敌人的空间索引，每帧重建一次
+        self.enemy_bullet_grid = SpatialGrid(cell_size=32)  # 敌人子弹的空间索引，引爆炸弹时重建
+        self.laser = Laser()
+        self.entity_budget = EntityBudget(ENTITY_BUDGETS)  # 实体泄漏监控
+        self.bomb_radius = 260  # 炸弹作用半径（以玩家为中心）
+        self.bomb_boss_damage = 30  # 炸弹对Boss造成的伤害（Boss不会被直接清除）
+        self.bomb_requested = False  # 本帧是否引爆炸弹（按键时记录，在update中执行）
+        self.rewind_buffer = RewindBuffer(getattr(game, 'rewind_frames', 600))  # 最近约10秒的状态，按住退格键倒带
+        self.rewinding = False  # 本帧是否在倒带
         self.score = 0
-        self.spawn_timer = 0
-        self.spawn_interval = 60  # 生成敌人的间隔
+        
+        # 弹幕地狱模式：直接进入Boss战，敌人的图案子弹放在numpy数组中（BulletField）整列更新和绘制；
+        # 普通模式的敌人子弹仍使用enemy_bullets列表
+        self.mode = getattr(game, 'mode', 'normal')
+        self.bullet_field = None
+        self.hell_boss_hp = 3000  # 弹幕地狱模式Boss的血量（乘以关卡）
+        if self.mode == 'bullet_hell':
+            from src.objects.bullet_field import BulletField
+            self.bullet_field = BulletField()
         
         # 关卡系统
         self.current_level = 1  # 当前关卡 (1-3)
         self.enemies_killed = 0  # 当前关卡击杀的敌人数
         self.boss_spawned = False  # 当前关卡Boss是否已出现
         self.boss_defeated = False  # Boss是否被击败
+        self.level_data = None  # 当前关卡的数据（assets/levels/levelN.json）
+        self.boss_kills = 0  # 召唤Boss需要的击杀数
+        self.spawn_timeline = None  # 当前关卡的敌人生成时间线
         
         # 动画系统
         self.current_animation = None  # 当前播放的动画
         self.game_state = 'level_intro'  # 游戏状态: level_intro, playing, level_complete, boss_victory, game_complete, game_over
         self.game_paused = False  # 游戏是否暂停
         
-        # 开始第一关的关卡介绍动画
+        # 开始第一关
+        self._start_level()
+    
+    def _start_level(self):
+        """开始当前关卡：加载关卡数据、编排生成时间线、生成初始敌人并播放关卡介绍动画
+        Raises:
+            LevelDataError: 关卡数据文件不存在或格式错误
+        """
+        self.level_data = load_level(self.current_level)
+        # 弹幕地狱模式不需要击杀数，Boss在关卡开始后立即出现
+        self.boss_kills = 0 if self.bullet_field is not None else self.level_data.boss_kills
+        # 时间线的随机种子取自游戏的随机数序列，同一种子的游戏得到同样的敌人编排
+        self.spawn_timeline = SpawnTimeline(self.level_data, random.getrandbits(32), world.width)
+        self.enemies.extend(self._create_enemies(self.spawn_timeline.initial_batch()))
         self._start_level_intro()
-        
-        # 初始生成一些敌人
-        self._spawn_initial_enemies()
     
     def _start_level_intro(self):
         """开始关卡介绍动画"""
@@ -52,7 +98,8 @@ class GameScene:
             self.game.screen_width, 
             self.game.screen_height, 
             self.current_level,
-            self.score
+            self.score,
+            self.level_data.hint
         )
         self.game_state = 'level_intro'
         self.game_paused = True
@@ -68,6 +115,8 @@ class GameScene:
         )
         self.game_state = 'level_complete'
         self.game_paused = True
+        # 倒带不能跨过关卡边界（读档会回到上一关的Boss战）
+        self.rewind_buffer.clear()
     
     def _start_boss_victory(self):
         """开始Boss胜利动画"""
@@ -100,42 +149,47 @@ class GameScene:
         self.game_state = 'game_over'
         self.game_paused = True
             
-    def _spawn_initial_enemies(self):
-        """初始生成敌人"""
-        for i in range(3):
-            enemy_type = random.choice(['rock', 'plane'])
-            x = random.randint(50, 750)
-            
-            if enemy_type == 'rock':
-                self.enemies.append(Rock(x, -50, self.current_level))
-            elif enemy_type == 'plane':
-                self.enemies.append(EnemyPlane(x, -50, self.current_level))
+    def _create_enemies(self, batch):
+        """按时间线的批次创建敌人
+        Args:
+            batch: [(敌人类型, x坐标), ...]
+        """
+        level = self.current_level
+        return [ENEMY_CLASSES[enemy_type](x, SPAWN_Y, level) for enemy_type, x in batch]
     
-    def _spawn_enemy(self):
-        """随机生成敌人"""
-        x = random.randint(50, 750)
-        
-        # 检查是否应该生成Boss（击杀10个小怪且Boss未出现）
-        if self.enemies_killed >= 10 and not self.boss_spawned:
-            boss = Boss(x, -80, self.current_level)
+    def _spawn_enemies(self):
+        """生成敌人：击杀数达到关卡数据的boss_kills时召唤Boss，之前按时间线成批生成普通敌人"""
+        if self.boss_spawned:
+            return
+        if self.enemies_killed >= self.boss_kills:
+            boss = Boss(random.randint(50, world.width - 50), -80, self.current_level)
+            if self.bullet_field is not None:
+                self._configure_hell_boss(boss)
             self.enemies.append(boss)
             self.boss_spawned = True
             print(f"第{self.current_level}关Boss出现！")
-        elif not self.boss_spawned:  # Boss未出现时才生成普通敌人
-            enemy_type = random.choices(
-                ['rock', 'plane', 'normal'],
-                weights=[40, 35, 25]  # 权重
-            )[0]
-            
-            if enemy_type == 'rock':
-                self.enemies.append(Rock(x, -50, self.current_level))
-            elif enemy_type == 'plane':
-                self.enemies.append(EnemyPlane(x, -50, self.current_level))
-            else:
-                self.enemies.append(Enemy(x, -50, self.current_level))
+            return
+        batch = self.spawn_timeline.advance()
+        if batch is not None:
+            self.enemies.extend(self._create_enemies(batch))
+    
+    def _configure_hell_boss(self, boss):
+        """弹幕地狱模式的Boss：只使用高密度弹幕，图案一个接一个不间断，出现后立即开始"""
+        boss.actions = BULLET_HELL_ACTIONS
+        boss.action_delay = BULLET_HELL_ACTION_DELAY
+        boss.action_cooldown = boss.action_delay
+        boss.hp = boss.max_hp = self.hell_boss_hp * self.current_level
             
     def handle_event(self, event):
         """处理事件"""
+        # F5快速存档，F9快速读档（读档在游戏结束画面也可用）
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+            self.quick_save()
+            return
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F9:
+            self.quick_load()
+            return
+        
         # 处理游戏结束状态的续命 - 只需要按R键，不需要CTRL
         if self.game_state == 'game_over' and event.type == pygame.KEYDOWN:
             if event.key == pygame.K_r:
@@ -147,10 +201,8 @@ class GameScene:
                 print("续命成功！生命值恢复到3")
                 return
             elif event.key == pygame.K_ESCAPE:
-                # 退出游戏
-                import sys
-                pygame.quit()
-                sys.exit()
+                # 退出游戏：多线程模式下这里运行在仿真线程中，只发出退出事件，由主循环在主线程结束游戏
+                pygame.event.post(pygame.event.Event(pygame.QUIT))
                 return
         
         # 手动射击（仅在非自动模式下有效）
@@ -158,11 +210,25 @@ class GameScene:
             if event.key == pygame.K_SPACE and not self.player.auto_shoot:
                 bullets = self.player.shoot()  # 现在返回子弹列表
                 self.bullets.extend(bullets)  # 添加所有子弹
+            elif (event.key == pygame.K_b and self.game_state == 'playing' and
+                  not self.game_paused and not self.bomb_requested and self.player.use_bomb()):
+                self.bomb_requested = True
                 
         self.player.handle_event(event)
         
-    def update(self):
-        """更新游戏状态"""
+    def update(self, keys=None):
+        """更新游戏状态
+        Args:
+            keys: 玩家按键状态，默认为None时读取键盘（见Player.update）
+        """
+        # 按住退格键倒带：每帧恢复上一帧保存的状态，不更新游戏逻辑
+        # 只在关卡进行中和游戏结束画面倒带，关卡介绍、过关等动画期间不恢复状态
+        pressed = keys if keys is not None else pygame.key.get_pressed()
+        self.rewinding = (bool(pressed[pygame.K_BACKSPACE]) and self.game_state in ('playing', 'game_over')
+                          and self.rewind_buffer.rewind(self))
+        if self.rewinding:
+            return
+        
         # 更新动画
         if self.current_animation:
             self.current_animation.update()
@@ -180,90 +246,263 @@ class GameScene:
             self._start_game_over()
             return
         
-        self.player.update()
+        self.player.update(keys)
         
         # 自动射击
         if self.player.can_auto_shoot():
             bullets = self.player.shoot()
             self.bullets.extend(bullets)
         
-        # 更新生成敌人计时器
-        self.spawn_timer += 1
-        if self.spawn_timer >= self.spawn_interval:
-            self._spawn_enemy()
-            self.spawn_timer = 0
+        # 生成敌人（时间线每帧只比较一次下一批的帧号）
+        self._spawn_enemies()
+        
+        # 重建存活敌人的空间索引（追踪导弹等本帧的查询共用）
+        self.enemy_grid.rebuild(enemy for enemy in self.enemies if not enemy.is_dead())
         
         # 更新玩家子弹
-        for bullet in self.bullets[:]:
+        for bullet in self.bullets:
+            if bullet.homing and bullet.needs_target():
+                bullet.target = self.enemy_grid.nearest(bullet.x + bullet.width / 2,
+                                                        bullet.y + bullet.height / 2)
+            bullet.prev_x = bullet.x
+            bullet.prev_y = bullet.y
             bullet.update()
-            # 移除超出屏幕的子弹（包括左右边界）
-            if bullet.y < -50 or bullet.x < -50 or bullet.x > 850:
-                if bullet in self.bullets:
-                    self.bullets.remove(bullet)
+        
+        # 激光（对空间索引做射线查询）
+        if self.player.is_firing_laser():
+            self._update_laser()
+        else:
+            self.laser.stop()
         
         # 更新敌人子弹
-        for bullet in self.enemy_bullets[:]:
+        for bullet in self.enemy_bullets:
+            bullet.prev_x = bullet.x
+            bullet.prev_y = bullet.y
             bullet.update()
-            # 移除超出屏幕的子弹
-            if bullet.y > 600:
-                self.enemy_bullets.remove(bullet)
+        if self.bullet_field is not None:
+            self.bullet_field.update()
         
         # 更新爆炸效果
-        for explosion in self.explosions[:]:
+        for explosion in self.explosions:
             explosion.update()
             if explosion.is_finished():
-                self.explosions.remove(explosion)
+                self.commands.despawn(self.explosions, explosion)
+                
+        # 更新敌人（每种原型各自的更新逻辑）
+        self._update_rocks()
+        self._update_planes()
+        self._update_basics()
+        self._update_bosses()
+        
+        # 统一剔除超出世界范围的对象
+        self._cull_outside_world()
+        
+        # 炸弹
+        if self.bomb_requested:
+            self.bomb_requested = False
+            self._detonate_bomb()
                 
-        # 更新敌人
-        for enemy in self.enemies[:]:
+        # 检查碰撞
+        self.check_collisions()
+        
+        # 统一执行本帧排队的命令
+        applied = self.commands.apply(self)
+        profiler = getattr(self.game, 'profiler', None)
+        if profiler is not None:
+            profiler.count('commands', applied)
+        
+        # 实体泄漏监控
+        self._check_entity_budget()
+        
+        # 保存本帧状态供倒带使用
+        if self.rewind_buffer.capture(self) and profiler is not None:
+            profiler.set('rewind_ms', self.rewind_buffer.capture_time)
+            profiler.set('rewind_kb', self.rewind_buffer.bytes / 1024)
+    
+    def _update_rocks(self):
+        """更新石头 - 只会下落"""
+        rocks = self.enemies.rocks
+        for rock in rocks:
+            rock.update()
+            self._remove_finished_enemy(rock, rocks)
+    
+    def _update_planes(self):
+        """更新敌机 - 移动并射击"""
+        planes = self.enemies.planes
+        for plane in planes:
+            plane.update()
+            if plane.can_shoot():
+                self.commands.spawn(self.enemy_bullets, plane.shoot())
+            self._remove_finished_enemy(plane, planes)
+    
+    def _update_basics(self):
+        """更新普通敌人 - 左右移动"""
+        basics = self.enemies.basics
+        for enemy in basics:
             enemy.update()
+            self._remove_finished_enemy(enemy, basics)
+    
+    def _update_bosses(self):
+        """更新Boss - 移动、执行行动并发射弹幕图案"""
+        bosses = self.enemies.bosses
+        player_center = (self.player.x + self.player.width / 2, self.player.y + self.player.height / 2)
+        for boss in bosses:
+            boss.update()
             
-            # 敌机射击
-            if isinstance(enemy, EnemyPlane) and enemy.can_shoot():
-                self.enemy_bullets.append(enemy.shoot())
-            
-            # Boss行动
-            if isinstance(enemy, Boss) and enemy.can_act():
-                action_type, action_data = enemy.perform_action()
+            # Boss行动（弹幕行动只开始图案）
+            if boss.can_act():
+                action_type, action_data = boss.perform_action()
                 if action_type == 'bullets':
-                    if isinstance(action_data, list):
-                        self.enemy_bullets.extend(action_data)
+                    self.commands.spawn_many(self.enemy_bullets, action_data)
                 elif action_type == 'rocks':
-                    if isinstance(action_data, list):
-                        self.enemies.extend(action_data)
+                    self.commands.spawn_many(self.enemies.rocks, action_data)
                 elif action_type == 'plane':
-                    if action_data is not None:
-                        self.enemies.append(action_data)
+                    self.commands.spawn(self.enemies.planes, action_data)
             
-            # 移除死亡的敌人
-            if enemy.is_dead():
-                # 创建爆炸效果
-                explosion_size = enemy.width if hasattr(enemy, 'width') else 30
-                explosion = Explosion(enemy.x + explosion_size // 2, enemy.y + explosion_size // 2, explosion_size)
-                self.explosions.append(explosion)
-                
-                self.enemies.remove(enemy)
-                
-                # 如果是Boss
-                if isinstance(enemy, Boss):
-                    self.score += 500
-                    self.boss_defeated = True
-                    print(f"第{self.current_level}关Boss被击败！")
-                    
-                    # 播放Boss胜利动画
-                    self._start_boss_victory()
-                else:
-                    # 普通敌人
-                    self.score += 10
-                    self.enemies_killed += 1
+            # 弹幕图案本帧的子弹整批加入（弹幕地狱模式直接写入子弹数组）
+            if self.bullet_field is not None:
+                step = boss.advance_pattern(player_center)
+                if step is not None:
+                    self.bullet_field.spawn_volley(boss.x, boss.y + boss.height, *step)
+            else:
+                bullets = boss.emit_pattern(player_center)
+                if bullets:
+                    self.commands.spawn_many(self.enemy_bullets, bullets)
             
-            # 移除超出屏幕的敌人
-            if enemy.y > 600:
-                if enemy in self.enemies:
-                    self.enemies.remove(enemy)
+            if boss.is_dead():
+                self._add_explosion(boss)
+                self.commands.despawn(bosses, boss)
+                self.commands.add_score(500)
+                self.boss_defeated = True
+                print(f"第{self.current_level}关Boss被击败！")
                 
-        # 检查碰撞
-        self.check_collisions()
+                # 播放Boss胜利动画
+                self._start_boss_victory()
+    
+    def _cull_outside_world(self):
+        """世界边界剔除 - 所有实体类别使用同一套边界和边距配置（CULL_MARGINS）"""
+        culled = cull_outside_world(self.bullets, self.commands, CULL_MARGINS['bullets'])
+        culled += cull_outside_world(self.enemy_bullets, self.commands, CULL_MARGINS['enemy_bullets'])
+        for bucket in self.enemies.buckets.values():
+            culled += cull_outside_world(bucket, self.commands, CULL_MARGINS['enemies'])
+        if self.bullet_field is not None:
+            culled += self.bullet_field.cull(CULL_MARGINS['enemy_bullets'])
+        profiler = getattr(self.game, 'profiler', None)
+        if profiler is not None:
+            profiler.count('culled', culled)
+    
+    def _check_entity_budget(self):
+        """检查各实体列表是否超过预期的高水位"""
+        counts = {
+            'bullets': len(self.bullets),
+            'enemy_bullets': len(self.enemy_bullets),
+            'explosions': len(self.explosions),
+        }
+        for archetype, bucket in self.enemies.buckets.items():
+            counts[archetype] = len(bucket)
+        if self.bullet_field is not None:
+            counts['field_bullets'] = len(self.bullet_field)
+        self.entity_budget.check(counts)
+    
+    def _remove_finished_enemy(self, enemy, bucket):
+        """移除死亡的普通敌人（石头、敌机、普通敌人），超出世界范围的由_cull_outside_world移除"""
+        if enemy.is_dead():
+            self._add_explosion(enemy)
+            self.commands.despawn(bucket, enemy)
+            self.commands.add_score(10, kills=1)
+    
+    def quick_save(self):
+        """快速存档"""
+        try:
+            size = write_save(self)
+            print(f"存档成功（{size}字节）")
+        except (SaveError, OSError) as e:
+            print(f"存档失败: {e}")
+    
+    def quick_load(self):
+        """快速读档"""
+        try:
+            read_save(self)
+            self.rewind_buffer.clear()
+            print(f"读档成功！关卡: {self.current_level}, 得分: {self.score}")
+        except (SaveError, OSError) as e:
+            print(f"读档失败: {e}")
+    
+    def _detonate_bomb(self):
+        """引爆炸弹 - 用空间索引做范围查询，清除半径内的敌人和敌人子弹
+        普通敌人通过批量击杀一次性结算，Boss只受到大量伤害。
+        """
+        x = self.player.x + self.player.width / 2
+        y = self.player.y + self.player.height / 2
+        radius = self.bomb_radius
+        
+        # 敌人已在本帧移动过，重建索引；已死亡或超出世界范围的敌人在本帧已结算
+        margin = CULL_MARGINS['enemies']
+        self.enemy_grid.rebuild(enemy for enemy in self.enemies
+                                if not enemy.is_dead() and not outside_world(enemy, margin))
+        victims = []
+        for enemy in self.enemy_grid.query_radius(x, y, radius):
+            if enemy.archetype == 'boss':
+                enemy.take_damage(self.bomb_boss_damage)
+            else:
+                victims.append(enemy)
+        self._kill_batch(victims)
+        
+        self.enemy_bullet_grid.rebuild(self.enemy_bullets)
+        cleared = self.enemy_bullet_grid.query_radius(x, y, radius)
+        for bullet in cleared:
+            self.commands.despawn(self.enemy_bullets, bullet)
+        cleared_count = len(cleared)
+        if self.bullet_field is not None:
+            cleared_count += self.bullet_field.clear_radius(x, y, radius)
+        
+        self.commands.spawn(self.explosions, BombWave(x, y, radius))
+        print(f"引爆炸弹！消灭{len(victims)}个敌人、{cleared_count}颗子弹，剩余炸弹: {self.player.bombs}")
+    
+    def _kill_batch(self, enemies):
+        """批量击杀普通敌人 - 移除、分数和击杀数一次性排队，爆炸按位置合并"""
+        if not enemies:
+            return
+        buckets = self.enemies.buckets
+        for enemy in enemies:
+            enemy.hp = 0
+            self.commands.despawn(buckets[enemy.archetype], enemy)
+        self.commands.add_score(10 * len(enemies), kills=len(enemies))
+        self._add_merged_explosions(enemies)
+    
+    def _add_merged_explosions(self, enemies, cell_size=96, max_explosions=8):
+        """合并爆炸 - 同一区域内的多个击杀只生成一个爆炸，粒子数随击杀数增加但有上限
+        Args:
+            enemies: 被击杀的敌人
+            cell_size: 合并区域的边长
+            max_explosions: 最多生成的爆炸数（优先保留击杀最多的区域）
+        """
+        clusters = {}  # 区域 -> [x总和, y总和, 最大尺寸, 数量]
+        for enemy in enemies:
+            center_x = enemy.x + enemy.width / 2
+            center_y = enemy.y + enemy.height / 2
+            key = (int(center_x // cell_size), int(center_y // cell_size))
+            cluster = clusters.get(key)
+            if cluster is None:
+                clusters[key] = [center_x, center_y, enemy.width, 1]
+            else:
+                cluster[0] += center_x
+                cluster[1] += center_y
+                cluster[2] = max(cluster[2], enemy.width)
+                cluster[3] += 1
+        largest = sorted(clusters.values(), key=lambda cluster: cluster[3], reverse=True)
+        explosions = []
+        for sum_x, sum_y, size, count in largest[:max_explosions]:
+            explosions.append(Explosion(sum_x / count, sum_y / count,
+                                        min(size + 8 * (count - 1), 90),
+                                        particle_count=min(15 + 3 * (count - 1), 40)))
+        self.commands.spawn_many(self.explosions, explosions)
+    
+    def _add_explosion(self, enemy):
+        """在敌人位置创建爆炸效果"""
+        explosion_size = enemy.width
+        explosion = Explosion(enemy.x + explosion_size // 2, enemy.y + explosion_size // 2, explosion_size)
+        self.commands.spawn(self.explosions, explosion)
     
     def _handle_animation_complete(self):
         """处理动画完成后的逻辑"""
@@ -292,21 +531,21 @@ class GameScene:
             self.boss_spawned = False
             self.boss_defeated = False
             
-            # 奖励玩家1点生命值
+            # 奖励玩家1点生命值和1颗炸弹
             self.player.add_hp(1)
+            self.player.bombs += 1
             
             print(f"进入第{self.current_level}关！")
             
             # 清空敌人和子弹
             self.enemies.clear()
             self.enemy_bullets.clear()
+            if self.bullet_field is not None:
+                self.bullet_field.clear()
             self.bullets.clear()
             
-            # 生成新的敌人
-            self._spawn_initial_enemies()
-            
-            # 播放下一关的介绍动画
-            self._start_level_intro()
+            # 加载下一关的数据，生成初始敌人并播放介绍动画
+            self._start_level()
         
         elif self.game_state == 'game_complete':
             # 游戏通关动画完成
@@ -325,10 +564,15 @@ class GameScene:
         # 绘制玩家子弹
         for bullet in self.bullets:
             bullet.draw(screen)
+        # 播放动画暂停时不显示激光
+        if not self.game_paused:
+            self.laser.draw(screen)
         
         # 绘制敌人子弹
         for bullet in self.enemy_bullets:
             bullet.draw(screen)
+        if self.bullet_field is not None:
+            self.bullet_field.draw(screen)
             
         # 绘制敌人
         for enemy in self.enemies:
@@ -352,15 +596,16 @@ class GameScene:
         # 绘制敌人计数
         small_font = pygame.font.Font(None, 24)
         if not self.boss_spawned:
-            kills_text = small_font.render(f'Kills: {self.enemies_killed}/10', True, (200, 200, 200))
+            kills_text = small_font.render(f'Kills: {self.enemies_killed}/{self.boss_kills}', True, (200, 200, 200))
             screen.blit(kills_text, (10, 130))
         else:
-            boss_text = small_font.render('BOSS FIGHT!', True, (255, 0, 0))
+            label = 'BOSS FIGHT!' if self.bullet_field is None else f'BULLET HELL! {len(self.bullet_field)}'
+            boss_text = small_font.render(label, True, (255, 0, 0))
             screen.blit(boss_text, (10, 130))
         
         # 绘制武器提示
-        weapon_names = ['普通子弹', '三连发', '散弹枪', '巨型子弹', '巨型散弹']
-        weapon_text = small_font.render(f'Weapon[1-5]: {weapon_names[self.player.weapon_type]}', 
+        weapon_names = ['普通子弹', '三连发', '散弹枪', '巨型子弹', '巨型散弹', '追踪导弹', '激光']
+        weapon_text = small_font.render(f'Weapon[1-7]: {weapon_names[self.player.weapon_type]}', 
                                        True, (200, 200, 200))
         screen.blit(weapon_text, (10, 160))
         
@@ -370,34 +615,74 @@ class GameScene:
         mode_text = small_font.render(f'Mode[A]: {shoot_mode}', True, mode_color)
         screen.blit(mode_text, (10, 185))
         
+        # 绘制炸弹数量
+        bomb_text = small_font.render(f'Bomb[B]: {self.player.bombs}', True, (255, 150, 0))
+        screen.blit(bomb_text, (10, 210))
+        
+        # 倒带提示
+        if self.rewinding:
+            rewind_text = font.render('<< REWIND', True, (0, 200, 255))
+            screen.blit(rewind_text, (screen.get_width() - rewind_text.get_width() - 10, 10))
+        
         # 绘制动画（在所有内容之上）
         if self.current_animation:
             self.current_animation.draw(screen)
             
+    def _update_laser(self):
+        """发射一帧激光，对光束经过的敌人造成伤害"""
+        origin_x = self.player.x + self.player.width / 2
+        origin_y = self.player.y
+        for enemy in self.laser.fire(origin_x, origin_y, self.enemy_grid):
+            enemy.take_damage(self.laser.damage)
+        profiler = getattr(self.game, 'profiler', None)
+        if profiler is not None:
+            profiler.count('laser_cells', self.enemy_grid.cells_visited)
+    
     def check_collisions(self):
-        """检查碰撞"""
+        """检查碰撞（移除通过命令缓冲区延迟执行）
+        先做AABB/扫掠测试，通过后才用缓存的遮罩做像素级测试。
+        """
+        profiler = getattr(self.game, 'profiler', None)
+        if profiler is not None:
+            profiler.count('mask_tests', 0)
+        
         # 检查玩家子弹和敌人的碰撞
-        for bullet in self.bullets[:]:
-            for enemy in self.enemies[:]:
-                if self._check_collision(bullet, enemy):
-                    if bullet in self.bullets:
-                        self.bullets.remove(bullet)
-                    # 使用子弹的伤害值
-                    damage = getattr(bullet, 'damage', 1)
-                    enemy.take_damage(damage)
-                    break
+        # 子弹按上一帧到本帧的移动轨迹做扫掠检测，高速子弹不会穿过薄目标，
+        # 轨迹上碰到多个敌人时只命中最先碰到的那个
+        for bullet in self.bullets:
+            hit_enemy = None
+            hit_time = None
+            for enemy in self.enemies.collidable():
+                # 本帧已死亡的敌人等待移除，不再吸收子弹
+                if enemy.is_dead():
+                    continue
+                t = swept_pixel_hit(bullet, enemy, profiler)
+                if t is not None and (hit_time is None or t < hit_time):
+                    hit_enemy = enemy
+                    hit_time = t
+            if hit_enemy is not None:
+                self.commands.despawn(self.bullets, bullet)
+                # 使用子弹的伤害值
+                damage = getattr(bullet, 'damage', 1)
+                hit_enemy.take_damage(damage)
         
         # 检查敌人子弹和玩家的碰撞
-        for bullet in self.enemy_bullets[:]:
-            if self._check_collision(bullet, self.player):
-                if bullet in self.enemy_bullets:
-                    self.enemy_bullets.remove(bullet)
+        for bullet in self.enemy_bullets:
+            if swept_pixel_hit(bullet, self.player, profiler) is not None:
+                self.commands.despawn(self.enemy_bullets, bullet)
                 damage = getattr(bullet, 'damage', 1)
                 self.player.take_damage(damage)
+        if self.bullet_field is not None:
+            # 数组子弹的伤害都是1，命中的子弹已从数组中移除
+            for _ in range(self.bullet_field.collide(self.player, profiler)):
+                self.player.take_damage(1)
         
         # 检查敌人和玩家的碰撞
-        for enemy in self.enemies[:]:
-            if self._check_collision(enemy, self.player):
+        for enemy in self.enemies.collidable():
+            if enemy.is_dead():
+                continue
+            if (self._check_collision(enemy, self.player) and
+                    pixel_overlap(enemy, enemy.x, enemy.y, self.player, profiler)):
                 # 玩家受伤
                 self.player.take_damage(1)
                 # 敌人也受伤
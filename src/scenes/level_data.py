@@ -0,0 +1,273 @@
+import os
+import json
+import random
+from bisect import bisect_left
+
+# 关卡数据文件（JSON）：
+#   level       关卡编号
+#   boss_kills  召唤Boss需要的击杀数
+#   hint        关卡介绍动画的提示文字，可以使用 {boss_kills}
+#   initial     关卡开始时生成的敌人 {"count": 数量, "weights": {类型: 权重}}
+#   cycle       时间线一个周期的帧数，周期结束后用新的随机数重新编排，直到Boss出现
+#   waves       敌人波次 [{"start", "end", "interval", "count", "weights", "formation"}, ...]
+#               start/end为周期内的帧号，每interval帧生成一批count个敌人；
+#               formation为 "random"（默认，随机x坐标）或 "line"（横向等间距排成一排）
+#   difficulty  难度曲线 [[关卡帧号, 间隔倍数], ...]，帧号递增，中间线性插值，越小生成越快
+LEVELS_DIR = os.path.join("assets", "levels")
+ENEMY_TYPES = ('rock', 'plane', 'basic')
+FORMATIONS = ('random', 'line')
+SPAWN_Y = -50  # 敌人生成的y坐标（屏幕上方）
+
+# 已加载的关卡数据: 文件路径 -> (修改时间, LevelData)
+_level_cache = {}
+
+
+class LevelDataError(Exception):
+    """关卡数据文件格式错误"""
+
+
+class Wave:
+    """一个敌人波次"""
+    __slots__ = ('start', 'end', 'interval', 'count', 'types', 'cum_weights', 'formation')
+
+    def __init__(self, start, end, interval, count, weights, formation):
+        self.start = start
+        self.end = end
+        self.interval = interval
+        self.count = count
+        self.types = tuple(weights)
+        # 累计权重，编排时直接传给random.choices
+        self.cum_weights = []
+        total = 0
+        for name in self.types:
+            total += weights[name]
+            self.cum_weights.append(total)
+        self.formation = formation
+
+
+class LevelData:
+    """校验后的关卡数据"""
+    def __init__(self, level, boss_kills, hint, initial_count, initial_weights, cycle, waves, difficulty):
+        self.level = level
+        self.boss_kills = boss_kills
+        self.hint = hint
+        self.initial = Wave(0, 1, 1, initial_count, initial_weights, 'random')
+        self.cycle = cycle
+        self.waves = waves
+        self.difficulty = difficulty
+
+    def interval_scale(self, tick):
+        """难度曲线在关卡第tick帧的生成间隔倍数"""
+        points = self.difficulty
+        if tick <= points[0][0]:
+            return points[0][1]
+        for (t0, s0), (t1, s1) in zip(points, points[1:]):
+            if tick <= t1:
+                return s0 + (s1 - s0) * (tick - t0) / (t1 - t0)
+        return points[-1][1]
+
+
+def level_path(level, directory=LEVELS_DIR):
+    """关卡数据文件路径"""
+    return os.path.join(directory, f"level{level}.json")
+
+
+def load_level(level, directory=LEVELS_DIR):
+    """加载并校验关卡数据（按文件修改时间缓存，同一文件只解析一次）
+    Args:
+        level: 关卡编号
+        directory: 关卡数据目录
+    Returns:
+        LevelData对象
+    Raises:
+        LevelDataError: 文件不存在或格式错误
+    """
+    path = level_path(level, directory)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        raise LevelDataError(f'找不到关卡数据文件: {path}')
+    cached = _level_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path, encoding='utf-8') as f:
+            raw = json.load(f)
+    except (OSError, ValueError) as e:
+        raise LevelDataError(f'{path}: 无法读取: {e}')
+    data = parse_level(raw, path)
+    _level_cache[path] = (mtime, data)
+    return data
+
+
+def parse_level(raw, source='<关卡数据>'):
+    """校验关卡数据字典并转换为LevelData
+    Args:
+        raw: json.load得到的字典
+        source: 出错时显示的数据来源
+    Raises:
+        LevelDataError: 缺少字段或字段值不合法
+    """
+    def fail(message):
+        raise LevelDataError(f'{source}: {message}')
+
+    def integer(obj, key, minimum, where):
+        value = obj.get(key)
+        if not isinstance(value, int) or isinstance(value, bool) or value < minimum:
+            fail(f'{where}.{key} 必须是不小于{minimum}的整数')
+        return value
+
+    def weights(obj, where):
+        value = obj.get('weights')
+        if not isinstance(value, dict) or not value:
+            fail(f'{where}.weights 必须是非空对象')
+        for name, weight in value.items():
+            if name not in ENEMY_TYPES:
+                fail(f'{where}.weights 中有未知的敌人类型 {name}（可用: {", ".join(ENEMY_TYPES)}）')
+            if not isinstance(weight, (int, float)) or isinstance(weight, bool) or weight <= 0:
+                fail(f'{where}.weights.{name} 必须是正数')
+        return value
+
+    if not isinstance(raw, dict):
+        fail('顶层必须是对象')
+    level = integer(raw, 'level', 1, 'level')
+    boss_kills = integer(raw, 'boss_kills', 0, 'level')
+    hint = raw.get('hint', '加油！')
+    if not isinstance(hint, str):
+        fail('hint 必须是字符串')
+    try:
+        hint = hint.format(boss_kills=boss_kills)
+    except (KeyError, IndexError, ValueError) as e:
+        fail(f'hint 格式错误: {e}')
+
+    initial = raw.get('initial', {'count': 0, 'weights': {'rock': 1}})
+    if not isinstance(initial, dict):
+        fail('initial 必须是对象')
+    initial_count = integer(initial, 'count', 0, 'initial')
+    initial_weights = weights(initial, 'initial')
+
+    cycle = integer(raw, 'cycle', 1, 'level')
+    waves = []
+    raw_waves = raw.get('waves')
+    if not isinstance(raw_waves, list):
+        fail('waves 必须是数组')
+    for i, wave in enumerate(raw_waves):
+        where = f'waves[{i}]'
+        if not isinstance(wave, dict):
+            fail(f'{where} 必须是对象')
+        start = integer(wave, 'start', 0, where)
+        end = integer(wave, 'end', start + 1, where)
+        if end > cycle:
+            fail(f'{where}.end 不能超过cycle（{cycle}）')
+        formation = wave.get('formation', 'random')
+        if formation not in FORMATIONS:
+            fail(f'{where}.formation 必须是 {" 或 ".join(FORMATIONS)}')
+        waves.append(Wave(start, end, integer(wave, 'interval', 1, where), integer(wave, 'count', 1, where),
+                          weights(wave, where), formation))
+
+    difficulty = raw.get('difficulty', [[0, 1.0]])
+    if not isinstance(difficulty, list) or not difficulty:
+        fail('difficulty 必须是非空数组')
+    points = []
+    for i, point in enumerate(difficulty):
+        if (not isinstance(point, list) or len(point) != 2 or
+                not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in point)):
+            fail(f'difficulty[{i}] 必须是 [帧号, 间隔倍数]')
+        tick, scale = point
+        if scale <= 0:
+            fail(f'difficulty[{i}] 的间隔倍数必须是正数')
+        if points and tick <= points[-1][0]:
+            fail('difficulty 的帧号必须递增')
+        points.append((tick, scale))
+
+    return LevelData(level, boss_kills, hint, initial_count, initial_weights, cycle, waves, points)
+
+
+def _spawn_batch(wave, rng, width):
+    """编排一批敌人
+    Returns:
+        [(敌人类型, x坐标), ...]
+    """
+    types = rng.choices(wave.types, cum_weights=wave.cum_weights, k=wave.count)
+    if wave.formation == 'line':
+        step = (width - 100) / (wave.count + 1)
+        xs = [int(50 + step * (i + 1)) for i in range(wave.count)]
+    else:
+        xs = [rng.randint(50, width - 50) for _ in range(wave.count)]
+    return list(zip(types, xs))
+
+
+def compile_cycle(level_data, cycle, seed, width):
+    """把关卡的一个周期编排为按帧号排序的生成时间线
+    Args:
+        level_data: LevelData对象
+        cycle: 周期序号（难度曲线按关卡帧号 cycle*周期长度+周期内帧号 计算）
+        seed: 随机种子（同一种子和周期总是得到同一条时间线）
+        width: 世界宽度
+    Returns:
+        (帧号列表, 批次列表)，帧号为周期内帧号、严格递增，批次为[(敌人类型, x坐标), ...]
+    """
+    rng = random.Random(seed * 1000003 + cycle)
+    base = cycle * level_data.cycle
+    batches = {}
+    for wave in level_data.waves:
+        tick = wave.start
+        while tick < wave.end:
+            batches.setdefault(tick, []).extend(_spawn_batch(wave, rng, width))
+            tick += max(1, round(wave.interval * level_data.interval_scale(base + tick)))
+    ticks = sorted(batches)
+    return ticks, [batches[tick] for tick in ticks]
+
+
+class SpawnTimeline:
+    """关卡的敌人生成时间线
+    关卡开始时编排好一个周期内所有批次的帧号和内容，每帧只需比较一次下一批的帧号；
+    周期结束时用下一个周期序号重新编排。状态只有种子和关卡帧号，存档时据此重建。
+    """
+    def __init__(self, level_data, seed, width):
+        """编排第一个周期
+        Args:
+            level_data: LevelData对象
+            seed: 随机种子（由游戏的random生成，存档时保存）
+            width: 世界宽度
+        """
+        self.level_data = level_data
+        self.seed = seed
+        self.width = width
+        self.tick = 0  # 关卡帧号（只在游戏进行中前进）
+        self._load_cycle(0)
+
+    def initial_batch(self):
+        """关卡开始时生成的敌人 [(敌人类型, x坐标), ...]"""
+        rng = random.Random(self.seed * 1000003 - 1)
+        return _spawn_batch(self.level_data.initial, rng, self.width)
+
+    def _load_cycle(self, cycle):
+        self.cycle = cycle
+        self.cycle_start = cycle * self.level_data.cycle
+        self.ticks, self.batches = compile_cycle(self.level_data, cycle, self.seed, self.width)
+        self.index = 0  # 下一批的下标
+
+    def advance(self):
+        """前进一帧
+        Returns:
+            本帧要生成的批次 [(敌人类型, x坐标), ...]，没有时返回None
+        """
+        local = self.tick - self.cycle_start
+        if local >= self.level_data.cycle:
+            self._load_cycle(self.cycle + 1)
+            local = 0
+        self.tick += 1
+        if self.index < len(self.ticks) and self.ticks[self.index] == local:
+            batch = self.batches[self.index]
+            self.index += 1
+            return batch
+        return None
+
+    def seek(self, tick):
+        """跳到关卡第tick帧（读档时使用）"""
+        cycle = tick // self.level_data.cycle
+        if cycle != self.cycle:
+            self._load_cycle(cycle)
+        self.tick = tick
+        self.index = bisect_left(self.ticks, tick - self.cycle_start)
@@ -0,0 +1,119 @@
+import time
+import zlib
+from collections import deque
+from src.scenes.savegame import encode_scene, load_scene, can_save
+
+
+def _xor_bytes(data, base):
+    """两个字节串按位异或，较短的一方在末尾补零"""
+    length = max(len(data), len(base))
+    value = int.from_bytes(data, 'little') ^ int.from_bytes(base, 'little')
+    return value.to_bytes(length, 'little')
+
+
+class _Segment:
+    """一个关键帧及其后的差分帧"""
+    __slots__ = ('keyframe', 'deltas', 'size')
+
+    def __init__(self, keyframe):
+        self.keyframe = zlib.compress(keyframe, 1)
+        self.deltas = []  # (原始长度, 压缩后的异或差分)
+        self.size = len(self.keyframe)
+
+    def frame_count(self):
+        return 1 + len(self.deltas)
+
+
+class RewindBuffer:
+    """倒带环形缓冲 - 保存最近若干秒的场景状态
+    每隔keyframe_interval帧保存一个完整的关键帧，其余帧只保存与所属关键帧按位异或后
+    再压缩的差分（相邻帧大部分字节相同，异或后是大段的零）。
+    缓冲按关键帧分段，超出帧数或内存上限时整段丢弃最旧的数据。
+    bytes统计压缩后的数据，另外只有最新一段的关键帧以原始形式常驻内存。
+    """
+    def __init__(self, max_frames=600, max_bytes=4 * 1024 * 1024, keyframe_interval=30):
+        """初始化倒带缓冲
+        Args:
+            max_frames: 最多保存的帧数（60帧/秒时600帧约10秒），为0时不保存
+            max_bytes: 压缩后数据的内存上限（字节）
+            keyframe_interval: 关键帧间隔（帧）
+        """
+        self.max_frames = max_frames
+        self.max_bytes = max_bytes
+        self.keyframe_interval = keyframe_interval
+        self._segments = deque()
+        self._keyframe = None  # 最新一段关键帧的原始数据（编码差分用）
+        self.frames = 0  # 当前保存的帧数
+        self.bytes = 0  # 当前占用的字节数
+        self.capture_time = 0.0  # 最近一次保存耗时（毫秒）
+        self.captures = 0  # 累计保存的帧数
+
+    def clear(self):
+        """清空缓冲"""
+        self._segments.clear()
+        self._keyframe = None
+        self.frames = 0
+        self.bytes = 0
+
+    def capture(self, scene):
+        """保存场景当前帧（只在游戏进行中保存）
+        Returns:
+            是否保存了这一帧
+        """
+        if self.max_frames <= 0 or not can_save(scene):
+            return False
+        start = time.perf_counter()
+        data = encode_scene(scene)
+        segment = self._segments[-1] if self._segments else None
+        if segment is None or segment.frame_count() >= self.keyframe_interval:
+            segment = _Segment(data)
+            self._segments.append(segment)
+            self._keyframe = data
+            self.bytes += segment.size
+        else:
+            delta = zlib.compress(_xor_bytes(data, self._keyframe), 1)
+            segment.deltas.append((len(data), delta))
+            segment.size += len(delta)
+            self.bytes += len(delta)
+        self.frames += 1
+        self.captures += 1
+        self._evict()
+        self.capture_time = (time.perf_counter() - start) * 1000
+        return True
+
+    def rewind(self, scene):
+        """倒回上一帧：取出最新保存的一帧并恢复到场景
+        Returns:
+            是否成功倒回（缓冲为空时返回False）
+        """
+        if not self._segments:
+            return False
+        segment = self._segments[-1]
+        if segment.deltas:
+            length, delta = segment.deltas.pop()
+            size = len(delta)
+            data = _xor_bytes(zlib.decompress(delta), self._keyframe)[:length]
+        else:
+            # 这一段只剩关键帧：取出整段，之后的差分基于上一段的关键帧
+            self._segments.pop()
+            size = len(segment.keyframe)
+            data = self._keyframe
+            self._keyframe = zlib.decompress(self._segments[-1].keyframe) if self._segments else None
+        segment.size -= size
+        self.bytes -= size
+        self.frames -= 1
+        load_scene(scene, data)
+        return True
+
+    def seconds(self, fps=60):
+        """当前可倒带的秒数"""
+        return self.frames / fps
+
+    def _evict(self):
+        """超出帧数或内存上限时丢弃最旧的一段"""
+        while self._segments and (self.frames > self.max_frames or self.bytes > self.max_bytes):
+            segment = self._segments.popleft()
+            self.frames -= segment.frame_count()
+            self.bytes -= segment.size
+        if not self._segments:
+            self._keyframe = None
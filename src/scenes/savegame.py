@@ -0,0 +1,360 @@
+import os
+import struct
+import random
+from array import array
+from src.objects.enemy import Enemy, Rock, EnemyPlane, Boss
+from src.objects.bullet import (Bullet, TripleBullet, ShotgunBullet, GiantBullet, ShotgunGiantBullet,
+                                HomingMissile, EnemyBullet, BossShotgunBullet, PatternBullet)
+from src.objects.patterns import PATTERN_NAMES, STYLE_NAMES
+from src.objects.explosion import Explosion, BombWave
+from src.scenes.level_data import load_level, SpawnTimeline, LevelDataError
+from src.config import world
+
+# 存档格式（小端）：
+#   文件头     4字节标识 + 版本号(H)
+#   场景       分数、生成时间线的种子和关卡帧号、关卡计数等标量
+#   玩家       玩家字段
+#   激光       激光字段
+#   随机数     random模块的Mersenne Twister状态（625个uint32 + 高斯缓存）
+#   实体列表   石头、敌机、普通敌人、Boss、玩家子弹、敌人子弹、爆炸效果，
+#              每个列表为数量(I) + 每个对象的类型码(B)和字段
+SAVE_MAGIC = b'PYFS'
+SAVE_VERSION = 3
+DEFAULT_SAVE_PATH = os.path.join('saves', 'quicksave.sav')
+
+# 字段类型 -> struct格式
+#   n: 数值，保留int/float类型（标志 + 双精度）
+#   d: 浮点数    i: 整数    ?: 布尔值
+#   c: RGB颜色   e: 枚举字符串（存为选项下标）
+_FIELD_FORMATS = {'n': '?d', 'd': 'd', 'i': 'i', '?': '?', 'c': 'BBB', 'e': 'B'}
+
+_HEADER = struct.Struct('<4sH')
+_SCENE = struct.Struct('<iIiii???')
+_COUNT = struct.Struct('<I')
+_KIND = struct.Struct('<B')
+_TARGET = struct.Struct('<i')
+_RNG_HEADER = struct.Struct('<iI?d')
+
+
+class SaveError(Exception):
+    """存档格式错误或当前状态不允许存档"""
+
+
+class _Schema:
+    """一种对象的存档字段表"""
+    def __init__(self, cls, fields, choices=None):
+        """初始化字段表
+        Args:
+            cls: 对象类
+            fields: [(属性名, 字段类型), ...]
+            choices: 枚举字段的选项 {属性名: (选项, ...)}
+        """
+        self.cls = cls
+        self.fields = fields
+        self.choices = choices or {}
+        self.struct = struct.Struct('<' + ''.join(_FIELD_FORMATS[kind] for _, kind in fields))
+
+    def pack(self, obj):
+        """把对象字段打包为字节串"""
+        values = []
+        for name, kind in self.fields:
+            value = getattr(obj, name)
+            if kind == 'n':
+                values.append(isinstance(value, int))
+                values.append(value)
+            elif kind == 'c':
+                values.extend(value)
+            elif kind == 'e':
+                values.append(self.choices[name].index(value))
+            else:
+                values.append(value)
+        return self.struct.pack(*values)
+
+    def unpack(self, data, offset, obj=None):
+        """从data的offset处读取字段
+        Args:
+            obj: 写入的对象，为None时不调用__init__新建对象（不消耗随机数、不加载图片）
+        Returns:
+            (对象, 新的offset)
+        """
+        if obj is None:
+            obj = self.cls.__new__(self.cls)
+        values = self.struct.unpack_from(data, offset)
+        index = 0
+        for name, kind in self.fields:
+            if kind == 'n':
+                value = int(values[index + 1]) if values[index] else values[index + 1]
+                index += 2
+            elif kind == 'c':
+                value = values[index:index + 3]
+                index += 3
+            elif kind == 'e':
+                value = self.choices[name][values[index]]
+                index += 1
+            else:
+                value = values[index]
+                index += 1
+            setattr(obj, name, value)
+        return obj, offset + self.struct.size
+
+
+_ENEMY_FIELDS = [('x', 'n'), ('y', 'n'), ('width', 'i'), ('height', 'i'), ('speed', 'n'),
+                 ('color', 'c'), ('direction', 'i'), ('level', 'i'), ('hp', 'n'), ('max_hp', 'n')]
+_BULLET_FIELDS = [('x', 'n'), ('y', 'n'), ('width', 'i'), ('height', 'i'), ('speed', 'n'),
+                  ('color', 'c'), ('damage', 'n'), ('prev_x', 'n'), ('prev_y', 'n')]
+
+_PLAYER = _Schema(None, [
+    ('x', 'n'), ('y', 'n'), ('width', 'i'), ('height', 'i'), ('speed', 'n'), ('color', 'c'),
+    ('player_type', 'i'), ('hp', 'n'), ('weapon_type', 'i'), ('auto_shoot', '?'),
+    ('shoot_cooldown', 'i'), ('shoot_delay', 'i'), ('bombs', 'i'), ('fire_held', '?'),
+    ('invincible', '?'), ('invincible_timer', 'i'), ('invincible_duration', 'i'),
+    ('blink_timer', 'i'), ('visible', '?'),
+])
+_LASER = _Schema(None, [('active', '?'), ('origin_x', 'n'), ('origin_y', 'n'), ('length', 'n'),
+                        ('timer', 'i')])
+_PARTICLE = struct.Struct('<' + '?d' * 5 + 'BBB')
+
+# 类型码 -> 字段表（类型码写入存档，只能追加不能修改）
+_SCHEMAS = [
+    _Schema(Enemy, _ENEMY_FIELDS),
+    _Schema(Rock, _ENEMY_FIELDS + [('shape_type', 'e'), ('rotation', 'n')],
+            {'shape_type': ('circle', 'triangle', 'diamond', 'hexagon', 'star')}),
+    _Schema(EnemyPlane, _ENEMY_FIELDS + [('shoot_cooldown', 'i'), ('shoot_delay', 'i')]),
+    _Schema(Boss, _ENEMY_FIELDS + [('speed_x', 'n'), ('speed_y', 'n'), ('direction_x', 'i'),
+                                   ('direction_y', 'i'), ('action_cooldown', 'i'),
+                                   ('action_delay', 'i'), ('pattern', 'e'), ('pattern_tick', 'i')],
+            {'pattern': (None,) + PATTERN_NAMES}),
+    _Schema(Bullet, _BULLET_FIELDS),
+    _Schema(TripleBullet, _BULLET_FIELDS + [('offset', 'i')]),
+    _Schema(ShotgunBullet, _BULLET_FIELDS + [('angle', 'd')]),
+    _Schema(GiantBullet, _BULLET_FIELDS + [('glow_radius', 'i')]),
+    _Schema(ShotgunGiantBullet, _BULLET_FIELDS + [('angle', 'd'), ('glow_radius', 'i')]),
+    _Schema(HomingMissile, _BULLET_FIELDS + [('turn_rate', 'd'), ('retarget_interval', 'i'),
+                                             ('retarget_timer', 'i'), ('vx', 'd'), ('vy', 'd')]),
+    _Schema(EnemyBullet, _BULLET_FIELDS),
+    _Schema(BossShotgunBullet, _BULLET_FIELDS + [('angle', 'd'), ('vx', 'd'), ('vy', 'd')]),
+    _Schema(Explosion, [('x', 'n'), ('y', 'n'), ('size', 'n'), ('max_size', 'n'),
+                        ('current_size', 'n'), ('lifetime', 'i'), ('timer', 'i')]),
+    _Schema(BombWave, [('x', 'n'), ('y', 'n'), ('radius', 'n'), ('lifetime', 'i'), ('timer', 'i')]),
+    _Schema(PatternBullet, [('x', 'n'), ('y', 'n'), ('vx', 'd'), ('vy', 'd'), ('style', 'e'),
+                            ('width', 'i'), ('height', 'i'), ('color', 'c'), ('damage', 'n'),
+                            ('prev_x', 'n'), ('prev_y', 'n')],
+            {'style': STYLE_NAMES}),
+]
+_KIND_CODES = {schema.cls: code for code, schema in enumerate(_SCHEMAS)}
+
+
+def can_save(scene):
+    """当前状态是否允许存档（游戏进行中、没有播放动画）
+    弹幕地狱模式的数组子弹不在存档格式中，不能存档（也不记录倒带）。
+    """
+    return (scene.game_state == 'playing' and not scene.game_paused and
+            scene.current_animation is None and scene.bullet_field is None)
+
+
+def save_scene(scene):
+    """把游戏场景序列化为字节串，动画和调试数据不保存
+    Raises:
+        SaveError: 当前状态不允许存档
+    """
+    if scene.bullet_field is not None:
+        raise SaveError('弹幕地狱模式不支持存档')
+    if not can_save(scene):
+        raise SaveError('只能在游戏进行中存档')
+    return encode_scene(scene)
+
+
+def encode_scene(scene):
+    """按存档格式编码场景的当前状态（不检查游戏状态，也用于比较两个场景是否一致）"""
+    parts = [
+        _HEADER.pack(SAVE_MAGIC, SAVE_VERSION),
+        _SCENE.pack(scene.score, scene.spawn_timeline.seed, scene.spawn_timeline.tick, scene.current_level,
+                    scene.enemies_killed, scene.boss_spawned, scene.boss_defeated,
+                    scene.bomb_requested),
+        _PLAYER.pack(scene.player),
+        _LASER.pack(scene.laser),
+    ]
+    _pack_random_state(parts)
+
+    # 追踪导弹的目标按敌人在注册表中的遍历顺序保存为下标
+    enemy_index = {}
+    for archetype in scene.enemies.ARCHETYPES:
+        bucket = scene.enemies.buckets[archetype]
+        _pack_entities(parts, bucket)
+        for enemy in bucket:
+            enemy_index[id(enemy)] = len(enemy_index)
+    _pack_entities(parts, scene.bullets, enemy_index)
+    _pack_entities(parts, scene.enemy_bullets)
+    _pack_entities(parts, scene.explosions)
+    return b''.join(parts)
+
+
+def load_scene(scene, data):
+    """从字节串恢复游戏场景（原地修改scene）
+    Raises:
+        SaveError: 存档标识或版本不匹配、数据不完整，或者是弹幕地狱模式
+    """
+    if scene.bullet_field is not None:
+        raise SaveError('弹幕地狱模式不支持读档')
+    try:
+        magic, version = _HEADER.unpack_from(data, 0)
+    except struct.error:
+        raise SaveError('存档数据不完整')
+    if magic != SAVE_MAGIC:
+        raise SaveError('不是游戏存档')
+    if version != SAVE_VERSION:
+        raise SaveError(f'不支持的存档版本: {version}')
+
+    # 已加载的Boss图片按关卡复用（倒带时每帧都会读档，避免重复读取图片文件）
+    boss_images = {boss.level: boss.image for boss in scene.enemies.bosses}
+    try:
+        offset = _HEADER.size
+        (score, timeline_seed, timeline_tick, current_level, enemies_killed,
+         boss_spawned, boss_defeated, bomb_requested) = _SCENE.unpack_from(data, offset)
+        offset += _SCENE.size
+        _, offset = _PLAYER.unpack(data, offset, scene.player)
+        _, offset = _LASER.unpack(data, offset, scene.laser)
+        rng_state, offset = _unpack_random_state(data, offset)
+
+        enemies = []
+        for archetype in scene.enemies.ARCHETYPES:
+            bucket, offset = _unpack_entities(data, offset)
+            scene.enemies.buckets[archetype][:] = bucket
+            enemies.extend(bucket)
+        bullets, offset = _unpack_entities(data, offset, enemies)
+        enemy_bullets, offset = _unpack_entities(data, offset)
+        explosions, offset = _unpack_entities(data, offset)
+    except (struct.error, IndexError):
+        raise SaveError('存档数据不完整')
+
+    # 生成时间线由种子和关卡帧号重建（倒带时种子不变，只需要跳转）
+    timeline = scene.spawn_timeline
+    if timeline is None or timeline.seed != timeline_seed or scene.current_level != current_level:
+        try:
+            level_data = load_level(current_level)
+        except LevelDataError as e:
+            raise SaveError(str(e))
+        timeline = SpawnTimeline(level_data, timeline_seed, world.width)
+    timeline.seek(timeline_tick)
+
+    for boss in scene.enemies.bosses:
+        if boss.level in boss_images:
+            boss.image = boss_images[boss.level]
+        else:
+            boss._load_boss_image(boss.level)
+    scene.bullets[:] = bullets
+    scene.enemy_bullets[:] = enemy_bullets
+    scene.explosions[:] = explosions
+    scene.score = score
+    scene.spawn_timeline = timeline
+    scene.level_data = timeline.level_data
+    scene.boss_kills = timeline.level_data.boss_kills
+    scene.current_level = current_level
+    scene.enemies_killed = enemies_killed
+    scene.boss_spawned = boss_spawned
+    scene.boss_defeated = boss_defeated
+    scene.bomb_requested = bomb_requested
+    scene.current_animation = None
+    scene.game_state = 'playing'
+    scene.game_paused = False
+    random.setstate(rng_state)
+
+
+def write_save(scene, path=DEFAULT_SAVE_PATH):
+    """存档到文件
+    Returns:
+        存档字节数
+    """
+    data = save_scene(scene)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def read_save(scene, path=DEFAULT_SAVE_PATH):
+    """从文件读档"""
+    with open(path, 'rb') as f:
+        load_scene(scene, f.read())
+
+
+def _pack_random_state(parts):
+    """打包random模块的状态"""
+    version, internal, gauss_next = random.getstate()
+    parts.append(_RNG_HEADER.pack(version, len(internal), gauss_next is not None,
+                                  gauss_next or 0.0))
+    parts.append(array('I', internal).tobytes())
+
+
+def _unpack_random_state(data, offset):
+    """读取random模块的状态
+    Returns:
+        (random.setstate可用的状态, 新的offset)
+    """
+    version, length, has_gauss, gauss_next = _RNG_HEADER.unpack_from(data, offset)
+    offset += _RNG_HEADER.size
+    internal = array('I')
+    end = offset + length * internal.itemsize
+    if end > len(data):
+        raise SaveError('存档数据不完整')
+    internal.frombytes(data[offset:end])
+    return (version, tuple(internal), gauss_next if has_gauss else None), end
+
+
+def _pack_entities(parts, entities, enemy_index=None):
+    """打包一个实体列表"""
+    parts.append(_COUNT.pack(len(entities)))
+    for obj in entities:
+        code = _KIND_CODES[type(obj)]
+        parts.append(_KIND.pack(code))
+        parts.append(_SCHEMAS[code].pack(obj))
+        if type(obj) is HomingMissile:
+            target = obj.target
+            parts.append(_TARGET.pack(enemy_index.get(id(target), -1) if target is not None else -1))
+        elif type(obj) is Explosion:
+            parts.append(_COUNT.pack(len(obj.particles)))
+            for particle in obj.particles:
+                values = []
+                for name in ('x', 'y', 'vx', 'vy', 'size'):
+                    value = particle[name]
+                    values.append(isinstance(value, int))
+                    values.append(value)
+                values.extend(particle['color'])
+                parts.append(_PARTICLE.pack(*values))
+
+
+def _unpack_entities(data, offset, enemies=None):
+    """读取一个实体列表
+    Args:
+        enemies: 已恢复的敌人（按注册表遍历顺序），用于恢复追踪导弹的目标
+    Returns:
+        (对象列表, 新的offset)
+    """
+    (count,) = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    entities = []
+    for _ in range(count):
+        (code,) = _KIND.unpack_from(data, offset)
+        obj, offset = _SCHEMAS[code].unpack(data, offset + _KIND.size)
+        if type(obj) is HomingMissile:
+            (target,) = _TARGET.unpack_from(data, offset)
+            offset += _TARGET.size
+            obj.target = enemies[target] if target >= 0 else None
+        elif type(obj) is Explosion:
+            (particle_count,) = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+            particles = []
+            for _ in range(particle_count):
+                values = _PARTICLE.unpack_from(data, offset)
+                offset += _PARTICLE.size
+                particle = {}
+                for i, name in enumerate(('x', 'y', 'vx', 'vy', 'size')):
+                    value = values[i * 2 + 1]
+                    particle[name] = int(value) if values[i * 2] else value
+                particle['color'] = values[10:13]
+                particles.append(particle)
+            obj.particles = particles
+        entities.append(obj)
+    return entities, offset
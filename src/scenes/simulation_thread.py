@@ -0,0 +1,85 @@
+import time
+import queue
+import threading
+from src.scenes.snapshot import SceneSnapshot, SnapshotBuffer
+
+
+class SimulationThread(threading.Thread):
+    """仿真线程 - 以固定频率更新GameScene，每帧把快照发布到双缓冲
+    主线程只负责读取输入和绘制最新快照。事件和按键状态通过队列传给仿真线程，
+    场景对象只在仿真线程中修改（动画除外，见SceneSnapshot）。
+    """
+    def __init__(self, scene, tick_rate=60):
+        """初始化仿真线程
+        Args:
+            scene: GameScene对象
+            tick_rate: 每秒仿真帧数
+        """
+        super().__init__(name='simulation', daemon=True)
+        self.scene = scene
+        self.tick_interval = 1.0 / tick_rate
+        self.snapshots = SnapshotBuffer()
+        self.animation_lock = threading.Lock()
+        self._inputs = queue.SimpleQueue()  # ('event', 事件, 时间) 或 ('keys', 按键状态, 时间)
+        self._stop_event = threading.Event()
+        self.keys = None  # 最近一次收到的按键状态
+        self.input_time = None  # 已使用的最新输入的时间戳
+        self.ticks = 0
+        self.tick_time = 0.0  # 最近一帧仿真耗时（毫秒）
+        self.late_ticks = 0  # 超出帧间隔的仿真帧数
+
+    def post_event(self, event):
+        """把pygame事件交给仿真线程处理（在下一帧开始时执行）"""
+        self._inputs.put(('event', event, time.perf_counter()))
+
+    def post_keys(self, keys, input_time=None):
+        """更新按键状态
+        Args:
+            keys: 按键状态（可按pygame键值索引），调用方之后不能再修改它
+            input_time: 读取按键的时间戳，默认为当前时间
+        """
+        self._inputs.put(('keys', keys, input_time or time.perf_counter()))
+
+    def stop(self):
+        """请求线程结束"""
+        self._stop_event.set()
+
+    def run(self):
+        scene = self.scene
+        next_tick = time.perf_counter()
+        while not self._stop_event.is_set():
+            self._drain_inputs()
+
+            start = time.perf_counter()
+            if scene.current_animation is not None:
+                # 动画对象由渲染线程直接绘制，更新时互斥
+                with self.animation_lock:
+                    scene.update(self.keys)
+            else:
+                scene.update(self.keys)
+            self.ticks += 1
+            self.snapshots.publish(SceneSnapshot(scene, self.ticks, self.input_time, self.animation_lock))
+            end = time.perf_counter()
+            self.tick_time = (end - start) * 1000
+
+            # 固定频率：落后太多时不追帧，从当前时间重新计时
+            next_tick += self.tick_interval
+            if end > next_tick:
+                self.late_ticks += 1
+                if end - next_tick > self.tick_interval * 5:
+                    next_tick = end
+            else:
+                self._stop_event.wait(next_tick - end)
+
+    def _drain_inputs(self):
+        """处理队列中的全部输入"""
+        while True:
+            try:
+                kind, value, timestamp = self._inputs.get_nowait()
+            except queue.Empty:
+                return
+            if kind == 'event':
+                self.scene.handle_event(value)
+            else:
+                self.keys = value
+            self.input_time = timestamp
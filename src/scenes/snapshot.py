@@ -0,0 +1,113 @@
+import copy
+import threading
+
+
+def snapshot_object(obj):
+    """复制一个可绘制对象的当前状态
+    对象可以定义snapshot()方法自行复制会被原地修改的内部数据（例如爆炸的粒子），
+    否则做浅复制：坐标等数值属性被固定下来，图片等只读资源仍然共享。
+    """
+    snapshot = getattr(obj, 'snapshot', None)
+    if snapshot is not None:
+        return snapshot()
+    return copy.copy(obj)
+
+
+class SceneSnapshot:
+    """游戏场景在某一帧的只读快照
+    属性名与GameScene一致，渲染时直接复用GameScene.draw；
+    仿真线程之后对场景的修改不会影响已经发布的快照。
+    """
+    __slots__ = ('tick', 'input_time', 'game', 'game_state', 'game_paused',
+                 'player', 'bullets', 'enemy_bullets', 'enemies', 'explosions', 'laser',
+                 'score', 'current_level', 'enemies_killed', 'boss_kills', 'boss_spawned', 'rewinding', 'current_animation',
+                 'bullet_field')
+
+    def __init__(self, scene, tick=0, input_time=None, animation_lock=None):
+        """从场景生成快照
+        Args:
+            scene: GameScene对象
+            tick: 仿真帧号
+            input_time: 已使用的最新输入的时间戳（time.perf_counter），用于测量输入延迟
+            animation_lock: 动画锁（动画对象不复制，绘制时与仿真线程的更新互斥）
+        """
+        self.tick = tick
+        self.input_time = input_time
+        self.game = scene.game
+        self.game_state = scene.game_state
+        self.game_paused = scene.game_paused
+        self.player = snapshot_object(scene.player)
+        self.bullets = tuple(snapshot_object(bullet) for bullet in scene.bullets)
+        self.enemy_bullets = tuple(snapshot_object(bullet) for bullet in scene.enemy_bullets)
+        self.enemies = tuple(snapshot_object(enemy) for enemy in scene.enemies)
+        self.explosions = tuple(snapshot_object(explosion) for explosion in scene.explosions)
+        self.laser = snapshot_object(scene.laser)
+        self.bullet_field = scene.bullet_field.snapshot() if scene.bullet_field is not None else None
+        self.score = scene.score
+        self.current_level = scene.current_level
+        self.enemies_killed = scene.enemies_killed
+        self.boss_kills = scene.boss_kills
+        self.boss_spawned = scene.boss_spawned
+        self.rewinding = scene.rewinding
+        animation = scene.current_animation
+        if animation is not None and animation_lock is not None:
+            animation = _LockedAnimation(animation, animation_lock)
+        self.current_animation = animation
+
+    def draw(self, screen):
+        """绘制快照（与GameScene.draw的画面相同）"""
+        from src.scenes.game_scene import GameScene
+        GameScene.draw(self, screen)
+
+
+class _LockedAnimation:
+    """动画包含字体缓存等不便复制的状态，并且只在游戏暂停时播放，
+    因此快照中保留原对象，绘制时持有与仿真线程共用的锁。
+    """
+    __slots__ = ('animation', 'lock')
+
+    def __init__(self, animation, lock):
+        self.animation = animation
+        self.lock = lock
+
+    def draw(self, screen):
+        with self.lock:
+            self.animation.draw(screen)
+
+
+class SnapshotBuffer:
+    """快照双缓冲 - 仿真线程写入后台槽位后交换，渲染线程读取前台槽位
+    快照本身不可变，渲染线程拿到的快照在绘制期间不会被修改。
+    """
+    def __init__(self):
+        self._slots = [None, None]
+        self._front = 0
+        self._changed = threading.Condition()
+        self.published = 0  # 已发布的快照数
+
+    def publish(self, snapshot):
+        """发布新快照"""
+        with self._changed:
+            back = 1 - self._front
+            self._slots[back] = snapshot
+            self._front = back
+            self.published += 1
+            self._changed.notify_all()
+
+    def latest(self):
+        """最新发布的快照，还没有快照时返回None"""
+        with self._changed:
+            return self._slots[self._front]
+
+    def wait_newer(self, tick, timeout=None):
+        """等待比tick更新的快照（渲染与仿真帧对齐，减少输入延迟）
+        Args:
+            tick: 已绘制的快照帧号
+            timeout: 最长等待秒数，超时后返回当前最新的快照
+        Returns:
+            最新的快照（可能为None）
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._slots[self._front] is not None and
+                                   self._slots[self._front].tick > tick, timeout)
+            return self._slots[self._front]
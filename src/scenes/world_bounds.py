@@ -0,0 +1,24 @@
+from src.config import world
+
+
+def outside_world(obj, margin=0):
+    """对象的包围盒是否完全位于世界范围（四周扩展margin）之外"""
+    return (obj.x + obj.width < -margin or obj.x > world.width + margin or
+            obj.y + obj.height < -margin or obj.y > world.height + margin)
+
+
+def cull_outside_world(entities, commands, margin=0):
+    """把超出世界范围的对象排队移除
+    Args:
+        entities: 实体列表
+        commands: CommandBuffer，移除在本帧结束时统一执行
+        margin: 世界范围四周的边距
+    Returns:
+        本次剔除的对象数
+    """
+    culled = 0
+    for obj in entities:
+        if outside_world(obj, margin):
+            commands.despawn(entities, obj)
+            culled += 1
+    return culled
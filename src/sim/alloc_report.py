@@ -0,0 +1,82 @@
+import os
+import sys
+import random
+import argparse
+import contextlib
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.sim.headless import init_headless, HeadlessGame
+from src.sim.autoplay import AutoPlayBot
+from src.debug.alloc_tracker import AllocationTracker
+from src.config import GAME_MODES
+
+
+def profile_allocations(frames=600, warmup=300, mode='normal', seed=0, draw=True, top=15):
+    """自动操作玩一局，预热后逐帧统计每帧留存的内存块
+    Args:
+        frames: 统计的帧数
+        warmup: 开始统计前运行的帧数（跳过关卡介绍动画和首次加载）
+        mode: 游戏模式
+        seed: 随机种子
+        draw: 是否每帧调用Game.draw绘制（场景、FPS文字和画面显示中的分配一起统计）
+        top: 报告的分配位置数
+    Returns:
+        AllocationTracker（包含最近frames帧的统计）
+    """
+    from src.scenes.game_scene import GameScene
+    from src.game import Game
+
+    init_headless()
+    random.seed(seed)
+    tracker = AllocationTracker(top=top, window=frames)
+    bot = AutoPlayBot()
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        if draw:
+            # 使用真正的Game对象（跳过开场动画），绘制走与游戏相同的Game.draw
+            game = Game(mode=mode)
+            game.game_state = 'playing'
+            game.current_scene = scene = GameScene(game)
+        else:
+            game = None
+            scene = GameScene(HeadlessGame(mode=mode))
+        scene.player.hp = 10 ** 6  # 不让玩家死亡，统计的都是游戏进行中的帧
+        for _ in range(warmup):
+            scene.update(bot.act(scene))
+            if game is not None:
+                game.draw()
+        tracker.start()
+        for _ in range(frames):
+            scene.update(bot.act(scene))
+            if game is not None:
+                game.draw()
+            tracker.end_frame()
+    tracker.stop()
+    return tracker
+
+
+def main():
+    parser = argparse.ArgumentParser(description='逐帧内存分配统计：按分配位置（文件:行）列出每帧结束时留存的内存块和字节数')
+    parser.add_argument('--frames', type=int, default=600, help='统计的帧数')
+    parser.add_argument('--warmup', type=int, default=300, help='开始统计前运行的帧数')
+    parser.add_argument('--mode', choices=GAME_MODES, default='normal', help='游戏模式')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--top', type=int, default=15, help='列出的分配位置数')
+    parser.add_argument('--no-draw', action='store_true', help='只统计游戏逻辑，不绘制')
+    parser.add_argument('--max-blocks', type=float, default=None,
+                        help='每帧平均留存内存块数的上限，超过时退出码为1；'
+                             '帧内分配又释放的临时对象不计入，所以通过检查不能证明没有分配')
+    args = parser.parse_args()
+
+    tracker = profile_allocations(args.frames, args.warmup, args.mode, args.seed, not args.no_draw, args.top)
+    for line in tracker.report_lines():
+        print(line)
+    blocks = tracker.summary()['retained_blocks']
+    if args.max_blocks is not None and blocks > args.max_blocks:
+        print(f'FAIL: 每帧平均留存 {blocks:.2f} 块，超过上限 {args.max_blocks}')
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import pygame
+
+
+class BotKeys:
+    """模拟的按键状态 - 可像pygame.key.get_pressed()的结果一样按键值索引"""
+    def __init__(self):
+        self.pressed = set()
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+    def copy(self):
+        """复制当前按键状态（交给其他线程使用时避免被下一帧修改）"""
+        keys = BotKeys()
+        keys.pressed = set(self.pressed)
+        return keys
+
+    def set(self, left=False, right=False, up=False, down=False):
+        """设置方向键状态"""
+        self.pressed.clear()
+        if left:
+            self.pressed.add(pygame.K_LEFT)
+        if right:
+            self.pressed.add(pygame.K_RIGHT)
+        if up:
+            self.pressed.add(pygame.K_UP)
+        if down:
+            self.pressed.add(pygame.K_DOWN)
+
+
+class AutoPlayBot:
+    """简单的脚本化自动操作机器人 - 躲避子弹和敌人，对准敌人开火"""
+    def __init__(self, danger_height=160, home_margin=80):
+        """初始化机器人
+        Args:
+            danger_height: 玩家上方多高范围内的物体视为威胁（像素）
+            home_margin: 玩家与屏幕底部保持的距离（像素）
+        """
+        self.danger_height = danger_height
+        self.home_margin = home_margin
+        self.keys = BotKeys()
+
+    def act(self, scene):
+        """根据场景状态计算本帧按键
+        Args:
+            scene: GameScene对象
+        Returns:
+            BotKeys按键状态，直接传给GameScene.update
+        """
+        player = scene.player
+        px = player.x + player.width / 2
+        top = player.y - self.danger_height
+        bottom = player.y + player.height
+        screen_width = scene.game.screen_width
+        screen_height = scene.game.screen_height
+
+        # 寻找正上方最近的威胁（敌人子弹和敌人本体）
+        threat_x = None
+        threat_y = float('-inf')
+        for obj in scene.enemy_bullets:
+            threat_x, threat_y = self._closer_threat(
+                obj, player, top, bottom, threat_x, threat_y)
+        for obj in scene.enemies:
+            threat_x, threat_y = self._closer_threat(
+                obj, player, top, bottom, threat_x, threat_y)
+        field = getattr(scene, 'bullet_field', None)
+        if field is not None:
+            # 弹幕地狱模式的数组子弹：在同样的危险区域内整列查找最近的一发
+            margin = player.speed * 2
+            lowest = field.lowest_in_rect(player.x - margin, top, player.x + player.width + margin, bottom)
+            if lowest is not None and lowest[1] > threat_y:
+                threat_x, threat_y = lowest
+
+        left = right = False
+        if threat_x is not None:
+            # 远离威胁，贴墙时反向躲避
+            if threat_x >= px and player.x > player.speed:
+                left = True
+            elif player.x + player.width < screen_width - player.speed:
+                right = True
+            else:
+                left = True
+        else:
+            # 没有威胁时对准最低的敌人
+            target = None
+            for enemy in scene.enemies:
+                if target is None or enemy.y > target.y:
+                    target = enemy
+            if target is not None:
+                tx = target.x + target.width / 2
+                if tx < px - player.speed:
+                    left = True
+                elif tx > px + player.speed:
+                    right = True
+
+        # 保持在屏幕底部附近
+        home_y = screen_height - self.home_margin
+        up = player.y > home_y + player.speed
+        down = player.y < home_y - player.speed
+
+        self.keys.set(left, right, up, down)
+        return self.keys
+
+    def _closer_threat(self, obj, player, top, bottom, threat_x, threat_y):
+        """如果obj在玩家上方的危险区域内且比当前威胁更近，返回obj的位置"""
+        width = getattr(obj, 'width', 30)
+        height = getattr(obj, 'height', 30)
+        if obj.y + height < top or obj.y > bottom:
+            return threat_x, threat_y
+        margin = player.speed * 2
+        if obj.x + width < player.x - margin or obj.x > player.x + player.width + margin:
+            return threat_x, threat_y
+        if obj.y > threat_y:
+            return obj.x + width / 2, obj.y
+        return threat_x, threat_y
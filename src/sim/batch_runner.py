@@ -0,0 +1,203 @@
+import os
+import sys
+import time
+import random
+import argparse
+import multiprocessing
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.sim.headless import init_headless, HeadlessGame
+from src.sim.autoplay import AutoPlayBot
+from src.config import world, parse_size
+
+WEAPON_NAMES = ['普通子弹', '三连发', '散弹枪', '巨型子弹', '巨型散弹', '追踪导弹', '激光']
+MAX_LEVEL = 3
+
+
+def _init_worker(base_seed, world_size):
+    """进程池工作进程初始化 - 世界大小、无头显示、静默输出、确定性种子"""
+    world.configure(*world_size)
+    init_headless()
+    # 游戏对象会打印大量日志，批量模拟时关闭
+    sys.stdout = open(os.devnull, 'w')
+    random.seed(base_seed)
+
+
+def session_seed(base_seed, session_id):
+    """每局的随机种子只取决于基础种子和局编号，与由哪个进程执行无关"""
+    return base_seed * 1000003 + session_id
+
+
+def run_session(task):
+    """运行一局自动操作游戏并返回统计数据
+    Args:
+        task: (局编号, 随机种子, 武器类型, 最大帧数)
+    Returns:
+        本局统计数据字典
+    """
+    from src.scenes.game_scene import GameScene
+
+    session_id, seed, weapon_type, max_ticks = task
+    random.seed(seed)
+    scene = GameScene(HeadlessGame())
+    scene.player.weapon_type = weapon_type
+    bot = AutoPlayBot()
+
+    ticks = 0
+    level_ticks = 0  # 当前关卡已进行的游戏帧数（不含动画）
+    time_to_boss = {}  # 关卡 -> 开局到Boss出现的帧数
+    levels_cleared = 0
+    damage_taken = 0
+    last_hp = scene.player.hp
+    last_state = scene.game_state
+
+    while ticks < max_ticks:
+        scene.update(bot.act(scene))
+        ticks += 1
+
+        if scene.game_state == 'playing' and not scene.game_paused:
+            level_ticks += 1
+            if scene.boss_spawned and scene.current_level not in time_to_boss:
+                time_to_boss[scene.current_level] = level_ticks
+
+        if scene.player.hp < last_hp:
+            damage_taken += last_hp - scene.player.hp
+        last_hp = scene.player.hp
+
+        if scene.game_state != last_state:
+            if scene.game_state == 'boss_victory':
+                levels_cleared += 1
+            elif scene.game_state == 'level_intro':
+                level_ticks = 0
+            last_state = scene.game_state
+
+        if scene.game_state in ('game_over', 'game_complete'):
+            break
+
+    return {
+        'session': session_id,
+        'seed': seed,
+        'weapon_type': weapon_type,
+        'levels_cleared': levels_cleared,
+        'completed': levels_cleared >= MAX_LEVEL,
+        'died': scene.game_state == 'game_over',
+        'ticks': ticks,
+        'time_to_boss': time_to_boss,
+        'damage_taken': damage_taken,
+        'score': scene.score,
+    }
+
+
+class StatsAggregator:
+    """按武器类型汇总每局统计数据"""
+    def __init__(self):
+        self.groups = {}
+
+    def add(self, stats):
+        """加入一局的统计数据"""
+        group = self.groups.setdefault(stats['weapon_type'], {
+            'sessions': 0,
+            'cleared': [0] * MAX_LEVEL,  # 通过第N关的局数
+            'boss_ticks': [[] for _ in range(MAX_LEVEL)],
+            'damage': 0,
+            'score': 0,
+            'ticks': 0,
+        })
+        group['sessions'] += 1
+        for level in range(stats['levels_cleared']):
+            group['cleared'][level] += 1
+        for level, boss_ticks in stats['time_to_boss'].items():
+            group['boss_ticks'][level - 1].append(boss_ticks)
+        group['damage'] += stats['damage_taken']
+        group['score'] += stats['score']
+        group['ticks'] += stats['ticks']
+
+    def summary_table(self):
+        """生成汇总表格文本"""
+        header = ['武器', '局数'] + [f'L{i + 1}通关率' for i in range(MAX_LEVEL)] + \
+                 [f'L{i + 1}见Boss(秒)' for i in range(MAX_LEVEL)] + ['平均受伤', '平均得分']
+        rows = [header]
+        for weapon_type in sorted(self.groups):
+            group = self.groups[weapon_type]
+            sessions = group['sessions']
+            row = [WEAPON_NAMES[weapon_type], str(sessions)]
+            row += [f"{cleared / sessions:.1%}" for cleared in group['cleared']]
+            for boss_ticks in group['boss_ticks']:
+                if boss_ticks:
+                    row.append(f"{sum(boss_ticks) / len(boss_ticks) / 60:.1f}")
+                else:
+                    row.append('-')
+            row.append(f"{group['damage'] / sessions:.2f}")
+            row.append(f"{group['score'] / sessions:.0f}")
+            rows.append(row)
+
+        widths = [max(_display_width(row[i]) for row in rows) for i in range(len(header))]
+        lines = []
+        for row in rows:
+            cells = [cell + ' ' * (width - _display_width(cell)) for cell, width in zip(row, widths)]
+            lines.append('  '.join(cells))
+        return '\n'.join(lines)
+
+
+def _display_width(text):
+    """终端显示宽度（中文字符占两格）"""
+    return sum(2 if ord(ch) > 0x2e80 else 1 for ch in text)
+
+
+def run_batch(sessions, workers=None, base_seed=0, weapons=None, max_ticks=60 * 60 * 10,
+              progress=True, world_size=None):
+    """用进程池并行运行多局模拟
+    Args:
+        sessions: 总局数
+        workers: 进程数，默认使用全部CPU核心
+        base_seed: 基础随机种子
+        weapons: 参与统计的武器类型列表，按局编号轮流使用
+        max_ticks: 每局最大帧数
+        progress: 是否打印进度
+        world_size: 游戏世界大小 (宽, 高)，默认使用当前的world配置
+    Returns:
+        (StatsAggregator, 每分钟局数)
+    """
+    workers = workers or os.cpu_count() or 1
+    weapons = weapons or list(range(len(WEAPON_NAMES)))
+    tasks = [(i, session_seed(base_seed, i), weapons[i % len(weapons)], max_ticks)
+             for i in range(sessions)]
+    aggregator = StatsAggregator()
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers, initializer=_init_worker,
+                              initargs=(base_seed, world_size or world.size)) as pool:
+        # 每局结束即流式返回并汇总
+        for done, stats in enumerate(pool.imap_unordered(run_session, tasks), 1):
+            aggregator.add(stats)
+            if progress and (done % max(1, sessions // 20) == 0 or done == sessions):
+                elapsed = time.perf_counter() - start
+                print(f"[{done}/{sessions}] {done / elapsed * 60:.1f} 局/分钟", flush=True)
+    elapsed = time.perf_counter() - start
+    return aggregator, sessions / elapsed * 60
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量自动模拟游戏，统计平衡性数据')
+    parser.add_argument('--sessions', type=int, default=100, help='模拟局数')
+    parser.add_argument('--workers', type=int, default=None, help='进程数，默认使用全部CPU核心')
+    parser.add_argument('--seed', type=int, default=0, help='基础随机种子')
+    parser.add_argument('--weapons', type=int, nargs='+', default=None,
+                        choices=range(len(WEAPON_NAMES)), help='参与统计的武器类型')
+    parser.add_argument('--max-ticks', type=int, default=60 * 60 * 10, help='每局最大帧数')
+    parser.add_argument('--resolution', type=parse_size, default=world.size, metavar='WxH',
+                        help='游戏世界大小（用于测试更大或更小的场地）')
+    args = parser.parse_args()
+
+    aggregator, throughput = run_batch(args.sessions, args.workers, args.seed,
+                                       args.weapons, args.max_ticks, world_size=args.resolution)
+    print()
+    print(aggregator.summary_table())
+    print()
+    print(f"吞吐量: {throughput:.1f} 局/分钟")
+
+
+if __name__ == "__main__":
+    main()
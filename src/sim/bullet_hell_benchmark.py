@@ -0,0 +1,121 @@
+import os
+import sys
+import time
+import random
+import argparse
+import contextlib
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.sim.headless import init_headless, HeadlessGame
+from src.sim.autoplay import AutoPlayBot
+
+FRAME_BUDGET_MS = 1000 / 60  # 60 FPS的帧预算
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_stress(target=10000, frames=600, warmup_limit=1800, level=3, weapon=2, seed=0, draw=True):
+    """弹幕地狱压力场景：自动操作的玩家（不会死亡）对不会被击败的Boss开火，
+    场上子弹数达到目标后测量每帧更新和绘制的耗时
+    Args:
+        target: 开始测量前需要达到的敌人子弹数
+        frames: 测量的帧数
+        warmup_limit: 等待子弹数达到目标的最多帧数
+        level: Boss关卡
+        weapon: 玩家武器类型（见Player.weapon_type）
+        seed: 随机种子
+        draw: 是否每帧绘制
+    Returns:
+        统计数据字典
+    """
+    from src.scenes.game_scene import GameScene
+
+    screen = init_headless()
+    game = HeadlessGame(screen=screen if draw else None, mode='bullet_hell')
+    random.seed(seed)
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        scene = GameScene(game)
+        scene.current_level = level
+        scene.player.hp = 10 ** 6  # 不让玩家死亡，持续测量
+        scene.player.weapon_type = weapon
+        while not scene.boss_spawned:
+            scene.update()
+        for boss in scene.enemies.bosses:
+            boss.hp = boss.max_hp = 10 ** 9
+    field = scene.bullet_field
+    bot = AutoPlayBot()
+
+    warmup = 0
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        while len(field) < target and warmup < warmup_limit:
+            scene.update(bot.act(scene))
+            warmup += 1
+    reached = len(field) >= target
+
+    update_times = []
+    draw_times = []
+    bullet_counts = []
+    player_bullets = 0
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        for _ in range(frames):
+            start = time.perf_counter()
+            scene.update(bot.act(scene))
+            update_times.append((time.perf_counter() - start) * 1000)
+            if draw:
+                start = time.perf_counter()
+                game.draw_scene(scene)
+                draw_times.append((time.perf_counter() - start) * 1000)
+            bullet_counts.append(len(field))
+            player_bullets = max(player_bullets, len(scene.bullets))
+    frame_times = [u + d for u, d in zip(update_times, draw_times)] if draw else update_times
+    return {
+        'warmup': warmup,
+        'reached': reached,
+        'bullets_min': min(bullet_counts),
+        'bullets_mean': sum(bullet_counts) / frames,
+        'bullets_max': max(bullet_counts),
+        'player_bullets': player_bullets,
+        'update_ms': sum(update_times) / frames,
+        'draw_ms': sum(draw_times) / frames if draw else 0.0,
+        'p50_ms': _percentile(frame_times, 0.50),
+        'p95_ms': _percentile(frame_times, 0.95),
+        'p99_ms': _percentile(frame_times, 0.99),
+        'max_ms': max(frame_times),
+        'over_budget': sum(1 for t in frame_times if t > FRAME_BUDGET_MS),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='弹幕地狱压力测试：上万发敌人子弹时的帧耗时，P99不超过60FPS帧预算为通过')
+    parser.add_argument('--bullets', type=int, default=10000, help='开始测量前需要达到的敌人子弹数')
+    parser.add_argument('--frames', type=int, default=600, help='测量的帧数')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--no-draw', action='store_true', help='只模拟不绘制')
+    args = parser.parse_args()
+
+    r = run_stress(args.bullets, args.frames, seed=args.seed, draw=not args.no_draw)
+    print(f"预热 {r['warmup']} 帧后测量 {args.frames} 帧")
+    print(f"敌人子弹: 最少 {r['bullets_min']}  平均 {r['bullets_mean']:.0f}  最多 {r['bullets_max']}"
+          f"  玩家子弹峰值: {r['player_bullets']}")
+    print(f"每帧更新 {r['update_ms']:.3f}ms  绘制 {r['draw_ms']:.3f}ms")
+    print(f"帧耗时 P50 {r['p50_ms']:.3f}ms  P95 {r['p95_ms']:.3f}ms  P99 {r['p99_ms']:.3f}ms"
+          f"  最大 {r['max_ms']:.3f}ms  超过{FRAME_BUDGET_MS:.2f}ms的帧: {r['over_budget']}")
+
+    failures = []
+    if not r['reached']:
+        failures.append(f"{r['warmup']}帧内子弹数没有达到{args.bullets}")
+    if r['p99_ms'] > FRAME_BUDGET_MS:
+        failures.append(f"P99帧耗时超过{FRAME_BUDGET_MS:.2f}ms")
+    if failures:
+        print('FAIL: ' + '；'.join(failures))
+        sys.exit(1)
+    print('PASS')
+
+
+if __name__ == "__main__":
+    main()
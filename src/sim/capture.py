@@ -0,0 +1,171 @@
+import os
+import sys
+import time
+import random
+import argparse
+import contextlib
+import numpy as np
+import pygame
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.sim.headless import init_headless, HeadlessGame
+
+# 灰度权重（整数近似 0.299R + 0.587G + 0.114B，总和256）
+GRAY_WEIGHTS = (77, 150, 29)
+
+
+@contextlib.contextmanager
+def frame_view(surface):
+    """以零拷贝方式访问表面像素
+    返回的数组形状为(宽, 高, 3)，直接引用表面内存；
+    在with块内表面处于锁定状态，不能对它blit。
+    """
+    pixels = pygame.surfarray.pixels3d(surface)
+    try:
+        yield pixels
+    finally:
+        del pixels
+
+
+class FrameCapture:
+    """帧观测采集 - 从表面像素视图生成缩小、灰度和叠帧观测
+    所有输出都原地写入预分配的缓冲区，每帧不分配新数组。
+    """
+    def __init__(self, surface, scale=1, grayscale=False, stack=1, frames=None):
+        """初始化帧采集
+        Args:
+            surface: 采集的表面（通常是显示表面）
+            scale: 缩小倍数（按步长取样），1表示原始分辨率
+            grayscale: 是否输出灰度
+            stack: 叠帧数量
+            frames: 可选的外部叠帧缓冲区（例如批量环境观测数组的一部分），
+                    形状必须与frame_shape()一致
+        """
+        self.surface = surface
+        self.scale = scale
+        self.grayscale = grayscale
+        self.stack = stack
+        width, height = surface.get_size()
+        self.width = (width + scale - 1) // scale
+        self.height = (height + scale - 1) // scale
+
+        # 叠帧环形缓冲区，每帧直接写入其中一格
+        shape = self.frame_shape(surface.get_size(), scale, grayscale, stack)
+        self.frames = np.zeros(shape, dtype=np.uint8) if frames is None else frames
+        self.index = stack - 1  # 最新一帧所在的格
+        self._gray_acc = np.zeros((self.width, self.height), dtype=np.uint16) if grayscale else None
+        self._gray_tmp = np.zeros((self.width, self.height), dtype=np.uint16) if grayscale else None
+        # 最新帧在第i格时，按旧到新排列的格序号
+        self._orders = (np.arange(stack)[None, :] + np.arange(stack)[:, None] + 1) % stack
+
+    @staticmethod
+    def frame_shape(size, scale=1, grayscale=False, stack=1):
+        """叠帧缓冲区的形状 (叠帧数, 宽, 高[, 3])"""
+        width = (size[0] + scale - 1) // scale
+        height = (size[1] + scale - 1) // scale
+        return (stack, width, height) if grayscale else (stack, width, height, 3)
+
+    def capture(self):
+        """采集一帧写入叠帧缓冲区
+        Returns:
+            最新一帧（缓冲区中的视图）
+        """
+        self.index = (self.index + 1) % self.stack
+        out = self.frames[self.index]
+        with frame_view(self.surface) as pixels:
+            src = pixels[::self.scale, ::self.scale] if self.scale > 1 else pixels
+            if self.grayscale:
+                acc = self._gray_acc
+                tmp = self._gray_tmp
+                np.multiply(src[..., 0], GRAY_WEIGHTS[0], out=acc, dtype=np.uint16)
+                np.multiply(src[..., 1], GRAY_WEIGHTS[1], out=tmp, dtype=np.uint16)
+                acc += tmp
+                np.multiply(src[..., 2], GRAY_WEIGHTS[2], out=tmp, dtype=np.uint16)
+                acc += tmp
+                acc >>= 8
+                np.copyto(out, acc, casting='unsafe')
+            else:
+                np.copyto(out, src)
+        return out
+
+    def latest(self):
+        """最新一帧（缓冲区中的视图）"""
+        return self.frames[self.index]
+
+    def stacked(self, out=None):
+        """按时间顺序（旧到新）排列的叠帧
+        Args:
+            out: 可选的预分配输出数组，形状与frames相同
+        Returns:
+            叠帧数组
+        """
+        return np.take(self.frames, self._orders[self.index], axis=0, out=out)
+
+    def clear(self):
+        """清空叠帧（新一局开始时调用）"""
+        self.frames.fill(0)
+        self.index = self.stack - 1
+
+
+def benchmark(frames, configs, seed=0):
+    """测量不同分辨率下的采集耗时
+    Args:
+        frames: 采集帧数
+        configs: (名称, scale, grayscale, stack)列表
+    Returns:
+        (名称, 每帧毫秒)列表，第一项为pygame.image.tostring基准
+    """
+    from src.scenes.game_scene import GameScene
+
+    screen = pygame.display.get_surface() or init_headless()
+    game = HeadlessGame(screen=screen)
+    random.seed(seed)
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        scene = GameScene(game)
+        for _ in range(300):
+            scene.update()
+    game.draw_scene(scene)
+
+    results = []
+    start = time.perf_counter()
+    for _ in range(frames):
+        pygame.image.tostring(screen, 'RGB')
+    results.append(('tostring 基准', (time.perf_counter() - start) / frames * 1000))
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        with frame_view(screen) as pixels:
+            pixels[0, 0]
+    results.append(('零拷贝视图', (time.perf_counter() - start) / frames * 1000))
+
+    for name, scale, grayscale, stack in configs:
+        capture = FrameCapture(screen, scale, grayscale, stack)
+        start = time.perf_counter()
+        for _ in range(frames):
+            capture.capture()
+        results.append((f'{name} {capture.width}x{capture.height}',
+                        (time.perf_counter() - start) / frames * 1000))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='帧观测采集性能测试')
+    parser.add_argument('--frames', type=int, default=300, help='每种配置采集的帧数')
+    args = parser.parse_args()
+
+    configs = [
+        ('RGB 原始分辨率', 1, False, 1),
+        ('RGB 1/2', 2, False, 1),
+        ('RGB 1/4', 4, False, 4),
+        ('灰度 1/2', 2, True, 1),
+        ('灰度 1/4 叠4帧', 4, True, 4),
+        ('灰度 1/8 叠4帧', 8, True, 4),
+    ]
+    for name, ms in benchmark(args.frames, configs):
+        print(f"{name:<28} {ms:.3f} 毫秒/帧")
+
+
+if __name__ == "__main__":
+    main()
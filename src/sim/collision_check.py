@@ -0,0 +1,79 @@
+import os
+import sys
+import argparse
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.objects.collision import swept_aabb, swept_hit, aabb_overlap
+
+
+class _Box:
+    """测试用的矩形对象（swept_hit需要的属性）"""
+    def __init__(self, x, y, width, height, prev_x=None, prev_y=None):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.prev_x = x if prev_x is None else prev_x
+        self.prev_y = y if prev_y is None else prev_y
+
+
+def _fast_bullet():
+    """高速子弹（5x10，一帧向上移动200像素）穿过1像素高的横条，两端位置都不重叠"""
+    bullet = _Box(50, 0, 5, 10, prev_y=200)
+    target = _Box(0, 100, 200, 1)
+    assert not aabb_overlap(50, 200, 5, 10, 0, 100, 200, 1)
+    assert not aabb_overlap(50, 0, 5, 10, 0, 100, 200, 1)
+    return swept_hit(bullet, target)
+
+
+# (名称, 计算碰撞时间的函数, 期望结果)，期望为None表示不碰撞
+CASES = [
+    ('高速子弹穿过1像素薄目标', _fast_bullet, 0.495),
+    ('高速子弹穿过2像素薄目标（swept_aabb）',
+     lambda: swept_aabb(50, 200, 50, 0, 5, 10, 0, 99, 200, 2), 0.495),
+    ('从薄目标旁边擦过', lambda: swept_aabb(205, 200, 205, 0, 5, 10, 0, 100, 200, 1), None),
+    ('斜向擦过目标的角', lambda: swept_aabb(0, 0, 100, 100, 5, 5, 60, 0, 10, 30), None),
+    ('上一帧已经重叠', lambda: swept_aabb(10, 10, 10, -200, 5, 10, 0, 12, 50, 2), 0.0),
+    ('完全静止且重叠', lambda: swept_aabb(10, 10, 10, 10, 5, 5, 12, 12, 5, 5), 0.0),
+    ('水平移动穿过2像素宽的竖条', lambda: swept_aabb(0, 100, 300, 100, 10, 5, 150, 90, 2, 30), 140 / 300),
+    ('水平移动，y轴静止但在目标范围外', lambda: swept_aabb(0, 130, 300, 130, 10, 5, 150, 90, 2, 30), None),
+    ('竖直移动，x轴静止且在目标范围内', lambda: swept_aabb(100, 0, 100, 50, 4, 4, 90, 30, 20, 2), 26 / 50),
+    ('移动结束时刚好贴上目标（不算碰撞）', lambda: swept_aabb(0, 0, 0, 90, 5, 10, 0, 100, 50, 5), None),
+]
+
+
+def run_cases(tolerance=1e-9):
+    """执行所有用例
+    Returns:
+        [(名称, 结果, 期望, 是否通过), ...]
+    """
+    results = []
+    for name, compute, expected in CASES:
+        try:
+            result = compute()
+        except AssertionError:
+            results.append((name, '用例前提不成立', expected, False))
+            continue
+        if expected is None:
+            passed = result is None
+        else:
+            passed = result is not None and abs(result - expected) <= tolerance
+        results.append((name, result, expected, passed))
+    return results
+
+
+def main():
+    argparse.ArgumentParser(description='扫掠碰撞检测的用例检查：高速子弹穿过薄目标、擦过、初始重叠、单轴静止等').parse_args()
+
+    failed = 0
+    for name, result, expected, passed in run_cases():
+        print(f"{'通过' if passed else '失败'}  {name}: 结果 {result}，期望 {expected}")
+        failed += not passed
+    print(f'{len(CASES) - failed}/{len(CASES)} 通过')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
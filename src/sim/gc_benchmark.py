@@ -0,0 +1,90 @@
+import os
+import sys
+import time
+import random
+import argparse
+import contextlib
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.sim.headless import init_headless, HeadlessGame
+from src.sim.autoplay import AutoPlayBot
+from src.gc_policy import GCPolicy, GC_MODES
+from src.config import GAME_MODES
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_policy(gc_mode, frames=3600, mode='normal', seed=0, draw=True):
+    """按指定回收策略自动操作玩一局（玩家不会死亡，会经历Boss战和过关），测量帧耗时和回收停顿
+    Args:
+        gc_mode: 垃圾回收策略
+        frames: 运行帧数
+        mode: 游戏模式
+        seed: 随机种子
+        draw: 是否每帧绘制
+    Returns:
+        (统计数据字典, GCPolicy)
+    """
+    from src.scenes.game_scene import GameScene
+
+    screen = init_headless()
+    game = HeadlessGame(screen=screen if draw else None, mode=mode)
+    random.seed(seed)
+    policy = GCPolicy(gc_mode)
+    bot = AutoPlayBot()
+    frame_times = []
+    playing_times = []
+    try:
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            scene = GameScene(game)
+            scene.player.hp = 10 ** 6
+            policy.freeze()
+            for _ in range(frames):
+                start = time.perf_counter()
+                scene.update(bot.act(scene))
+                if draw:
+                    game.draw_scene(scene)
+                policy.set_state(scene.game_state)
+                policy.end_frame(game.profiler)
+                elapsed = (time.perf_counter() - start) * 1000
+                frame_times.append(elapsed)
+                if scene.game_state == 'playing':
+                    playing_times.append(elapsed)
+    finally:
+        policy.close()
+    times = playing_times or frame_times
+    return {
+        'playing_frames': len(playing_times),
+        'mean_ms': sum(times) / len(times),
+        'p99_ms': _percentile(times, 0.99),
+        'max_ms': max(times),
+        'level': scene.current_level,
+    }, policy
+
+
+def main():
+    parser = argparse.ArgumentParser(description='比较各垃圾回收策略在游戏进行中的帧耗时和回收停顿')
+    parser.add_argument('--frames', type=int, default=3600, help='每种策略运行的帧数')
+    parser.add_argument('--mode', choices=GAME_MODES, default='normal', help='游戏模式')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--no-draw', action='store_true', help='只模拟不绘制')
+    parser.add_argument('--policies', nargs='+', choices=GC_MODES, default=list(GC_MODES), help='要比较的策略')
+    args = parser.parse_args()
+
+    print(f"{'策略':<10}{'进行中帧数':>10}{'平均ms':>9}{'P99':>8}{'最大':>8}"
+          f"{'第0/1/2代回收':>16}{'最长停顿ms':>12}{'显式回收':>9}{'显式ms':>9}{'永久代':>9}")
+    for gc_mode in args.policies:
+        r, policy = run_policy(gc_mode, args.frames, args.mode, args.seed, not args.no_draw)
+        counts = '/'.join(str(c) for c in policy.counts)
+        print(f"{gc_mode:<12}{r['playing_frames']:>12}{r['mean_ms']:>11.3f}{r['p99_ms']:>10.3f}{r['max_ms']:>10.3f}"
+              f"{counts:>19}{policy.max_pause:>15.3f}{policy.explicit_count:>11}{policy.explicit_time:>12.2f}"
+              f"{policy.frozen:>11}")
+
+
+if __name__ == "__main__":
+    main()
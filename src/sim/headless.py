@@ -0,0 +1,46 @@
+import os
+import pygame
+from src.debug.profiler import FrameProfiler
+from src.config import world
+
+
+def init_headless(width=None, height=None):
+    """初始化无头（不显示窗口）的pygame环境
+    使用SDL的dummy视频/音频驱动，仍然创建显示表面，
+    这样Boss和玩家图片的convert_alpha()可以正常工作。
+    Args:
+        width: 显示表面宽度，默认为world的逻辑宽度
+        height: 显示表面高度，默认为world的逻辑高度
+    Returns:
+        显示表面
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    # SDL默认会接管SIGTERM/SIGINT，导致进程池无法结束工作进程
+    os.environ.setdefault('SDL_NO_SIGNAL_HANDLERS', '1')
+    pygame.init()
+    return pygame.display.set_mode((width or world.width, height or world.height))
+
+
+class HeadlessGame:
+    """无头游戏对象 - 提供GameScene所需的最小接口，不运行主循环"""
+    def __init__(self, screen_width=None, screen_height=None, screen=None, rewind_frames=0, mode='normal'):
+        """初始化无头游戏对象
+        Args:
+            screen_width: 屏幕宽度，默认为world的逻辑宽度
+            screen_height: 屏幕高度，默认为world的逻辑高度
+            screen: 绘制目标表面，默认为None（只模拟不绘制）
+            rewind_frames: 倒带缓冲保存的帧数，默认为0（批量模拟不需要倒带）
+            mode: 游戏模式，'normal' 或 'bullet_hell'
+        """
+        self.screen_width = screen_width or world.width
+        self.screen_height = screen_height or world.height
+        self.screen = screen
+        self.rewind_frames = rewind_frames
+        self.mode = mode
+        self.profiler = FrameProfiler()
+
+    def draw_scene(self, scene):
+        """在screen上绘制一帧场景（与Game.draw的游戏画面部分相同）"""
+        self.screen.fill((0, 0, 0))
+        scene.draw(self.screen)
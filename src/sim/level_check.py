@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import argparse
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.scenes.level_data import (LEVELS_DIR, LevelDataError, SpawnTimeline, load_level, level_path,
+                                   _level_cache)
+from src.config import world
+
+
+def check_level(level, directory=LEVELS_DIR, repeats=100):
+    """校验一个关卡数据文件，并测量加载和编排耗时
+    Args:
+        level: 关卡编号
+        directory: 关卡数据目录
+        repeats: 测量重复次数
+    Returns:
+        统计数据字典
+    Raises:
+        LevelDataError: 关卡数据错误
+    """
+    path = level_path(level, directory)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        _level_cache.pop(path, None)  # 不使用缓存，测量读取+解析+校验
+        data = load_level(level, directory)
+    load_ms = (time.perf_counter() - start) * 1000 / repeats
+
+    start = time.perf_counter()
+    for seed in range(repeats):
+        timeline = SpawnTimeline(data, seed, world.width)
+    compile_ms = (time.perf_counter() - start) * 1000 / repeats
+
+    # 跑完一个周期，统计每帧推进的耗时和生成的敌人数
+    timeline = SpawnTimeline(data, 0, world.width)
+    spawned = 0
+    start = time.perf_counter()
+    for _ in range(data.cycle):
+        batch = timeline.advance()
+        if batch is not None:
+            spawned += len(batch)
+    advance_us = (time.perf_counter() - start) * 1e6 / data.cycle
+    return {
+        'boss_kills': data.boss_kills,
+        'batches': len(timeline.ticks),
+        'spawned': spawned,
+        'load_ms': load_ms,
+        'compile_ms': compile_ms,
+        'advance_us': advance_us,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='校验关卡数据文件并测量加载、编排和每帧推进的耗时')
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 2, 3], help='要检查的关卡')
+    parser.add_argument('--dir', default=LEVELS_DIR, help='关卡数据目录')
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'关卡':<6}{'Boss击杀数':>10}{'批次/周期':>10}{'敌人/周期':>10}{'加载ms':>9}{'编排ms':>9}{'每帧us':>9}")
+    for level in args.levels:
+        try:
+            r = check_level(level, args.dir)
+        except LevelDataError as e:
+            print(f"{level:<8}错误: {e}")
+            failed = True
+            continue
+        print(f"{level:<8}{r['boss_kills']:>10}{r['batches']:>12}{r['spawned']:>12}"
+              f"{r['load_ms']:>11.3f}{r['compile_ms']:>11.3f}{r['advance_us']:>11.3f}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import os
+import sys
+import time
+import random
+import argparse
+import contextlib
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.sim.headless import init_headless, HeadlessGame
+from src.sim.autoplay import AutoPlayBot
+from src.config import world
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def bench_emit(repeats=200):
+    """每个弹幕图案完整发射一次（所有帧）的耗时
+    Returns:
+        [(图案名, 子弹数, 每发微秒), ...]
+    """
+    from src.objects.enemy import Boss
+    from src.objects.patterns import COMPILED_PATTERNS
+
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        boss = Boss(world.width // 2 - 40, 50, 3)
+    target = (world.width / 2, world.height - 50)
+    results = []
+    for name, pattern in COMPILED_PATTERNS.items():
+        start = time.perf_counter()
+        for _ in range(repeats):
+            boss.pattern = name
+            boss.pattern_tick = 0
+            while boss.pattern is not None:
+                boss.emit_pattern(target)
+        elapsed = time.perf_counter() - start
+        results.append((name, pattern.bullet_count, elapsed * 1e6 / (repeats * pattern.bullet_count)))
+    return results
+
+
+def bench_boss_fight(level=3, ticks=1800, seed=0, draw=True, action_delay=None):
+    """自动操作与指定关卡的Boss战斗，测量每帧更新和绘制耗时
+    Args:
+        level: Boss关卡
+        ticks: 运行帧数
+        seed: 随机种子
+        draw: 是否每帧绘制
+        action_delay: Boss行动间隔（帧），默认使用Boss自己的设置；越小弹幕越密集
+    Returns:
+        统计数据字典
+    """
+    from src.scenes.game_scene import GameScene
+    from src.objects.enemy import Boss
+
+    screen = pygame_screen() if draw else None
+    game = HeadlessGame(screen=screen)
+    random.seed(seed)
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        scene = GameScene(game)
+        scene.player.hp = 10 ** 6  # 不让玩家死亡，持续测量
+        while scene.game_state != 'playing':
+            scene.update()
+        scene.current_level = level
+        boss = Boss(world.width // 2 - 40, 50, level)
+        boss.hp = boss.max_hp = 10 ** 6
+        if action_delay is not None:
+            boss.action_delay = action_delay
+        scene.enemies.append(boss)
+        scene.boss_spawned = True
+    bot = AutoPlayBot()
+    update_times = []
+    draw_times = []
+    peak = 0
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        for _ in range(ticks):
+            start = time.perf_counter()
+            scene.update(bot.act(scene))
+            update_times.append((time.perf_counter() - start) * 1000)
+            if draw:
+                start = time.perf_counter()
+                game.draw_scene(scene)
+                draw_times.append((time.perf_counter() - start) * 1000)
+            peak = max(peak, len(scene.enemy_bullets))
+    frame_times = [u + d for u, d in zip(update_times, draw_times)] if draw else update_times
+    return {
+        'update_ms': sum(update_times) / ticks,
+        'draw_ms': sum(draw_times) / ticks if draw else 0.0,
+        'p99_ms': _percentile(frame_times, 0.99),
+        'max_ms': max(frame_times),
+        'over_budget': sum(1 for t in frame_times if t > 1000 / 60),
+        'peak_bullets': peak,
+    }
+
+
+def pygame_screen():
+    import pygame
+    return pygame.display.get_surface() or init_headless()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Boss弹幕图案的发射耗时和Boss战帧耗时')
+    parser.add_argument('--ticks', type=int, default=1800, help='每场Boss战运行的帧数')
+    parser.add_argument('--no-draw', action='store_true', help='只模拟不绘制')
+    args = parser.parse_args()
+
+    init_headless()
+    print(f"{'图案':<16}{'子弹数':>6}{'每发us':>9}")
+    for name, count, per_bullet in bench_emit():
+        print(f"{name:<16}{count:>8}{per_bullet:>11.2f}")
+
+    print()
+    print(f"{'Boss战':<16}{'更新ms':>8}{'绘制ms':>8}{'P99':>7}{'最大':>7}{'超16.7ms帧':>11}{'子弹峰值':>8}")
+    for level, delay in ((1, None), (3, None), (3, 30)):
+        r = bench_boss_fight(level, args.ticks, draw=not args.no_draw, action_delay=delay)
+        label = f'第{level}关' + (f' 间隔{delay}' if delay else '')
+        print(f"{label:<14}{r['update_ms']:>10.3f}{r['draw_ms']:>10.3f}{r['p99_ms']:>9.3f}{r['max_ms']:>9.3f}"
+              f"{r['over_budget']:>11}{r['peak_bullets']:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import os
+import sys
+import time
+import random
+import argparse
+import contextlib
+import pygame
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.sim.headless import init_headless, HeadlessGame
+from src.sim.autoplay import AutoPlayBot
+from src.config import world
+
+
+def _make_canvas(backend, driver):
+    """创建绘制目标
+    Args:
+        backend: 'surface' 或 'sdl2'
+        driver: sdl2后端的SDL渲染驱动
+    Returns:
+        (绘制目标, 显示一帧的函数)
+    """
+    if backend == 'surface':
+        screen = pygame.Surface(world.size).convert()
+        return screen, lambda: None
+    from src.render.texture_canvas import TextureCanvas, create_renderer
+    window, renderer = create_renderer('render_benchmark', world.size, driver)
+    canvas = TextureCanvas(window, renderer, world.size)
+    return canvas, canvas.present
+
+
+def bench_autoplay(backend, driver=None, frames=1200, seed=0):
+    """自动操作玩一局，每帧绘制，只统计绘制耗时
+    Returns:
+        统计数据字典
+    """
+    from src.scenes.game_scene import GameScene
+
+    canvas, present = _make_canvas(backend, driver)
+    game = HeadlessGame(screen=canvas)
+    random.seed(seed)
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        scene = GameScene(game)
+    bot = AutoPlayBot()
+    times = []
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        for _ in range(frames):
+            scene.update(bot.act(scene))
+            start = time.perf_counter()
+            game.draw_scene(scene)
+            present()
+            times.append((time.perf_counter() - start) * 1000)
+    return _stats(canvas, times)
+
+
+def bench_crowded(backend, driver=None, frames=300, seed=0):
+    """拥挤的Boss战场景（数百发子弹）反复绘制同一帧
+    Returns:
+        统计数据字典
+    """
+    from src.sim.save_check import crowded_boss_scene
+
+    canvas, present = _make_canvas(backend, driver)
+    scene = crowded_boss_scene(seed)
+    game = HeadlessGame(screen=canvas)
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        game.draw_scene(scene)
+        present()
+        times.append((time.perf_counter() - start) * 1000)
+    return _stats(canvas, times)
+
+
+def _stats(canvas, times):
+    ordered = sorted(times)
+    return {
+        'frame_ms': sum(times) / len(times),
+        'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        'uploads': getattr(canvas, 'uploads', 0),
+        'draw_calls': getattr(canvas, 'draw_calls', 0) / len(times),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='渲染后端对比：CPU表面绘制与SDL渲染器纹理绘制')
+    parser.add_argument('--frames', type=int, default=1200, help='自动操作场景绘制的帧数')
+    parser.add_argument('--driver', default='software',
+                        help='sdl2后端的SDL渲染驱动（无头环境只能使用software）')
+    args = parser.parse_args()
+
+    # 显示模式只用于convert_alpha()，sdl2后端另外创建渲染窗口
+    init_headless()
+    print(f"{'场景':<10}{'后端':<10}{'绘制ms':>8}{'P95':>8}{'纹理上传':>8}{'绘制调用/帧':>10}")
+    for name, bench, frames in (('自动操作', bench_autoplay, args.frames), ('拥挤Boss战', bench_crowded, 300)):
+        for backend in ('surface', 'sdl2'):
+            r = bench(backend, args.driver, frames)
+            print(f"{name:<10}{backend:<10}{r['frame_ms']:>10.3f}{r['p95_ms']:>9.3f}"
+                  f"{r['uploads']:>10}{r['draw_calls']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
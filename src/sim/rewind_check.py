@@ -0,0 +1,173 @@
+import os
+import sys
+import time
+import random
+import argparse
+import contextlib
+import pygame
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.sim.headless import init_headless
+from src.sim.autoplay import AutoPlayBot
+from src.sim.save_check import _new_scene, crowded_boss_scene
+from src.scenes.rewind import RewindBuffer
+
+
+def check_rewind(seed=0, weapon_type=0, warmup=900, steps=300):
+    """倒带测试：倒回steps帧后状态应与当时保存的一致，按原输入重放后应回到倒带前的状态
+    Args:
+        seed: 随机种子
+        weapon_type: 武器类型
+        warmup: 倒带前运行的帧数
+        steps: 倒回的帧数
+    Returns:
+        (是否一致, 倒带缓冲统计字典)
+    """
+    from src.scenes.savegame import encode_scene
+
+    random.seed(seed)
+    scene = _new_scene(weapon_type, rewind_frames=600)
+    buffer = scene.rewind_buffer
+    bot = AutoPlayBot()
+    states = []  # 连续保存到缓冲的最近若干帧的状态
+    inputs = []  # 对应帧使用的按键
+    capture_times = []
+    raw_bytes = []
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        for _ in range(warmup):
+            keys = bot.act(scene).copy()
+            captures = buffer.captures
+            scene.update(keys)
+            if buffer.captures == captures:
+                # 动画等未保存的帧：重放无法跨过它们，重新开始记录
+                states.clear()
+                inputs.clear()
+                continue
+            state = encode_scene(scene)
+            states.append(state)
+            inputs.append(keys)
+            capture_times.append(buffer.capture_time)
+            raw_bytes.append(len(state))
+
+        steps = min(steps, buffer.frames - 1, len(states) - 1)
+        target = encode_scene(scene)
+        # 第一次倒带恢复的是当前帧本身
+        for _ in range(steps + 1):
+            buffer.rewind(scene)
+        if encode_scene(scene) != states[-steps - 1]:
+            return False, {}
+        for keys in inputs[len(inputs) - steps:]:
+            scene.update(keys)
+        ok = encode_scene(scene) == target
+
+    window = raw_bytes[-buffer.frames:] if buffer.frames else []
+    stats = {
+        'frames': buffer.frames,
+        'steps': steps,
+        'capture_ms': sum(capture_times) / max(1, len(capture_times)),
+        'capture_max_ms': max(capture_times, default=0.0),
+        'buffer_kb': buffer.bytes / 1024,
+        'raw_kb': sum(window) / 1024,
+    }
+    return ok, stats
+
+
+def check_level_transition(seed=3, hold=60, frame_limit=30000):
+    """跨关卡倒带测试：自动操作通过第1关后，在第2关的介绍动画中和第2关开始后按住退格键，
+    不应回到第1关（倒带缓冲在关卡完成时清空，动画期间不倒带）
+    Args:
+        seed: 随机种子
+        hold: 每次按住退格键的帧数
+        frame_limit: 等待进入第2关的最多帧数
+    Returns:
+        (是否通过, 说明)
+    """
+    random.seed(seed)
+    scene = _new_scene(rewind_frames=600)
+    scene.player.hp = 10 ** 6  # 不让玩家死亡，保证能通过第1关
+    bot = AutoPlayBot()
+
+    def hold_backspace():
+        for _ in range(hold):
+            keys = bot.act(scene).copy()
+            keys.pressed.add(pygame.K_BACKSPACE)
+            scene.update(keys)
+
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        frames = 0
+        while not (scene.current_level == 2 and scene.game_state == 'level_intro'):
+            if frames >= frame_limit:
+                return False, f'{frame_limit}帧内没有进入第2关'
+            scene.update(bot.act(scene))
+            frames += 1
+        hold_backspace()
+        if scene.current_level != 2 or scene.game_state != 'level_intro':
+            return False, (f'介绍动画中倒带后: 第{scene.current_level}关，状态 {scene.game_state}，'
+                           f'Boss已出现 {scene.boss_spawned}')
+        while scene.game_state == 'level_intro':
+            scene.update(bot.act(scene))
+        hold_backspace()
+        if scene.current_level != 2:
+            return False, f'第2关开始后倒带回到了第{scene.current_level}关'
+    return True, f'第{frames}帧进入第2关介绍动画，倒带没有回到第1关'
+
+
+def measure_crowded_capture(frames=120):
+    """拥挤Boss战场景下每帧保存到倒带缓冲的耗时和内存
+    Returns:
+        (平均毫秒, 最大毫秒, 缓冲KB, 原始数据KB)
+    """
+    from src.scenes.savegame import encode_scene
+
+    scene = crowded_boss_scene()
+    buffer = RewindBuffer()
+    times = []
+    raw = 0
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        for _ in range(frames):
+            # 只推进实体，不生成新敌人也不做碰撞，保持场景拥挤
+            for group in (scene.bullets, scene.enemy_bullets, scene.explosions):
+                for obj in group:
+                    obj.update()
+            for enemy in scene.enemies:
+                enemy.update()
+            start = time.perf_counter()
+            buffer.capture(scene)
+            times.append((time.perf_counter() - start) * 1000)
+            raw += len(encode_scene(scene))
+    return sum(times) / len(times), max(times), buffer.bytes / 1024, raw / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='倒带缓冲的正确性检查和保存耗时/内存测量')
+    parser.add_argument('--seeds', type=int, default=3, help='测试的随机种子数')
+    parser.add_argument('--steps', type=int, default=300, help='倒回的帧数')
+    args = parser.parse_args()
+
+    init_headless()
+    failed = 0
+    for seed in range(args.seeds):
+        ok, stats = check_rewind(seed, seed % 7, steps=args.steps)
+        if not ok:
+            print(f"种子 {seed}: 倒带后状态不一致")
+            failed += 1
+            continue
+        print(f"种子 {seed}: 倒回{stats['steps']}帧并重放后一致；缓冲 {stats['frames']} 帧 "
+              f"{stats['buffer_kb']:.0f} KB（原始 {stats['raw_kb']:.0f} KB），"
+              f"保存 平均 {stats['capture_ms']:.3f} ms / 最大 {stats['capture_max_ms']:.3f} ms")
+
+    ok, message = check_level_transition()
+    print(f"跨关卡倒带: {'通过' if ok else '失败'}，{message}")
+    failed += not ok
+
+    avg_ms, max_ms, buffer_kb, raw_kb = measure_crowded_capture()
+    print(f"拥挤Boss战: 保存 平均 {avg_ms:.2f} ms / 最大 {max_ms:.2f} ms，"
+          f"缓冲 {buffer_kb:.0f} KB（原始 {raw_kb:.0f} KB）")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
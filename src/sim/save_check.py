@@ -0,0 +1,156 @@
+import os
+import sys
+import time
+import random
+import argparse
+import contextlib
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.sim.headless import init_headless, HeadlessGame
+from src.sim.autoplay import AutoPlayBot
+from src.config import world
+
+
+def _new_scene(weapon_type=0, rewind_frames=0):
+    """新建无头游戏场景（静默初始化日志）"""
+    from src.scenes.game_scene import GameScene
+
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        scene = GameScene(HeadlessGame(rewind_frames=rewind_frames))
+    scene.player.weapon_type = weapon_type
+    return scene
+
+
+def check_roundtrip(seed=0, weapon_type=0, warmup=600, ticks=1200, boss_level=None):
+    """存档往返测试：存档后继续运行，与读档后运行的结果逐帧比较
+    Args:
+        seed: 随机种子
+        weapon_type: 武器类型
+        warmup: 存档前运行的帧数（之后继续运行直到可以存档）
+        ticks: 存档后比较的帧数
+        boss_level: 不为None时在预热后放入这一关的Boss，并在它发射弹幕图案的中途存档
+    Returns:
+        (是否一致, 第一处不一致的帧号或None, 存档字节数)
+    """
+    from src.scenes.savegame import save_scene, load_scene, encode_scene, can_save
+    from src.objects.enemy import Boss
+
+    random.seed(seed)
+    scene = _new_scene(weapon_type)
+    bot = AutoPlayBot()
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        tick = 0
+        while tick < warmup or not can_save(scene):
+            scene.update(bot.act(scene))
+            tick += 1
+        if boss_level is not None:
+            scene.enemies.append(Boss(world.width // 2 - 40, 50, boss_level))
+            scene.boss_spawned = True
+            while not can_save(scene) or not any(boss.pattern_tick > 1 and boss.pattern
+                                                 for boss in scene.enemies.bosses):
+                scene.update(bot.act(scene))
+        data = save_scene(scene)
+
+        # 原场景继续运行，记录每帧的状态
+        expected = []
+        for _ in range(ticks):
+            scene.update(bot.act(scene))
+            expected.append((scene.game_state, encode_scene(scene)))
+
+        # 新场景读档后运行相同的帧数
+        random.seed(seed + 1)  # 打乱随机数状态，确认读档会恢复它
+        restored = _new_scene()
+        load_scene(restored, data)
+        bot = AutoPlayBot()
+        for i in range(ticks):
+            restored.update(bot.act(restored))
+            if (restored.game_state, encode_scene(restored)) != expected[i]:
+                return False, i, len(data)
+    return True, None, len(data)
+
+
+def crowded_boss_scene(seed=0, bullets=300, enemy_bullets=400, enemies=60, explosions=30):
+    """构造拥挤的Boss战场景，用于测量存档/读档耗时"""
+    from src.objects.enemy import Boss, Rock, EnemyPlane, Enemy
+    from src.objects.bullet import ShotgunBullet, HomingMissile, EnemyBullet, BossShotgunBullet
+    from src.objects.explosion import Explosion
+
+    random.seed(seed)
+    scene = _new_scene()
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        while not scene.game_state == 'playing':
+            scene.update()
+        scene.enemies.append(Boss(300, 50, 3))
+        scene.boss_spawned = True
+        kinds = (Rock, EnemyPlane, Enemy)
+        for i in range(enemies):
+            scene.enemies.append(kinds[i % 3](random.randint(0, world.width - 40), random.randint(0, 400), 3))
+        for i in range(bullets):
+            cls = HomingMissile if i % 2 else ShotgunBullet
+            scene.bullets.append(cls(random.randint(0, world.width), random.randint(0, world.height),
+                                     random.randint(-30, 30)))
+        for i in range(enemy_bullets):
+            if i % 2:
+                scene.enemy_bullets.append(BossShotgunBullet(random.randint(0, world.width), random.randint(0, world.height),
+                                                             random.randint(-60, 60)))
+            else:
+                scene.enemy_bullets.append(EnemyBullet(random.randint(0, world.width), random.randint(0, world.height)))
+        for i in range(explosions):
+            scene.explosions.append(Explosion(random.randint(0, world.width), random.randint(0, world.height), 40))
+    return scene
+
+
+def measure_save_time(scene, repeats=50):
+    """测量存档和读档的平均耗时
+    Returns:
+        (存档毫秒, 读档毫秒, 存档字节数)
+    """
+    from src.scenes.savegame import save_scene, load_scene
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        data = save_scene(scene)
+    save_ms = (time.perf_counter() - start) / repeats * 1000
+
+    target = _new_scene()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        for _ in range(repeats):
+            load_scene(target, data)
+    load_ms = (time.perf_counter() - start) / repeats * 1000
+    return save_ms, load_ms, len(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='存档往返测试和存档/读档耗时测量')
+    parser.add_argument('--seeds', type=int, default=5, help='往返测试的随机种子数')
+    parser.add_argument('--ticks', type=int, default=1200, help='存档后比较的帧数')
+    args = parser.parse_args()
+
+    init_headless()
+    failed = 0
+    for seed in range(args.seeds):
+        weapon_type = seed % 7
+        ok, tick, size = check_roundtrip(seed, weapon_type, ticks=args.ticks)
+        status = '一致' if ok else f'第{tick}帧不一致'
+        print(f"种子 {seed} 武器 {weapon_type}: {status}（存档 {size} 字节）")
+        failed += not ok
+    # 第3关Boss弹幕图案发射中途存档
+    for seed in range(args.seeds):
+        ok, tick, size = check_roundtrip(seed, 0, warmup=120, ticks=min(args.ticks, 600), boss_level=3)
+        status = '一致' if ok else f'第{tick}帧不一致'
+        print(f"种子 {seed} 第3关Boss弹幕中存档: {status}（存档 {size} 字节）")
+        failed += not ok
+
+    scene = crowded_boss_scene()
+    entities = len(scene.bullets) + len(scene.enemy_bullets) + len(scene.enemies) + len(scene.explosions)
+    save_ms, load_ms, size = measure_save_time(scene)
+    print(f"拥挤Boss战（{entities}个实体）: 存档 {save_ms:.2f} ms, 读档 {load_ms:.2f} ms, {size} 字节")
+    if failed or max(save_ms, load_ms) > 1000 / 60:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+import os
+import time
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+from src.scenes.entity_registry import EntityRegistry
+
+STREAM_MAGIC = 0x50594653  # 'PYFS'
+STREAM_VERSION = 1
+
+# 实体种类：敌人按注册表原型的顺序，之后是玩家子弹和敌人子弹
+KIND_NAMES = EntityRegistry.ARCHETYPES + ('bullet', 'enemy_bullet')
+KIND_BULLET = len(EntityRegistry.ARCHETYPES)
+KIND_ENEMY_BULLET = KIND_BULLET + 1
+_ARCHETYPE_KINDS = {name: i for i, name in enumerate(EntityRegistry.ARCHETYPES)}
+
+# 共享内存开头的全局头部
+HEADER_DTYPE = np.dtype([
+    ('magic', '<u4'), ('version', '<u4'), ('slots', '<u4'), ('width', '<u4'), ('height', '<u4'),
+    ('max_entities', '<u4'), ('r_mask', '<u4'), ('g_mask', '<u4'), ('b_mask', '<u4'),
+    ('slot_size', '<u8'), ('latest', '<u8'),  # latest: 最新完成的帧序号
+])
+
+# 每个槽位的头部，seq为序列锁：写入期间为奇数，写完为偶数（帧序号*2）
+SLOT_DTYPE = np.dtype([
+    ('seq', '<u8'), ('tick', '<u8'), ('timestamp', '<f8'),
+    ('player_x', '<f4'), ('player_y', '<f4'), ('player_hp', '<i4'), ('score', '<i4'),
+    ('level', '<i4'), ('bombs', '<i4'), ('entity_count', '<u4'),
+])
+
+# 敌人和子弹的定长记录
+ENTITY_DTYPE = np.dtype([
+    ('kind', 'u1'), ('hp', '<i2'), ('x', '<f4'), ('y', '<f4'), ('width', '<u2'), ('height', '<u2'),
+])
+
+
+def _align(size, alignment=64):
+    return (size + alignment - 1) // alignment * alignment
+
+
+def _layout(width, height, slots, max_entities):
+    """共享内存布局
+    Returns:
+        (槽位起始偏移, 槽位大小, 实体区偏移, 画面区偏移, 总大小)，实体区和画面区的偏移相对于槽位起始
+    """
+    slot_start = _align(HEADER_DTYPE.itemsize)
+    entities_offset = _align(SLOT_DTYPE.itemsize)
+    frame_offset = _align(entities_offset + ENTITY_DTYPE.itemsize * max_entities)
+    slot_size = _align(frame_offset + width * height * 4)
+    return slot_start, slot_size, entities_offset, frame_offset, slot_start + slot_size * slots
+
+
+def _tracker_name(shm):
+    """resource_tracker登记共享内存时使用的名称（只有POSIX上的共享内存登记）：带前导'/'，shm.name不含这个'/'"""
+    return '/' + shm.name
+
+
+def _close_shm(shm):
+    """关闭共享内存映射；调用方仍持有StreamFrame等视图时映射保留到视图释放"""
+    try:
+        shm.close()
+    except BufferError:
+        pass
+
+
+class _SlotViews:
+    """一个槽位在共享内存中的numpy视图"""
+    __slots__ = ('header', 'entities', 'frame')
+
+    def __init__(self, buf, start, entities_offset, frame_offset, width, height, max_entities):
+        self.header = np.ndarray((), SLOT_DTYPE, buf, start)
+        self.entities = np.ndarray((max_entities,), ENTITY_DTYPE, buf, start + entities_offset)
+        # 与32位表面内存相同的按行排列，每个像素一个uint32（颜色通道由头部的掩码给出）
+        self.frame = np.ndarray((height, width), np.uint32, buf, start + frame_offset)
+
+
+def _slot_views(buf, header):
+    width, height = int(header['width']), int(header['height'])
+    slots, max_entities = int(header['slots']), int(header['max_entities'])
+    slot_start, slot_size, entities_offset, frame_offset, _ = _layout(width, height, slots, max_entities)
+    return [_SlotViews(buf, slot_start + i * slot_size, entities_offset, frame_offset,
+                       width, height, max_entities) for i in range(slots)]
+
+
+class StreamWriter:
+    """共享内存导出 - 每帧把画面和实体状态写入共享内存环形缓冲
+    外部进程用StreamReader按名称连接，不需要套接字也不复制数据。
+    """
+    def __init__(self, name, size=(800, 600), slots=4, max_entities=2048,
+                 masks=(0xff0000, 0x00ff00, 0x0000ff)):
+        """创建共享内存
+        Args:
+            name: 共享内存名称（读取方按此名称连接）
+            size: 画面大小 (宽, 高)
+            slots: 环形缓冲的槽位数
+            max_entities: 每帧最多导出的敌人和子弹数，超出部分不导出
+            masks: 画面表面的红、绿、蓝通道掩码（screen.get_masks()的前三项），画面必须是32位表面
+        """
+        width, height = size
+        *_, total = _layout(width, height, slots, max_entities)
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=total)
+        self.name = self.shm.name
+        self.header = np.ndarray((), HEADER_DTYPE, self.shm.buf, 0)
+        self.header[()] = (STREAM_MAGIC, STREAM_VERSION, slots, width, height, max_entities, *masks,
+                           _layout(width, height, slots, max_entities)[1], 0)
+        self._slots = _slot_views(self.shm.buf, self.header)
+        self.max_entities = max_entities
+        self.frames = 0  # 已导出的帧数
+        self.truncated = 0  # 实体数超出max_entities的帧数
+        self.publish_time = 0.0  # 最近一帧导出耗时（毫秒）
+
+    def publish(self, scene, screen=None, tick=None):
+        """导出一帧
+        Args:
+            scene: GameScene或SceneSnapshot
+            screen: 已绘制的画面，为None时只导出实体状态
+            tick: 游戏帧号，默认与帧序号相同
+        Returns:
+            本帧的帧序号
+        """
+        start = time.perf_counter()
+        seq = self.frames + 1
+        slot = self._slots[seq % len(self._slots)]
+        header = slot.header
+        header['seq'] = seq * 2 - 1  # 奇数：正在写入
+
+        count = self._write_entities(scene, slot.entities)
+        if screen is not None:
+            # 表面的二维视图是(宽, 高)，转置后与内存中的行顺序一致，按行整块复制
+            view = screen.get_view('2')
+            np.copyto(slot.frame, np.asarray(view).T)
+            del view
+        player = scene.player
+        header['tick'] = seq if tick is None else tick
+        header['player_x'] = player.x
+        header['player_y'] = player.y
+        header['player_hp'] = player.hp
+        header['score'] = scene.score
+        header['level'] = scene.current_level
+        header['bombs'] = player.bombs
+        header['entity_count'] = count
+        header['timestamp'] = time.perf_counter()
+
+        header['seq'] = seq * 2  # 偶数：写入完成
+        self.header['latest'] = seq
+        self.frames = seq
+        self.publish_time = (time.perf_counter() - start) * 1000
+        return seq
+
+    def _write_entities(self, scene, records):
+        """把敌人和子弹写入定长记录
+        Returns:
+            写入的记录数
+        """
+        count = 0
+        limit = self.max_entities
+        groups = ((scene.enemies, None), (scene.bullets, KIND_BULLET), (scene.enemy_bullets, KIND_ENEMY_BULLET))
+        for entities, kind in groups:
+            for obj in entities:
+                if count >= limit:
+                    self.truncated += 1
+                    return count
+                records[count] = (_ARCHETYPE_KINDS[obj.archetype] if kind is None else kind,
+                                  getattr(obj, 'hp', 0), obj.x, obj.y, obj.width, obj.height)
+                count += 1
+        field = getattr(scene, 'bullet_field', None)
+        if field is not None and len(field):
+            # 弹幕地狱模式的数组子弹整列写入
+            n = min(len(field), limit - count)
+            widths, heights = field.sizes()
+            block = records[count:count + n]
+            block['kind'] = KIND_ENEMY_BULLET
+            block['hp'] = 0
+            block['x'] = field.x[:n]
+            block['y'] = field.y[:n]
+            block['width'] = widths[:n]
+            block['height'] = heights[:n]
+            count += n
+            if n < len(field):
+                self.truncated += 1
+        return count
+
+    def close(self):
+        """关闭并删除共享内存"""
+        self.header = None
+        self._slots = None
+        # 同一进程树中的读取方会从共用的resource_tracker注销这个名称，unlink前重新登记（重复登记无影响）
+        # 只有POSIX上的共享内存由resource_tracker管理
+        if os.name == 'posix':
+            resource_tracker.register(_tracker_name(self.shm), 'shared_memory')
+        self.shm.unlink()
+        _close_shm(self.shm)
+
+
+class StreamFrame:
+    """读取到的一帧 - 所有数据都是共享内存的视图
+    写入方会在环形缓冲绕回一圈后覆盖这个槽位，使用完数据后调用valid()确认期间没有被覆盖。
+    """
+    __slots__ = ('seq', 'header', 'entities', 'frame', '_slot', '_channels')
+
+    def __init__(self, seq, slot, count, channels):
+        self.seq = seq
+        self.header = slot.header
+        self.entities = slot.entities[:count]
+        self.frame = slot.frame  # (高, 宽) uint32像素
+        self._slot = slot
+        self._channels = channels
+
+    def channel(self, name):
+        """某个颜色通道的(高, 宽) uint8视图
+        Args:
+            name: 'r'、'g' 或 'b'
+        """
+        return self.frame.view(np.uint8).reshape(self.frame.shape + (4,))[..., self._channels[name]]
+
+    def valid(self):
+        """数据是否仍是这一帧（没有被写入方覆盖）"""
+        return int(self._slot.header['seq']) == self.seq * 2
+
+    @property
+    def latency(self):
+        """从写入完成到现在的时间（秒）"""
+        return time.perf_counter() - float(self.header['timestamp'])
+
+
+class StreamReader:
+    """共享内存读取 - 按名称连接StreamWriter创建的共享内存"""
+    def __init__(self, name):
+        """连接共享内存
+        Raises:
+            FileNotFoundError: 共享内存不存在
+            ValueError: 不是游戏导出的共享内存或版本不匹配
+        """
+        # 读取方不拥有共享内存，进程退出时不能被resource_tracker删除
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # Python 3.13之前没有track参数
+            self.shm = shared_memory.SharedMemory(name=name)
+            if os.name == 'posix':
+                resource_tracker.unregister(_tracker_name(self.shm), 'shared_memory')
+        self.header = np.ndarray((), HEADER_DTYPE, self.shm.buf, 0)
+        if int(self.header['magic']) != STREAM_MAGIC or int(self.header['version']) != STREAM_VERSION:
+            self.close()
+            raise ValueError('不是游戏导出的共享内存或版本不匹配')
+        self.width = int(self.header['width'])
+        self.height = int(self.header['height'])
+        # 小端序下掩码对应的字节位置
+        self.channels = {name: (int(self.header[f'{name}_mask']).bit_length() - 1) // 8 for name in 'rgb'}
+        self._slots = _slot_views(self.shm.buf, self.header)
+        self.torn_reads = 0  # 读取时槽位正在被写入的次数
+
+    def latest_seq(self):
+        """最新完成的帧序号（还没有帧时为0）"""
+        return int(self.header['latest'])
+
+    def read(self, seq=None):
+        """读取一帧（零拷贝）
+        Args:
+            seq: 帧序号，默认为最新一帧
+        Returns:
+            StreamFrame，帧不存在或已被覆盖时返回None
+        """
+        if seq is None:
+            seq = self.latest_seq()
+        if seq <= 0:
+            return None
+        slot = self._slots[seq % len(self._slots)]
+        if int(slot.header['seq']) != seq * 2:
+            self.torn_reads += 1
+            return None
+        return StreamFrame(seq, slot, int(slot.header['entity_count']), self.channels)
+
+    def wait_next(self, last_seq, timeout=1.0, poll=0.0002):
+        """等待比last_seq更新的帧（轮询，不使用套接字或锁）
+        Returns:
+            最新的StreamFrame，超时返回None
+        """
+        deadline = time.perf_counter() + timeout
+        while True:
+            seq = self.latest_seq()
+            if seq > last_seq:
+                frame = self.read(seq)
+                if frame is not None:
+                    return frame
+            if time.perf_counter() >= deadline:
+                return None
+            time.sleep(poll)
+
+    def close(self):
+        """断开共享内存（不删除）"""
+        self.header = None
+        self._slots = None
+        _close_shm(self.shm)
@@ -0,0 +1,142 @@
+import os
+import sys
+import time
+import random
+import argparse
+import contextlib
+import multiprocessing
+import pygame
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.sim.headless import init_headless, HeadlessGame
+from src.sim.autoplay import AutoPlayBot
+from src.sim.shm_stream import StreamWriter, StreamReader
+
+
+def _percentile(values, fraction):
+    """简单百分位数"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def reader_process(name, results, ready, timeout=1.0):
+    """读取进程：逐帧读取共享内存，统计延迟、漏帧和读取期间被覆盖的帧
+    写入方停止发布超过timeout秒后结束，结果放入results队列。
+    """
+    reader = StreamReader(name)
+    ready.set()
+    latencies = []
+    seen = 0
+    missed = 0
+    overwritten = 0
+    entities = 0
+    last_seq = reader.latest_seq()
+    while True:
+        frame = reader.wait_next(last_seq, timeout)
+        if frame is None:
+            break
+        latencies.append(frame.latency * 1000)
+        if last_seq:
+            missed += frame.seq - last_seq - 1
+        last_seq = frame.seq
+        # 直接在共享内存上计算，模拟读取方使用数据
+        entities += len(frame.entities)
+        frame.entities['x'].sum()
+        frame.channel('r')[::16, ::16].max()
+        if not frame.valid():
+            overwritten += 1
+        seen += 1
+        del frame
+    torn = reader.torn_reads
+    reader.close()
+    results.put({
+        'seen': seen,
+        'missed': missed,
+        'overwritten': overwritten,
+        'torn': torn,
+        'entities': entities / max(1, seen),
+        'latency_ms': sum(latencies) / max(1, len(latencies)),
+        'latency_p95': _percentile(latencies, 0.95),
+        'latency_max': max(latencies, default=0.0),
+    })
+
+
+def run(seconds=5.0, fps=60, with_frames=True, seed=0, slots=4):
+    """运行自动操作的游戏并把每帧导出到共享内存，另一个进程读取
+    Args:
+        seconds: 运行时长（秒）
+        fps: 导出帧率上限（0为不限）
+        with_frames: 是否导出画面（否则只导出实体状态）
+        seed: 随机种子
+        slots: 环形缓冲槽位数
+    Returns:
+        统计数据字典
+    """
+    from src.scenes.game_scene import GameScene
+
+    screen = pygame.display.get_surface() or init_headless()
+    game = HeadlessGame(screen=screen)
+    random.seed(seed)
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        scene = GameScene(game)
+    bot = AutoPlayBot()
+    clock = pygame.time.Clock()
+
+    writer = StreamWriter(f'pyfly_bench_{os.getpid()}', screen.get_size(), slots=slots,
+                          masks=screen.get_masks()[:3])
+    results = multiprocessing.Queue()
+    ready = multiprocessing.Event()
+    reader = multiprocessing.Process(target=reader_process, args=(writer.name, results, ready))
+    reader.start()
+    ready.wait()
+
+    publish_times = []
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        while time.perf_counter() - start < seconds:
+            scene.update(bot.act(scene))
+            if with_frames:
+                game.draw_scene(scene)
+            writer.publish(scene, screen if with_frames else None)
+            publish_times.append(writer.publish_time)
+            clock.tick(fps)
+    elapsed = time.perf_counter() - start
+
+    stats = results.get()
+    reader.join()
+    slot_bytes = int(writer.header['slot_size'])
+    writer.close()
+    stats.update({
+        'frames': len(publish_times),
+        'fps': len(publish_times) / elapsed,
+        'publish_ms': sum(publish_times) / len(publish_times),
+        'publish_max': max(publish_times),
+        'mb_per_s': len(publish_times) * slot_bytes / elapsed / (1024 * 1024) if with_frames else 0.0,
+    })
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='共享内存导出的吞吐量和延迟测试（本机读取进程）')
+    parser.add_argument('--seconds', type=float, default=5.0, help='每种配置运行的秒数')
+    parser.add_argument('--fps', type=int, nargs='+', default=[60, 0], help='导出帧率上限，0为不限')
+    args = parser.parse_args()
+
+    init_headless()
+    print(f"{'内容':<8}{'帧率上限':>8}{'导出帧/秒':>10}{'MB/秒':>8}{'导出ms':>8}{'读取帧':>8}{'漏帧':>6}"
+          f"{'被覆盖':>7}{'延迟ms':>8}{'P95':>7}{'最大':>7}")
+    for with_frames in (False, True):
+        for fps in args.fps:
+            r = run(args.seconds, fps, with_frames)
+            content = '画面+实体' if with_frames else '仅实体'
+            print(f"{content:<8}{fps:>10}{r['fps']:>12.1f}{r['mb_per_s']:>10.1f}{r['publish_ms']:>10.3f}"
+                  f"{r['seen']:>10}{r['missed']:>8}{r['overwritten']:>10}{r['latency_ms']:>10.3f}"
+                  f"{r['latency_p95']:>9.3f}{r['latency_max']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
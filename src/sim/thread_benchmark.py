@@ -0,0 +1,132 @@
+import os
+import sys
+import time
+import random
+import argparse
+import contextlib
+import pygame
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.sim.headless import init_headless, HeadlessGame
+from src.sim.autoplay import AutoPlayBot
+
+
+def _percentile(values, fraction):
+    """简单百分位数"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_mode(threaded, seconds=5.0, draw_load=0, seed=0, fps=60):
+    """以单线程或多线程模式运行一段时间的自动操作游戏并测量
+    Args:
+        threaded: 是否使用仿真线程
+        seconds: 运行时长（秒）
+        draw_load: 每帧额外的全屏半透明blit次数，模拟较重的绘制
+        seed: 随机种子
+        fps: 主循环帧率上限（0为不限）
+    Returns:
+        统计数据字典
+    """
+    from src.scenes.game_scene import GameScene
+    from src.scenes.simulation_thread import SimulationThread
+
+    screen = pygame.display.get_surface() or init_headless()
+    game = HeadlessGame(screen=screen)
+    random.seed(seed)
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        scene = GameScene(game)
+    bot = AutoPlayBot()
+    clock = pygame.time.Clock()
+    load = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+    load.fill((0, 0, 40, 10))
+
+    sim = None
+    if threaded:
+        sim = SimulationThread(scene)
+        sim.start()
+        while sim.snapshots.latest() is None:
+            time.sleep(0.001)
+
+    frames = 0
+    latencies = []
+    frame_times = []
+    last_tick = 0
+    last_input = None
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        while time.perf_counter() - start < seconds:
+            if sim is not None:
+                # 等待下一个仿真帧的快照，画面与仿真帧对齐
+                view = sim.snapshots.wait_newer(last_tick, sim.tick_interval * 2)
+                last_tick = view.tick
+            frame_start = time.perf_counter()
+            pygame.event.pump()
+            if sim is not None:
+                sim.post_keys(bot.act(view).copy(), frame_start)
+            else:
+                scene.update(bot.act(scene))
+                view = scene
+
+            game.draw_scene(view)
+            for _ in range(draw_load):
+                screen.blit(load, (0, 0))
+            pygame.display.flip()
+
+            now = time.perf_counter()
+            frame_times.append((now - frame_start) * 1000)
+            if sim is None:
+                latencies.append((now - frame_start) * 1000)
+            elif view.input_time != last_input and view.input_time is not None:
+                # 每个输入只在第一次显示其结果时计算一次延迟
+                latencies.append((now - view.input_time) * 1000)
+                last_input = view.input_time
+            frames += 1
+            # 多线程模式由仿真线程的固定频率控制节奏
+            clock.tick(0 if sim is not None else fps)
+    elapsed = time.perf_counter() - start
+
+    ticks = frames
+    late = 0
+    if sim is not None:
+        sim.stop()
+        sim.join()
+        ticks = sim.ticks
+        late = sim.late_ticks
+    return {
+        'mode': '多线程' if threaded else '单线程',
+        'draw_load': draw_load,
+        'fps': frames / elapsed,
+        'tps': ticks / elapsed,
+        'frame_ms': sum(frame_times) / len(frame_times),
+        'latency_ms': sum(latencies) / max(1, len(latencies)),
+        'latency_p95': _percentile(latencies, 0.95),
+        'late_ticks': late,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='单线程与仿真/渲染分离两种模式的帧率和输入延迟对比')
+    parser.add_argument('--seconds', type=float, default=5.0, help='每种配置运行的秒数')
+    parser.add_argument('--loads', type=int, nargs='+', default=[0, 20, 60],
+                        help='每帧额外的全屏blit次数（模拟绘制负载）')
+    parser.add_argument('--fps', type=int, default=60, help='主循环帧率上限，0为不限')
+    args = parser.parse_args()
+
+    init_headless()
+    print(f"{'模式':<6}{'绘制负载':>8}{'画面帧/秒':>10}{'逻辑帧/秒':>10}{'帧耗时ms':>10}"
+          f"{'输入延迟ms':>11}{'延迟P95':>9}{'逻辑掉帧':>9}")
+    for load in args.loads:
+        for threaded in (False, True):
+            r = run_mode(threaded, args.seconds, load, fps=args.fps)
+            print(f"{r['mode']:<6}{r['draw_load']:>10}{r['fps']:>12.1f}{r['tps']:>12.1f}"
+                  f"{r['frame_ms']:>12.2f}{r['latency_ms']:>13.2f}{r['latency_p95']:>11.2f}"
+                  f"{r['late_ticks']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import os
+import sys
+import time
+import random
+import argparse
+import contextlib
+import numpy as np
+import pygame
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.sim.headless import init_headless, HeadlessGame
+from src.sim.autoplay import BotKeys
+from src.sim.capture import FrameCapture
+
+# 离散动作: (左, 右, 上, 下)，射击使用玩家的自动射击
+ACTIONS = [
+    (False, False, False, False),  # 0 不动
+    (True, False, False, False),   # 1 左
+    (False, True, False, False),   # 2 右
+    (False, False, True, False),   # 3 上
+    (False, False, False, True),   # 4 下
+    (True, False, True, False),    # 5 左上
+    (False, True, True, False),    # 6 右上
+    (True, False, False, True),    # 7 左下
+    (False, True, False, True),    # 8 右下
+]
+
+SCORE_REWARD = 0.1  # 每得1分的奖励
+DAMAGE_PENALTY = 10.0  # 每损失1点生命值的惩罚
+
+_DEVNULL = open(os.devnull, 'w')
+
+
+class _EnvSlot:
+    """单个环境的状态 - 场景、独立的随机数状态和按键"""
+    def __init__(self):
+        self.scene = None
+        self.rng_state = None
+        self.keys = BotKeys()
+        self.capture = None
+        self.ticks = 0
+        self.last_score = 0
+        self.last_hp = 0
+
+
+class VecEnv:
+    """批量环境 - 在一个进程中同时推进N局互不影响的游戏
+    所有游戏对象共用random模块，每个环境在推进前后切换各自的随机数状态，
+    因此每局只由自己的种子决定，与其他环境无关。
+    """
+    def __init__(self, num_envs, seeds=None, player_type=1, max_enemies=32, max_bullets=128,
+                 max_ticks=60 * 60 * 10, quiet=True, pixels=None):
+        """初始化批量环境
+        Args:
+            num_envs: 环境数量
+            seeds: 每个环境的初始种子列表，默认为0..N-1
+            player_type: 玩家飞机类型
+            max_enemies: 观测中最多记录的敌人数
+            max_bullets: 观测中最多记录的子弹数（玩家和敌人各自）
+            max_ticks: 每局最大帧数，超过后视为结束
+            quiet: 是否屏蔽游戏对象的打印输出
+            pixels: 可选的像素观测配置字典 {'scale', 'grayscale', 'stack'}，
+                    设置后每步绘制画面并写入obs['pixels']
+        """
+        screen = pygame.display.get_surface() or init_headless()
+        self.num_envs = num_envs
+        self.player_type = player_type
+        self.max_enemies = max_enemies
+        self.max_bullets = max_bullets
+        self.max_ticks = max_ticks
+        self.quiet = quiet
+        self.game = HeadlessGame(screen=screen)
+        self.slots = [_EnvSlot() for _ in range(num_envs)]
+
+        # 预分配观测数组，每次step原地覆盖
+        self.obs = {
+            'player': np.zeros((num_envs, 3), dtype=np.float32),  # x, y, hp
+            'enemies': np.zeros((num_envs, max_enemies, 4), dtype=np.float32),  # x, y, w, h
+            'enemy_count': np.zeros(num_envs, dtype=np.int32),
+            'enemy_bullets': np.zeros((num_envs, max_bullets, 2), dtype=np.float32),  # x, y
+            'enemy_bullet_count': np.zeros(num_envs, dtype=np.int32),
+            'bullets': np.zeros((num_envs, max_bullets, 2), dtype=np.float32),
+            'bullet_count': np.zeros(num_envs, dtype=np.int32),
+        }
+        if pixels is not None:
+            # 叠帧环形缓冲区，obs['pixel_index']为每个环境最新一帧所在的格
+            shape = FrameCapture.frame_shape(screen.get_size(), **pixels)
+            self.obs['pixels'] = np.zeros((num_envs,) + shape, dtype=np.uint8)
+            self.obs['pixel_index'] = np.zeros(num_envs, dtype=np.int32)
+            for i, slot in enumerate(self.slots):
+                slot.capture = FrameCapture(screen, frames=self.obs['pixels'][i], **pixels)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.dones = np.zeros(num_envs, dtype=bool)
+
+        self.reset(seeds=seeds if seeds is not None else list(range(num_envs)))
+
+    def _output(self):
+        """屏蔽打印输出的上下文"""
+        if self.quiet:
+            return contextlib.redirect_stdout(_DEVNULL)
+        return contextlib.nullcontext()
+
+    def reset(self, indices=None, seeds=None):
+        """重置环境
+        Args:
+            indices: 要重置的环境编号列表，默认全部
+            seeds: 与indices对应的种子列表，默认沿用当前随机数状态
+        Returns:
+            观测字典
+        """
+        from src.scenes.game_scene import GameScene
+
+        if indices is None:
+            indices = range(self.num_envs)
+        outer_state = random.getstate()
+        with self._output():
+            for n, i in enumerate(indices):
+                slot = self.slots[i]
+                if seeds is not None:
+                    random.seed(seeds[n])
+                elif slot.rng_state is not None:
+                    random.setstate(slot.rng_state)
+                slot.scene = GameScene(self.game, self.player_type)
+                slot.rng_state = random.getstate()
+                slot.ticks = 0
+                slot.last_score = slot.scene.score
+                slot.last_hp = slot.scene.player.hp
+                if slot.capture is not None:
+                    slot.capture.clear()
+                self._observe(i)
+        random.setstate(outer_state)
+        return self.obs
+
+    def step(self, actions):
+        """所有环境各推进一帧
+        结束的环境会自动重置，返回的观测已是新一局的初始状态。
+        Args:
+            actions: 长度为N的动作编号序列（见ACTIONS）
+        Returns:
+            (观测字典, 奖励数组, 结束标志数组)，数组在下次调用时被原地覆盖
+        """
+        outer_state = random.getstate()
+        with self._output():
+            for i, slot in enumerate(self.slots):
+                scene = slot.scene
+                random.setstate(slot.rng_state)
+                slot.keys.set(*ACTIONS[actions[i]])
+                scene.update(slot.keys)
+                slot.ticks += 1
+                slot.rng_state = random.getstate()
+
+                hp = scene.player.hp
+                self.rewards[i] = ((scene.score - slot.last_score) * SCORE_REWARD
+                                   - max(0, slot.last_hp - hp) * DAMAGE_PENALTY)
+                slot.last_score = scene.score
+                slot.last_hp = hp
+
+                done = (scene.game_state in ('game_over', 'game_complete')
+                        or slot.ticks >= self.max_ticks)
+                self.dones[i] = done
+                if done:
+                    self.reset([i])
+                else:
+                    self._observe(i)
+        random.setstate(outer_state)
+        return self.obs, self.rewards, self.dones
+
+    def _observe(self, i):
+        """把第i个环境的实体位置写入预分配的观测数组"""
+        scene = self.slots[i].scene
+        obs = self.obs
+        player = scene.player
+        obs['player'][i] = (player.x, player.y, player.hp)
+
+        enemies = [(e.x, e.y, e.width, e.height) for e in scene.enemies][:self.max_enemies]
+        _fill(obs['enemies'][i], enemies)
+        obs['enemy_count'][i] = len(enemies)
+
+        enemy_bullets = [(b.x, b.y) for b in scene.enemy_bullets][:self.max_bullets]
+        _fill(obs['enemy_bullets'][i], enemy_bullets)
+        obs['enemy_bullet_count'][i] = len(enemy_bullets)
+
+        bullets = [(b.x, b.y) for b in scene.bullets][:self.max_bullets]
+        _fill(obs['bullets'][i], bullets)
+        obs['bullet_count'][i] = len(bullets)
+
+        capture = self.slots[i].capture
+        if capture is not None:
+            self.game.draw_scene(scene)
+            capture.capture()
+            obs['pixel_index'][i] = capture.index
+
+
+def _fill(target, rows):
+    """把行列表写入目标数组前部，其余位置清零"""
+    n = len(rows)
+    if n:
+        target[:n] = rows
+    target[n:] = 0
+
+
+def benchmark(num_envs, steps, seed=0, pixels=None):
+    """测量批量环境的吞吐量
+    Returns:
+        每秒环境步数
+    """
+    env = VecEnv(num_envs, seeds=[seed + i for i in range(num_envs)], pixels=pixels)
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, len(ACTIONS), size=(steps, num_envs))
+    start = time.perf_counter()
+    for t in range(steps):
+        env.step(actions[t])
+    elapsed = time.perf_counter() - start
+    return num_envs * steps / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量环境吞吐量测试')
+    parser.add_argument('--envs', type=int, nargs='+', default=[1, 8, 32], help='环境数量')
+    parser.add_argument('--steps', type=int, default=1000, help='每个环境推进的帧数')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--pixels', type=int, default=None, metavar='SCALE',
+                        help='同时输出灰度叠4帧像素观测，指定缩小倍数')
+    args = parser.parse_args()
+
+    pixels = None
+    if args.pixels:
+        pixels = {'scale': args.pixels, 'grayscale': True, 'stack': 4}
+    for num_envs in args.envs:
+        rate = benchmark(num_envs, args.steps, args.seed, pixels)
+        print(f"{num_envs:4d} 个环境: {rate:,.0f} 环境步/秒")
+
+
+if __name__ == "__main__":
+    main()